@@ -1,10 +1,10 @@
 from django.contrib import admin
 
-from .models import AuctionItem, Notification
+from .models import AuctionItem, EscrowHold, Notification, OutboxEvent, ProxyBid
 
 @admin.register(AuctionItem)
 class AuctionItemAdmin(admin.ModelAdmin):
-    list_display = ('title', 'owner', 'starting_bid', 'current_bid', 'status', 'created_at', 'updated_at')
+    list_display = ('title', 'owner', 'starting_bid', 'current_bid', 'top_bidder', 'bid_count', 'status', 'created_at', 'updated_at')
     search_fields = ('title', 'description', 'owner__username')
     list_filter = ('status', 'created_at', 'updated_at')
 
@@ -15,3 +15,24 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ('notification_type', 'is_read', 'created_at')
     search_fields = ('title', 'message', 'user__username')
     readonly_fields = ('created_at',)
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'created_at', 'dispatched_at', 'attempts')
+    list_filter = ('kind', 'dispatched_at')
+    readonly_fields = ('created_at',)
+
+
+@admin.register(ProxyBid)
+class ProxyBidAdmin(admin.ModelAdmin):
+    list_display = ('auction_item', 'bidder', 'max_amount', 'is_active', 'created_at', 'updated_at')
+    list_filter = ('is_active',)
+    search_fields = ('auction_item__title', 'bidder__username')
+
+
+@admin.register(EscrowHold)
+class EscrowHoldAdmin(admin.ModelAdmin):
+    list_display = ('auction_item', 'user', 'amount', 'status', 'created_at', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('auction_item__title', 'user__username')
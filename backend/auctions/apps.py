@@ -1,16 +1,50 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
+# Set by the server entry points before Django is set up
+_server_process = False
+
+
+def mark_server_process():
+    """
+    Called by config.asgi and config.wsgi before django.setup(), so that
+    ready() starts the background threads in ASGI/WSGI server processes.
+    """
+    global _server_process
+    _server_process = True
+
+
+def serves_requests():
+    """
+    True in processes that serve the site: those marked by a server entry
+    point (see mark_server_process) and the process of `manage.py runserver`
+    that handles requests. Everything else (management commands, test
+    runners, workers, scripts calling django.setup()) must not start
+    background threads.
+    """
+    if _server_process:
+        return True
+    if sys.argv[1:2] != ["runserver"]:
+        return False
+    # With autoreload, the parent only watches files; the child serves
+    return os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
+
+
 class AuctionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auctions'
 
     def ready(self):
         """
-        Called when Django starts. Start the auction closing scheduler here.
+        Called when Django starts. Start the auction closing scheduler and
+        the outbox dispatcher here. Every worker process starts them; they
+        coordinate through the database so no auction is closed twice.
         """
-        import os
-        # Only start scheduler in main process (not in runserver reloader or management commands)
-        if os.environ.get("RUN_MAIN") != "true" and os.environ.get("SCHEDULER_ENABLED") != "false":
+        if serves_requests() and os.environ.get("SCHEDULER_ENABLED") != "false":
             from auctions.scheduler import start_scheduler
+            from auctions.services.outbox import OutboxDispatcher
             start_scheduler()
+            OutboxDispatcher.start()
@@ -1,9 +1,12 @@
+import asyncio
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.cache import cache
-from .models import ChatMessage  # <-- Import your ChatMessage model
+from .models import AuctionItem, ChatMessage  # <-- Import your ChatMessage model
+from .services import Outbox
 
 
 class ChatConsumer(AsyncWebsocketConsumer):
@@ -161,3 +164,96 @@ class BalanceConsumer(AsyncWebsocketConsumer):
     async def balance_update(self, event):
         balance = event["balance"]
         await self.send(text_data=json.dumps({"balance": balance}))
+
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    """New notifications for the connected user, as they are created."""
+
+    async def connect(self):
+        if self.scope["user"].is_anonymous:
+            await self.close()
+            return
+        self.group_name = Outbox.notification_group(self.scope["user"].id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def notification(self, event):
+        await self.send(text_data=json.dumps(event))
+
+
+class AuctionConsumer(AsyncWebsocketConsumer):
+    """
+    Live state of one auction for everyone viewing its page. Bids, Buy Now
+    and closing publish the auction's state to its group, at most
+    AUCTION_LIVE_UPDATES_PER_SECOND times a second per auction (see
+    AuctionUpdateThrottle). Each connection forwards only the fields that
+    changed and applies the same limit to its own frames, e.g. for updates
+    published by several processes.
+    """
+
+    FIELDS = ("current_bid", "top_bidder", "bid_count", "end_time", "status")
+
+    async def connect(self):
+        self.auction_id = int(self.scope["url_route"]["kwargs"]["auction_id"])
+        try:
+            auction_item = await sync_to_async(
+                AuctionItem.objects.select_related("top_bidder").get
+            )(pk=self.auction_id)
+        except AuctionItem.DoesNotExist:
+            await self.close()
+            return
+
+        self.group_name = Outbox.auction_group(self.auction_id)
+        self.min_interval = 1 / getattr(settings, "AUCTION_LIVE_UPDATES_PER_SECOND", 4)
+        self.sent = Outbox.auction_state(auction_item)
+        self.pending = {}
+        self.flush_task = None
+        self.last_flush = 0.0
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send(
+            text_data=json.dumps({"type": "auction_state", "auction_id": self.auction_id, **self.sent})
+        )
+
+    async def disconnect(self, close_code):
+        if getattr(self, "flush_task", None) is not None:
+            self.flush_task.cancel()
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def auction_update(self, event):
+        # Updates can arrive out of order from concurrent dispatchers
+        latest = self.pending.get("bid_count", self.sent["bid_count"])
+        if event["bid_count"] < latest:
+            return
+        self._queue({field: event[field] for field in self.FIELDS})
+
+    async def auction_extended(self, event):
+        self._queue({"end_time": event["end_time"]})
+
+    def _queue(self, state):
+        self.pending.update(state)
+        if self.flush_task is None:
+            loop = asyncio.get_running_loop()
+            delay = max(0.0, self.last_flush + self.min_interval - loop.time())
+            self.flush_task = asyncio.ensure_future(self._flush(delay))
+
+    async def _flush(self, delay):
+        await asyncio.sleep(delay)
+        self.flush_task = None
+        delta = {
+            field: value for field, value in self.pending.items() if self.sent.get(field) != value
+        }
+        self.pending = {}
+        if not delta:
+            return
+        self.sent.update(delta)
+        self.last_flush = asyncio.get_running_loop().time()
+        await self.send(
+            text_data=json.dumps({"type": "auction_update", "auction_id": self.auction_id, **delta})
+        )
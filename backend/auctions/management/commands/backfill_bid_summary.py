@@ -0,0 +1,58 @@
+"""
+Django management command to backfill the denormalized top-bid state
+(top_bidder, bid_count, last_bid_at) on auction items from their bids.
+Usage: python manage.py backfill_bid_summary [--batch-size 500]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from auctions.models import AuctionItem, Bid
+
+
+class Command(BaseCommand):
+    help = "Recompute top_bidder, bid_count and last_bid_at for every auction item"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of auction items updated per query (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        top_bid = Bid.objects.filter(auction_item=OuterRef("pk")).order_by("-amount", "timestamp")
+        summaries = AuctionItem.objects.annotate(
+            summary_top_bidder=Coalesce(
+                "buy_now_buyer",
+                Subquery(top_bid.values("bidder")[:1]),
+                output_field=BigIntegerField(),
+            ),
+            summary_bid_count=Count("bids"),
+            summary_last_bid_at=Max("bids__timestamp"),
+        ).only("pk", "top_bidder", "bid_count", "last_bid_at").order_by("pk")
+
+        updated = 0
+        batch = []
+        for item in summaries.iterator(chunk_size=batch_size):
+            item.top_bidder_id = item.summary_top_bidder
+            item.bid_count = item.summary_bid_count
+            item.last_bid_at = item.summary_last_bid_at
+            batch.append(item)
+            if len(batch) >= batch_size:
+                updated += self._flush(batch)
+                batch = []
+        if batch:
+            updated += self._flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled bid summary for {updated} auction items."))
+
+    @staticmethod
+    def _flush(batch):
+        with transaction.atomic():
+            AuctionItem.objects.bulk_update(batch, ["top_bidder", "bid_count", "last_bid_at"])
+        return len(batch)
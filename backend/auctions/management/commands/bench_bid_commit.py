@@ -0,0 +1,108 @@
+"""
+Django management command to benchmark bid throughput on a single hot auction.
+Concurrent bidders race on one auction through the bid endpoint; every bid is
+priced from the top bid its bidder last saw, so conflicts and re-validation
+are part of the measurement. The benchmark creates its own users and auction
+and deletes them afterwards. With --sequencer, bids go through the
+single-writer BidSequencer instead of racing on the auction row.
+Usage: python manage.py bench_bid_commit [--bids 200] [--concurrency 8] [--sequencer]
+"""
+import uuid
+from datetime import timedelta
+from decimal import ROUND_UP, Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from auctions.models import AuctionItem, Category, OutboxEvent, UserAccount
+from auctions.utils.benchmark import format_summaries, run_workload
+
+
+class Command(BaseCommand):
+    help = "Measure accepted bids/sec on one hot auction under concurrent bidders"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bids", type=int, default=200, help="Bids to attempt")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent bidders")
+        parser.add_argument(
+            "--sequencer", action="store_true", help="Route bids through the bid sequencer"
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the generated auction and users"
+        )
+
+    def handle(self, *args, **options):
+        prefix = f"benchbid{uuid.uuid4().hex[:8]}"
+        owner = User.objects.create_user(username=f"{prefix}owner")
+        # One bidder per bid keeps the per-user bid rate limit out of the way
+        User.objects.bulk_create(
+            [User(username=f"{prefix}{i:05d}") for i in range(options["bids"])]
+        )
+        bidders = list(User.objects.filter(username__startswith=prefix).exclude(pk=owner.pk))
+        UserAccount.objects.bulk_create(
+            [UserAccount(user=user, balance=Decimal("1000000000.00")) for user in bidders]
+        )
+        category, _ = Category.objects.get_or_create(name="Benchmark")
+        auction = AuctionItem.objects.create(
+            owner=owner,
+            category=category,
+            title="Benchmark hot auction",
+            description="Generated by bench_bid_commit",
+            starting_bid=Decimal("100.00"),
+            end_time=timezone.now() + timedelta(hours=1),
+            condition="New",
+            location="Benchmark",
+        )
+        outbox_start = OutboxEvent.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+        def place(bidder):
+            def operation():
+                current = AuctionItem.objects.values_list("current_bid", flat=True).get(pk=auction.pk)
+                amount = ((current or auction.starting_bid) * Decimal("1.03")).quantize(
+                    Decimal("0.01"), rounding=ROUND_UP
+                )
+                client = APIClient()
+                client.force_authenticate(bidder)
+                response = client.post(
+                    f"/api/auction-items/{auction.pk}/bid/", {"amount": str(amount)}, format="json"
+                )
+                return response.status_code == 201
+
+            return operation
+
+        try:
+            sequencer = {**getattr(settings, "BID_SEQUENCER", {}), "enabled": options["sequencer"]}
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], BID_SEQUENCER=sequencer
+            ):
+                summary = run_workload(
+                    "bid (sequencer)" if options["sequencer"] else "bid (hot)", [place(bidder) for bidder in bidders], options["concurrency"]
+                )
+            auction.refresh_from_db()
+        finally:
+            if not options["keep"]:
+                # Bids notify the generated users and the auction's watchers;
+                # their outbox rows go too
+                OutboxEvent.objects.filter(id__gt=outbox_start).filter(
+                    Q(payload__user_id__in=[owner.pk, *(user.pk for user in bidders)])
+                    | Q(payload__group=f"auction_{auction.pk}")
+                    | Q(payload__auction_item_id=auction.pk)
+                ).delete()
+                User.objects.filter(username__startswith=prefix).delete()
+
+        for line in format_summaries([summary]):
+            self.stdout.write(line)
+        accepted = summary["count"] - summary["errors"]
+        wall = summary["count"] / summary["throughput"] if summary["throughput"] else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{accepted} of {summary['count']} bids accepted "
+                f"({accepted / wall if wall else 0:.1f} accepted bids/s); "
+                f"auction recorded {auction.bid_count} bids, top bid {auction.current_bid}."
+            )
+        )
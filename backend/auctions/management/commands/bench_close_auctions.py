@@ -0,0 +1,102 @@
+"""
+Django management command to benchmark closing expired auctions.
+Creates expired auctions with a history of bids from a shared pool of
+bidders (top bids held in escrow, as the bid path leaves them), times
+close_expired_auctions over them and deletes everything afterwards.
+--batch-size 1 settles one auction per transaction, for comparison;
+--workers closes with several claiming threads (SKIP LOCKED databases only).
+Usage: python manage.py bench_close_auctions [--auctions 500] [--bids 10] [--bidders 50] [--batch-size 200] [--workers 1]
+"""
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from auctions.models import AuctionItem, Bid, Category, EscrowHold, OutboxEvent, UserAccount
+from auctions.scheduler import CLOSE_BATCH_SIZE, close_expired_auctions
+
+
+class Command(BaseCommand):
+    help = "Measure closed auctions/sec for close_expired_auctions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--auctions", type=int, default=500, help="Expired auctions to close")
+        parser.add_argument("--bids", type=int, default=10, help="Bids per auction")
+        parser.add_argument("--bidders", type=int, default=50, help="Size of the bidder pool")
+        parser.add_argument(
+            "--batch-size", type=int, default=CLOSE_BATCH_SIZE, help="Auctions settled per transaction"
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Concurrent closing workers")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        prefix = f"benchclose{uuid.uuid4().hex[:8]}"
+        owner = User.objects.create_user(username=f"{prefix}owner")
+        User.objects.bulk_create(
+            [User(username=f"{prefix}{i:05d}") for i in range(options["bidders"])]
+        )
+        bidders = list(User.objects.filter(username__startswith=prefix).exclude(pk=owner.pk))
+        UserAccount.objects.bulk_create(
+            [UserAccount(user=user, balance=Decimal("1000000000.00")) for user in bidders]
+        )
+        category, _ = Category.objects.get_or_create(name="Benchmark")
+        ended = timezone.now() - timedelta(seconds=1)
+        auctions = AuctionItem.objects.bulk_create(
+            [
+                AuctionItem(
+                    owner=owner,
+                    category=category,
+                    title=f"Benchmark closing auction {n}",
+                    description="Generated by bench_close_auctions",
+                    starting_bid=Decimal("100.00"),
+                    end_time=ended,
+                    condition="New",
+                    location="Benchmark",
+                )
+                for n in range(options["auctions"])
+            ]
+        )
+        bids, holds = [], []
+        for auction in auctions:
+            amount = auction.starting_bid
+            for _ in range(options["bids"]):
+                amount += Decimal("1.00")
+                bids.append(Bid(auction_item=auction, bidder=rng.choice(bidders), amount=amount))
+            if options["bids"]:
+                auction.top_bidder, auction.current_bid = bids[-1].bidder, amount
+                auction.bid_count = options["bids"]
+                holds.append(EscrowHold(user=auction.top_bidder, auction_item=auction, amount=amount))
+        Bid.objects.bulk_create(bids, batch_size=1000)
+        EscrowHold.objects.bulk_create(holds, batch_size=1000)
+        AuctionItem.objects.bulk_update(auctions, ["top_bidder", "current_bid", "bid_count"], batch_size=1000)
+        outbox_start = OutboxEvent.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+        try:
+            started = time.perf_counter()
+            closed = close_expired_auctions(
+                batch_size=options["batch_size"], workers=options["workers"]
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            # Closing notifies the generated users; their outbox rows go too
+            user_ids = [owner.pk, *(user.pk for user in bidders)]
+            groups = [f"auction_{auction.pk}" for auction in auctions]
+            OutboxEvent.objects.filter(id__gt=outbox_start).filter(
+                Q(payload__user_id__in=user_ids) | Q(payload__group__in=groups)
+            ).delete()
+            AuctionItem.objects.filter(owner=owner).delete()
+            User.objects.filter(username__startswith=prefix).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Closed {closed} auctions ({len(bids)} bids) in {elapsed:.2f}s with batch size "
+                f"{options['batch_size']} and {options['workers']} worker(s): {closed / elapsed if elapsed else 0:.1f} auctions/s."
+            )
+        )
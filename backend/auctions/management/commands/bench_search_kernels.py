@@ -0,0 +1,100 @@
+"""
+Django management command to microbenchmark the fuzzy search kernels.
+Compares the full-matrix `levenshtein` with the bounded bit-parallel kernel.
+Usage: python manage.py bench_search_kernels [--words 2000] [--repeat 5] [--seed 42]
+"""
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from auctions.utils.search import (
+    batch_within_distance,
+    fuzzy_match,
+    levenshtein,
+    within_distance,
+)
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark levenshtein vs. the bounded edit-distance kernel"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--words", type=int, default=2000, help="Candidate vocabulary size")
+        parser.add_argument("--queries", type=int, default=50, help="Number of query words")
+        parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        vocabulary = [self._word(rng) for _ in range(options["words"])]
+        queries = [self._typo(rng, rng.choice(vocabulary)) for _ in range(options["queries"])]
+        texts = [" ".join(rng.sample(vocabulary, 30)) for _ in range(200)]
+        repeat = options["repeat"]
+
+        def full_matrix():
+            return sum(
+                1 for q in queries for w in vocabulary if levenshtein(w, q) <= max(1, len(q) // 3)
+            )
+
+        def bounded_pairwise():
+            return sum(
+                1 for q in queries for w in vocabulary if within_distance(w, q, max(1, len(q) // 3))
+            )
+
+        def bounded_batch():
+            return sum(len(batch_within_distance(q, vocabulary, max(1, len(q) // 3))) for q in queries)
+
+        def legacy_fuzzy_match():
+            return sum(1 for t in texts for q in queries[:10] if self._legacy_fuzzy_match(t, q))
+
+        def kernel_fuzzy_match():
+            return sum(1 for t in texts for q in queries[:10] if fuzzy_match(t, q))
+
+        pairs = len(queries) * len(vocabulary)
+        rows = [
+            ("levenshtein (full matrix)", full_matrix, pairs),
+            ("within_distance (pairwise)", bounded_pairwise, pairs),
+            ("batch_within_distance", bounded_batch, pairs),
+            ("fuzzy_match (legacy)", legacy_fuzzy_match, len(texts) * 10),
+            ("fuzzy_match (bounded)", kernel_fuzzy_match, len(texts) * 10),
+        ]
+
+        self.stdout.write(f"{'kernel':<30}{'matches':>10}{'best ms':>12}{'ops/s':>14}")
+        for name, func, ops in rows:
+            matches, best = self._time(func, repeat)
+            self.stdout.write(f"{name:<30}{matches:>10}{best * 1000:>12.2f}{ops / best:>14,.0f}")
+
+    @staticmethod
+    def _time(func, repeat):
+        best = float("inf")
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+        return result, best
+
+    @staticmethod
+    def _word(rng):
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12)))
+
+    @staticmethod
+    def _typo(rng, word):
+        i = rng.randrange(len(word))
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+
+    @staticmethod
+    def _legacy_fuzzy_match(candidate, query):
+        """The pre-kernel implementation of fuzzy_match, kept as a baseline."""
+        candidate_lower = candidate.lower()
+        query_lower = query.lower()
+        if query_lower in candidate_lower:
+            return True
+        candidate_words = candidate_lower.split()
+        for qw in query_lower.split():
+            threshold = max(1, len(qw) // 3)
+            if not any(levenshtein(cw, qw) <= threshold for cw in candidate_words):
+                return False
+        return True
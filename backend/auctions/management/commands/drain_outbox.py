@@ -0,0 +1,20 @@
+"""
+Django management command to deliver pending outbox events.
+Usage: python manage.py drain_outbox [--batch-size 500]
+"""
+from django.core.management.base import BaseCommand
+
+from auctions.services import OutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox events (notifications and WebSocket pushes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=OutboxDispatcher.BATCH_SIZE, help="Events per batch"
+        )
+
+    def handle(self, *args, **options):
+        processed = OutboxDispatcher.drain(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} outbox events."))
@@ -0,0 +1,291 @@
+"""
+Django management command to load-test the API and WebSocket consumers in-process.
+Requests go through the full Django/Channels stack without a server or network,
+against whatever database is configured (run seed_marketplace first). The bid,
+bid_async and buy_now scenarios place real bids and purchases on the seeded
+auctions; bid_async drives the async endpoint with concurrent coroutines.
+Usage: python manage.py loadtest [--scenarios list,search,detail,bid] [--requests 200] [--concurrency 4]
+"""
+import random
+import time
+from decimal import ROUND_UP, Decimal
+
+from asgiref.sync import ThreadSensitiveContext, async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from auctions.models import AuctionItem, Category, UserAccount
+from auctions.utils.benchmark import format_summaries, run_async_workload, run_workload
+
+from .seed_marketplace import ADJECTIVES, CATALOG, USERNAME_PREFIX
+
+SCENARIOS = ["list", "search", "detail", "bid", "bid_async", "buy_now", "ws_balance", "ws_chat"]
+ASYNC_SCENARIOS = {"bid_async", "ws_balance", "ws_chat"}
+SORTS = ["newest", "ending_soon", "highest_bid", "lowest_price"]
+WS_TIMEOUT = 2  # seconds
+
+
+class Command(BaseCommand):
+    help = "Measure p50/p95/p99 latency and throughput of the main endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios",
+            default=",".join(SCENARIOS),
+            help=f"Comma-separated subset of: {', '.join(SCENARIOS)}",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Operations per scenario")
+        parser.add_argument("--concurrency", type=int, default=1, help="Concurrent workers")
+        parser.add_argument("--hot-auctions", type=int, default=5, help="Auctions receiving bids")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    def handle(self, *args, **options):
+        scenarios = [s.strip() for s in options["scenarios"].split(",") if s.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        self.rng = random.Random(options["seed"])
+        self.users = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by("pk"))
+        self.auction_ids = list(
+            AuctionItem.objects.filter(status="active", end_time__gt=timezone.now())
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        if len(self.users) < 2 or not self.auction_ids:
+            raise CommandError("No seeded data found. Run seed_marketplace first.")
+
+        requests = options["requests"]
+        concurrency = options["concurrency"]
+        summaries = []
+        # The in-process client addresses requests to "testserver"
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for scenario in scenarios:
+                builder = getattr(self, f"_{scenario}")
+                if scenario in ASYNC_SCENARIOS:
+                    summary = async_to_sync(run_async_workload)(
+                        scenario, builder(requests, options), concurrency
+                    )
+                else:
+                    summary = run_workload(scenario, builder(requests, options), concurrency)
+                summaries.append(summary)
+
+        for line in format_summaries(summaries):
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f"Ran {len(summaries)} scenarios."))
+
+    # --- HTTP scenarios (each returns a list of callables) ---
+
+    @staticmethod
+    def _client(user=None):
+        # One client per operation: APIClient is not safe to share across threads
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client
+
+    @staticmethod
+    def _get(url, user=None):
+        return lambda: Command._client(user).get(url).status_code == 200
+
+    def _list(self, count, options):
+        """Anonymous browsing, so the listing cache is part of the measurement."""
+        categories = list(Category.objects.values_list("name", flat=True)) or [""]
+        operations = []
+        for _ in range(count):
+            params = [f"sort_by={self.rng.choice(SORTS)}"]
+            if self.rng.random() < 0.5:
+                params.append(f"category={self.rng.choice(categories)}")
+            if self.rng.random() < 0.3:
+                params.append(f"min_price={self.rng.choice([50, 100, 500])}")
+            operations.append(self._get(f"/api/auction-items/?{'&'.join(params)}"))
+        return operations
+
+    def _search(self, count, options):
+        words = ADJECTIVES + [noun for nouns in CATALOG.values() for noun in nouns]
+        operations = []
+        for _ in range(count):
+            word = self.rng.choice(words)
+            if len(word) > 4 and self.rng.random() < 0.3:
+                # Typo to exercise the fuzzy path
+                i = self.rng.randrange(len(word))
+                word = word[:i] + "x" + word[i + 1:]
+            operations.append(self._get(f"/api/auction-items/search/?q={word}"))
+        return operations
+
+    def _detail(self, count, options):
+        return [
+            self._get(f"/api/auction-items/{self.rng.choice(self.auction_ids)}/", self.rng.choice(self.users))
+            for _ in range(count)
+        ]
+
+    def _bid(self, count, options):
+        return [
+            self._post(f"/api/auction-items/{pk}/bid/", bidder, amount)
+            for pk, bidder, amount in self._plan_bids(count, options)
+        ]
+
+    def _bid_async(self, count, options):
+        """Same bids through the async endpoint, as concurrent coroutines."""
+        def operation(pk, bidder, amount):
+            async def run():
+                # One context per request, as the ASGI handler does, so each
+                # request's database hop gets its own thread
+                async with ThreadSensitiveContext():
+                    start = time.perf_counter()
+                    response = await AsyncClient().post(
+                        f"/api/auction-items/{pk}/bid-async/",
+                        {"amount": str(amount)},
+                        content_type="application/json",
+                        headers={"Authorization": f"Bearer {AccessToken.for_user(bidder)}"},
+                    )
+                    if response.status_code not in (200, 201):
+                        return None
+                    return time.perf_counter() - start
+
+            return run
+
+        return [operation(*bid) for bid in self._plan_bids(count, options)]
+
+    def _plan_bids(self, count, options):
+        """
+        Bids on a few hot auctions without a Buy Now cap. Bidders rotate so
+        that a (bidder, auction) pair does not repeat within the bid
+        rate-limit window. Rejected bids are reported as errors.
+
+        Returns:
+            list: (auction id, bidder, amount)
+        """
+        hot = list(
+            AuctionItem.objects.filter(pk__in=self.auction_ids, buy_now_price__isnull=True)
+            .order_by("-bid_count", "pk")
+            .values("pk", "owner_id", "current_bid", "starting_bid")[: options["hot_auctions"]]
+        )
+        if not hot:
+            raise CommandError("No active auctions without a Buy Now price to bid on.")
+        self._fund(self.users)
+        next_amount = {a["pk"]: a["current_bid"] or a["starting_bid"] for a in hot}
+
+        bids = []
+        for i in range(count):
+            auction = hot[i % len(hot)]
+            bidder = self.users[(i // len(hot)) % len(self.users)]
+            if bidder.pk == auction["owner_id"]:
+                bidder = self.users[(i // len(hot) + 1) % len(self.users)]
+            amount = (next_amount[auction["pk"]] * Decimal("1.03")).quantize(
+                Decimal("0.01"), rounding=ROUND_UP
+            )
+            next_amount[auction["pk"]] = amount
+            bids.append((auction["pk"], bidder, amount))
+        return bids
+
+    def _buy_now(self, count, options):
+        candidates = list(
+            AuctionItem.objects.filter(pk__in=self.auction_ids, buy_now_price__isnull=False)
+            .order_by("pk")
+            .values_list("pk", "owner_id")[:count]
+        )
+        if len(candidates) < count:
+            self.stdout.write(
+                self.style.WARNING(f"Only {len(candidates)} auctions can be bought now.")
+            )
+        self._fund(self.users)
+        operations = []
+        for i, (pk, owner_id) in enumerate(candidates):
+            buyer = self.users[i % len(self.users)]
+            if buyer.pk == owner_id:
+                buyer = self.users[(i + 1) % len(self.users)]
+            operations.append(self._post(f"/api/auction-items/{pk}/buy_now/", buyer))
+        return operations
+
+    @staticmethod
+    def _post(url, user, amount=None):
+        data = {} if amount is None else {"amount": str(amount)}
+
+        def operation():
+            response = Command._client(user).post(url, data, format="json")
+            return response.status_code in (200, 201)
+
+        return operation
+
+    @staticmethod
+    def _fund(users):
+        UserAccount.objects.filter(user__in=users).update(balance=Decimal("1000000000.00"))
+
+    # --- WebSocket scenarios (each returns a list of coroutine functions) ---
+
+    @staticmethod
+    def _application():
+        try:
+            from channels.routing import get_default_application
+            from channels.testing import WebsocketCommunicator
+        except ImportError as exc:
+            raise CommandError(f"WebSocket scenarios need channels' test server: {exc}")
+        return get_default_application(), WebsocketCommunicator
+
+    def _ws_balance(self, count, options):
+        """Latency from a balance group_send to the frame reaching the client."""
+        application, communicator_class = self._application()
+        channel_layer = get_channel_layer()
+
+        def operation(user):
+            async def run():
+                communicator = communicator_class(
+                    application, f"/ws/balance/?token={AccessToken.for_user(user)}"
+                )
+                connected, _ = await communicator.connect()
+                if not connected:
+                    return None
+                try:
+                    start = time.perf_counter()
+                    await channel_layer.group_send(
+                        f"user_balance_{user.id}", {"type": "balance_update", "balance": "1.00"}
+                    )
+                    await communicator.receive_from(timeout=WS_TIMEOUT)
+                    return time.perf_counter() - start
+                finally:
+                    await communicator.disconnect()
+
+            return run
+
+        return [operation(self.rng.choice(self.users)) for _ in range(count)]
+
+    def _ws_chat(self, count, options):
+        """Round trip of a chat message from one participant to the other."""
+        application, communicator_class = self._application()
+
+        def operation(sender, recipient):
+            room = "_".join(sorted([sender.username, recipient.username]))
+
+            async def run():
+                communicators = [
+                    communicator_class(
+                        application, f"/ws/chat/{room}/?token={AccessToken.for_user(user)}"
+                    )
+                    for user in (sender, recipient)
+                ]
+                try:
+                    for communicator in communicators:
+                        connected, _ = await communicator.connect()
+                        if not connected:
+                            return None
+                    start = time.perf_counter()
+                    await communicators[0].send_json_to(
+                        {"type": "chat_message", "message": "Is this still available?"}
+                    )
+                    await communicators[1].receive_json_from(timeout=WS_TIMEOUT)
+                    return time.perf_counter() - start
+                finally:
+                    for communicator in communicators:
+                        await communicator.disconnect()
+
+            return run
+
+        return [operation(*self.rng.sample(self.users, 2)) for _ in range(count)]
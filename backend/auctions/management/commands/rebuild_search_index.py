@@ -0,0 +1,31 @@
+"""
+Django management command to (re)build the auction search index.
+Usage: python manage.py rebuild_search_index [--active-only]
+"""
+from django.core.management.base import BaseCommand
+
+from auctions.models import AuctionItem
+from auctions.services import SearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the inverted search index for auction items"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--active-only",
+            action="store_true",
+            help="Only index auctions that are still active",
+        )
+
+    def handle(self, *args, **options):
+        items = AuctionItem.objects.only("id", "title", "description").order_by("pk")
+        if options["active_only"]:
+            items = items.filter(status="active")
+
+        indexed = 0
+        for item in items.iterator(chunk_size=500):
+            SearchIndex.index_item(item)
+            indexed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} auction items."))
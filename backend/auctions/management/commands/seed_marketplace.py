@@ -0,0 +1,253 @@
+"""
+Django management command to generate a synthetic marketplace for benchmarking.
+Creates users, categories, auctions, images, bids, chats and notifications
+deterministically from a seed. All generated users share a username prefix,
+so a previous run can be removed with --clear.
+Usage: python manage.py seed_marketplace [--users 200] [--auctions 1000] [--seed 42] [--clear]
+"""
+import random
+from datetime import timedelta
+from decimal import ROUND_UP, Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from auctions.models import (
+    AuctionImage,
+    AuctionItem,
+    Bid,
+    Category,
+    ChatMessage,
+    EscrowHold,
+    Notification,
+    UserAccount,
+)
+from auctions.services import SearchIndex
+
+# No underscore: chat room names are "<userA>_<userB>"
+USERNAME_PREFIX = "seed"
+PASSWORD = "seed-password"
+
+CATALOG = {
+    "Cameras": ["camera", "lens", "tripod", "flash", "rangefinder", "viewfinder"],
+    "Electronics": ["laptop", "monitor", "keyboard", "headphones", "speaker", "tablet"],
+    "Watches": ["watch", "chronograph", "bracelet", "strap", "dial"],
+    "Furniture": ["chair", "table", "lamp", "bookshelf", "cabinet", "desk"],
+    "Music": ["guitar", "amplifier", "vinyl", "turntable", "synthesizer", "drum"],
+    "Books": ["novel", "atlas", "encyclopedia", "manuscript", "comic"],
+    "Sports": ["bicycle", "skis", "racket", "helmet", "kayak"],
+    "Collectibles": ["coin", "stamp", "poster", "figurine", "card"],
+}
+ADJECTIVES = [
+    "vintage", "rare", "classic", "modern", "antique", "compact", "professional",
+    "limited", "restored", "original", "portable", "handmade", "signed", "mint",
+]
+LOCATIONS = ["Sofia", "Plovdiv", "Varna", "Burgas", "Ruse", "Berlin", "Vienna", "Athens"]
+CONDITIONS = ["New", "Used", "Refurbished"]
+CHAT_LINES = [
+    "Is this still available?", "Can you ship abroad?", "What is the lowest price?",
+    "Thanks, payment sent.", "Does it come with the original box?", "Shipped today.",
+]
+NOTIFICATION_TYPES = ["bid", "outbid", "won", "ending_soon", "ended", "buy_now", "shipped"]
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic marketplace for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--auctions", type=int, default=1000)
+        parser.add_argument("--max-bids", type=int, default=12, help="Maximum bids per auction")
+        parser.add_argument("--max-images", type=int, default=3, help="Maximum images per auction")
+        parser.add_argument("--chats", type=int, default=2000, help="Number of chat messages")
+        parser.add_argument("--notifications", type=int, default=3000)
+        parser.add_argument("--closed-ratio", type=float, default=0.2)
+        parser.add_argument("--buy-now-ratio", type=float, default=0.3)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--skip-index", action="store_true", help="Do not build the search index"
+        )
+        parser.add_argument(
+            "--clear", action="store_true", help="Delete previously seeded data first"
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        if options["clear"]:
+            deleted, _ = User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+            self.stdout.write(f"Deleted {deleted} previously seeded rows.")
+
+        with transaction.atomic():
+            categories = self._categories()
+            users = self._users(rng, options["users"])
+            auctions = self._auctions(rng, users, categories, options)
+            bids = self._bids(rng, users, auctions, options["max_bids"])
+            images = self._images(rng, auctions, options["max_images"])
+            chats = self._chats(rng, users, options["chats"])
+            notifications = self._notifications(rng, users, auctions, options["notifications"])
+
+        if not options["skip_index"]:
+            for auction in auctions:
+                SearchIndex.index_item(auction)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(users)} users, {len(auctions)} auctions, {bids} bids, "
+                f"{images} images, {chats} chat messages and {notifications} notifications."
+            )
+        )
+
+    def _categories(self):
+        for name in CATALOG:
+            Category.objects.get_or_create(name=name)
+        return list(Category.objects.filter(name__in=CATALOG).order_by("name"))
+
+    def _users(self, rng, count):
+        password = make_password(PASSWORD)
+        start = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+        usernames = [f"{USERNAME_PREFIX}{start + i:06d}" for i in range(count)]
+        User.objects.bulk_create(
+            [User(username=name, email=f"{name}@example.com", password=password) for name in usernames],
+            batch_size=self.batch_size,
+        )
+        # bulk_create bypasses the post_save signal that creates accounts
+        users = list(User.objects.filter(username__in=usernames).order_by("username"))
+        UserAccount.objects.bulk_create(
+            [
+                UserAccount(user=user, balance=Decimal(rng.randrange(500, 5000)))
+                for user in users
+            ],
+            batch_size=self.batch_size,
+        )
+        return users
+
+    def _auctions(self, rng, users, categories, options):
+        now = timezone.now()
+        auctions = []
+        for _ in range(options["auctions"]):
+            category = rng.choice(categories)
+            noun = rng.choice(CATALOG[category.name])
+            adjectives = rng.sample(ADJECTIVES, 2)
+            starting_bid = Decimal(rng.randrange(10, 2000))
+            condition = rng.choice(CONDITIONS)
+            closed = rng.random() < options["closed_ratio"]
+            buy_now_price = None
+            if rng.random() < options["buy_now_ratio"]:
+                buy_now_price = (starting_bid * Decimal(rng.uniform(1.5, 3))).quantize(Decimal("1"))
+            if closed:
+                end_time = now - timedelta(minutes=rng.randrange(1, 60 * 24 * 30))
+            else:
+                end_time = now + timedelta(minutes=rng.randrange(1, 60 * 24 * 7))
+
+            auctions.append(
+                AuctionItem(
+                    owner=rng.choice(users),
+                    category=category,
+                    title=f"{adjectives[0].title()} {adjectives[1]} {noun}",
+                    description=(
+                        f"{adjectives[0].title()} {noun} in {condition.lower()} "
+                        f"condition. Pickup in {rng.choice(LOCATIONS)} or shipping by courier."
+                    ),
+                    starting_bid=starting_bid,
+                    buy_now_price=buy_now_price,
+                    end_time=end_time,
+                    status="closed" if closed else "active",
+                    condition=condition,
+                    location=rng.choice(LOCATIONS),
+                )
+            )
+        return AuctionItem.objects.bulk_create(auctions, batch_size=self.batch_size)
+
+    def _bids(self, rng, users, auctions, max_bids):
+        now = timezone.now()
+        bids = []
+        for auction in auctions:
+            amount = auction.starting_bid
+            bidder = None
+            for _ in range(rng.randrange(0, max_bids + 1)):
+                step = Decimal(rng.uniform(1.03, 1.15))
+                next_amount = (amount * step).quantize(Decimal("0.01"), rounding=ROUND_UP)
+                if auction.buy_now_price and next_amount >= auction.buy_now_price:
+                    break
+                candidates = [u for u in rng.sample(users, min(4, len(users)))
+                              if u.pk not in (auction.owner_id, getattr(bidder, "pk", None))]
+                if not candidates:
+                    break
+                bidder, amount = candidates[0], next_amount
+                bids.append(Bid(auction_item=auction, bidder=bidder, amount=amount))
+                auction.current_bid = amount
+                auction.top_bidder = bidder
+                auction.bid_count += 1
+                auction.last_bid_at = now
+            if auction.status == "closed":
+                auction.winner = auction.top_bidder
+
+        Bid.objects.bulk_create(bids, batch_size=self.batch_size)
+        # Open auctions hold their top bid like a real bid would
+        EscrowHold.objects.bulk_create(
+            [
+                EscrowHold(user=auction.top_bidder, auction_item=auction, amount=auction.current_bid)
+                for auction in auctions
+                if auction.status == "active" and auction.top_bidder is not None
+            ],
+            batch_size=self.batch_size,
+        )
+        AuctionItem.objects.bulk_update(
+            auctions,
+            ["current_bid", "top_bidder", "bid_count", "last_bid_at", "winner"],
+            batch_size=self.batch_size,
+        )
+        return len(bids)
+
+    def _images(self, rng, auctions, max_images):
+        # Paths only; no files are written, so the generator stays offline
+        images = [
+            AuctionImage(auction_item=auction, image=f"auction_images/seed/{auction.pk}_{n}.jpg")
+            for auction in auctions
+            for n in range(rng.randrange(0, max_images + 1))
+        ]
+        AuctionImage.objects.bulk_create(images, batch_size=self.batch_size)
+        return len(images)
+
+    def _chats(self, rng, users, count):
+        if len(users) < 2:
+            return 0
+        messages = []
+        for _ in range(count):
+            sender, recipient = rng.sample(users, 2)
+            messages.append(
+                ChatMessage(
+                    sender=sender,
+                    recipient=recipient,
+                    message=rng.choice(CHAT_LINES),
+                    is_read=rng.random() < 0.7,
+                )
+            )
+        ChatMessage.objects.bulk_create(messages, batch_size=self.batch_size)
+        return len(messages)
+
+    def _notifications(self, rng, users, auctions, count):
+        if not auctions:
+            return 0
+        notifications = []
+        for _ in range(count):
+            auction = rng.choice(auctions)
+            notification_type = rng.choice(NOTIFICATION_TYPES)
+            notifications.append(
+                Notification(
+                    user=rng.choice(users),
+                    notification_type=notification_type,
+                    title=notification_type.replace("_", " ").title(),
+                    message=f"Update on '{auction.title}'.",
+                    auction_item=auction,
+                    is_read=rng.random() < 0.5,
+                )
+            )
+        Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+        return len(notifications)
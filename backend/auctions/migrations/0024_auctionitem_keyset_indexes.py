@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 01:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0023_auctionitem_bid_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auctionitem',
+            name='auctions_au_status_c82cc2_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='auctions_au_status_0d5e32_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', 'end_time', 'id'], name='auctions_au_status_65a2f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', 'current_bid', 'id'], name='auctions_au_status_e4fbc9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', 'starting_bid', 'id'], name='auctions_au_status_bf7b0e_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0024_auctionitem_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50, unique=True)),
+                ('length', models.PositiveSmallIntegerField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('in_title', models.BooleanField(default=False)),
+                ('auction_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_postings', to='auctions.auctionitem')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='auctions.searchterm')),
+            ],
+            options={
+                'unique_together': {('term', 'auction_item')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTermTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='auctions.searchterm')),
+            ],
+            options={
+                'unique_together': {('trigram', 'term')},
+            },
+        ),
+    ]
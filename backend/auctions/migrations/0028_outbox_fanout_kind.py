@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0027_proxy_bid'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxevent',
+            name='kind',
+            field=models.CharField(choices=[('notification', 'Notification'), ('balance', 'Balance update'), ('group_send', 'Channel group message'), ('fanout', 'Notification to every bidder')], max_length=20),
+        ),
+    ]
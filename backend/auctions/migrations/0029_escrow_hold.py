@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def hold_top_bids(apps, schema_editor):
+    """
+    Top bids of open auctions were debited from the balance; turn each
+    into an active hold and give the funds back to the balance.
+    """
+    AuctionItem = apps.get_model("auctions", "AuctionItem")
+    EscrowHold = apps.get_model("auctions", "EscrowHold")
+    UserAccount = apps.get_model("auctions", "UserAccount")
+
+    open_auctions = AuctionItem.objects.filter(status="active", top_bidder__isnull=False)
+    for auction_id, user_id, amount in open_auctions.values_list("pk", "top_bidder_id", "current_bid"):
+        EscrowHold.objects.create(user_id=user_id, auction_item_id=auction_id, amount=amount)
+        UserAccount.objects.filter(user_id=user_id).update(balance=F("balance") + amount)
+
+
+def debit_active_holds(apps, schema_editor):
+    EscrowHold = apps.get_model("auctions", "EscrowHold")
+    UserAccount = apps.get_model("auctions", "UserAccount")
+
+    for user_id, amount in EscrowHold.objects.filter(status="active").values_list("user_id", "amount"):
+        UserAccount.objects.filter(user_id=user_id).update(balance=F("balance") - amount)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0028_outbox_fanout_kind'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('deposit', 'Deposit'), ('withdrawal', 'Withdrawal'), ('bid_lock', 'Bid Lock'), ('bid_release', 'Bid Release'), ('bid_capture', 'Bid Capture'), ('seller_payment', 'Seller Payment')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='EscrowHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('released', 'Released'), ('captured', 'Captured')], default='active', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('auction_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='escrow_holds', to='auctions.auctionitem')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='escrow_holds', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'active')), fields=['user'], name='escrowhold_active_idx')],
+                'unique_together': {('user', 'auction_item')},
+            },
+        ),
+        migrations.RunPython(hold_top_bids, debit_active_holds),
+    ]
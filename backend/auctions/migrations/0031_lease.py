@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0030_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Lease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('holder', models.CharField(max_length=255)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0031_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SweepMarker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('window_start', models.DateTimeField()),
+                ('window_end', models.DateTimeField()),
+                ('swept_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
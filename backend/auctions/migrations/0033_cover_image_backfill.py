@@ -0,0 +1,26 @@
+from django.db import migrations
+from django.db.models import OuterRef, Q, Subquery
+
+
+def use_first_image_as_cover(apps, schema_editor):
+    """Listing cards show only the main image; fill it from the gallery."""
+    AuctionItem = apps.get_model("auctions", "AuctionItem")
+    AuctionImage = apps.get_model("auctions", "AuctionImage")
+
+    first_image = (
+        AuctionImage.objects.filter(auction_item=OuterRef("pk")).order_by("pk").values("image")[:1]
+    )
+    AuctionItem.objects.filter(Q(image="") | Q(image__isnull=True)).filter(
+        images__isnull=False
+    ).distinct().update(image=Subquery(first_image))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auctions", "0032_sweep_marker"),
+    ]
+
+    operations = [
+        migrations.RunPython(use_first_image_as_cover, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0033_cover_image_backfill'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(condition=models.Q(('dispatched_at__isnull', False)), fields=['dispatched_at'], name='outbox_dispatched_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:53
+
+import auctions.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0034_outbox_dispatched_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auctionitem',
+            name='auctions_au_status_0d5e32_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auctionitem',
+            name='auctions_au_status_e4fbc9_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='auctions_au_status_c39119_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=auctions.models.NullsLastIndex(models.F('status'), models.OrderBy(models.F('current_bid'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='auction_highest_bid_idx'),
+        ),
+    ]
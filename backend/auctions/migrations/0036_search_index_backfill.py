@@ -0,0 +1,61 @@
+from django.db import migrations
+
+from auctions.utils.search import tokenize, trigrams
+
+
+def index_existing_auctions(apps, schema_editor):
+    """Index the auctions created before the search index existed."""
+    AuctionItem = apps.get_model("auctions", "AuctionItem")
+    SearchTerm = apps.get_model("auctions", "SearchTerm")
+    SearchTermTrigram = apps.get_model("auctions", "SearchTermTrigram")
+    SearchPosting = apps.get_model("auctions", "SearchPosting")
+
+    unindexed = (
+        AuctionItem.objects.filter(search_postings__isnull=True)
+        .order_by("pk")
+        .values_list("pk", "title", "description")
+    )
+    last_pk = 0
+    while True:
+        batch = list(unindexed.filter(pk__gt=last_pk)[:200])
+        if not batch:
+            return
+        last_pk = batch[-1][0]
+
+        words = {}  # auction id -> {word: in_title}
+        for pk, title, description in batch:
+            title_words = set(tokenize(title))
+            words[pk] = {
+                word: word in title_words for word in title_words | set(tokenize(description))
+            }
+        vocabulary = set().union(*words.values())
+        term_ids = dict(SearchTerm.objects.filter(term__in=vocabulary).values_list("term", "id"))
+        missing = vocabulary - term_ids.keys()
+        SearchTerm.objects.bulk_create([SearchTerm(term=word, length=len(word)) for word in missing])
+        created = dict(SearchTerm.objects.filter(term__in=missing).values_list("term", "id"))
+        SearchTermTrigram.objects.bulk_create(
+            [
+                SearchTermTrigram(trigram=gram, term_id=term_id)
+                for word, term_id in created.items()
+                for gram in trigrams(word)
+            ]
+        )
+        term_ids.update(created)
+        SearchPosting.objects.bulk_create(
+            [
+                SearchPosting(term_id=term_ids[word], auction_item_id=pk, in_title=in_title)
+                for pk, item_words in words.items()
+                for word, in_title in item_words.items()
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auctions", "0035_keyset_index_orderings"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_existing_auctions, migrations.RunPython.noop),
+    ]
@@ -5,7 +5,10 @@ from decimal import Decimal
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.conf import settings
+from django.db.models import Case, CharField, F, OrderBy, Value, When
+from django.db.models.functions import Now
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -33,12 +36,20 @@ def create_user_account(sender, instance, created, **kwargs):
         UserAccount.objects.create(user=instance)
 
 
+@receiver(post_save, sender=UserAccount)
+def invalidate_available_balance(sender, instance, **kwargs):
+    from .services.escrow import Escrow
+
+    Escrow.invalidate([instance.user_id])
+
+
 class Transaction(models.Model):
     TRANSACTION_TYPE_CHOICES = [
         ("deposit", "Deposit"),
         ("withdrawal", "Withdrawal"),
         ("bid_lock", "Bid Lock"),  # When funds are temporarily held for a bid.
         ("bid_release", "Bid Release"),  # When funds are released (e.g., bid lost).
+        ("bid_capture", "Bid Capture"),  # When held funds pay for a won item.
         ("seller_payment", "Seller Payment"),  # Payment to seller after verification.
     ]
 
@@ -62,6 +73,42 @@ class Transaction(models.Model):
         return f"{self.get_transaction_type_display()} of {self.amount} for {self.user.username} - {self.status}"
 
 
+class NullsLastIndex(models.Index):
+    """
+    An index whose `nulls_last` columns keep the modifier, so it matches an
+    `ORDER BY ... NULLS LAST` on PostgreSQL. SQLite rejects the modifier in
+    CREATE INDEX; its descending order already puts nulls last.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "sqlite":
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        expressions = [
+            OrderBy(expression.expression, descending=expression.descending)
+            if isinstance(expression, OrderBy)
+            else expression
+            for expression in self.expressions
+        ]
+        return models.Index(*expressions, name=self.name).create_sql(
+            model, schema_editor, using=using, **kwargs
+        )
+
+
+class AuctionItemQuerySet(models.QuerySet):
+    def with_effective_status(self):
+        """
+        Annotate `annotated_status`, the query-time equivalent of
+        AuctionItem.effective_status, so reads never need to close auctions.
+        """
+        return self.annotate(
+            annotated_status=Case(
+                When(status="active", end_time__lte=Now(), then=Value("closed")),
+                default=F("status"),
+                output_field=CharField(),
+            )
+        )
+
+
 class AuctionItem(models.Model):
     STATUS_CHOICES = [
         ("active", "Active"),
@@ -118,16 +165,41 @@ class AuctionItem(models.Model):
         choices=[("New", "New"), ("Used", "Used"), ("Refurbished", "Refurbished")],
     )
     location = models.CharField(max_length=100)
+    # Denormalized top-bid state, maintained by the bid/buy-now/closing paths
+    top_bidder = models.ForeignKey(
+        User,
+        related_name="leading_auctions",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    bid_count = models.PositiveIntegerField(default=0)
+    last_bid_at = models.DateTimeField(null=True, blank=True)
+
+    objects = AuctionItemQuerySet.as_manager()
 
     class Meta:
         indexes = [
-            models.Index(fields=["status", "end_time"]),
+            # Keyset pagination indexes, one per listing sort mode, in the
+            # exact order AuctionKeysetPagination.get_ordering emits
+            models.Index(fields=["status", "-created_at", "-id"]),
+            models.Index(fields=["status", "end_time", "id"]),
+            NullsLastIndex(
+                "status",
+                F("current_bid").desc(nulls_last=True),
+                F("id").desc(),
+                name="auction_highest_bid_idx",
+            ),
+            models.Index(fields=["status", "starting_bid", "id"]),
             models.Index(fields=["owner"]),
             models.Index(fields=["winner"]),
         ]
 
     @property
     def effective_status(self):
+        annotated = self.__dict__.get("annotated_status")
+        if annotated is not None:
+            return annotated
         if self.status == "active" and self.end_time <= timezone.now():
             return "closed"
         return self.status
@@ -176,6 +248,71 @@ class Bid(models.Model):
         return f"{self.bidder.username} bid ${self.amount} on {self.auction_item.title}"
 
 
+class ProxyBid(models.Model):
+    """
+    A bidder's maximum on an auction. The server bids on their behalf, one
+    minimum increment above the competition, up to this amount.
+    """
+
+    auction_item = models.ForeignKey(
+        AuctionItem, related_name="proxy_bids", on_delete=models.CASCADE
+    )
+    bidder = models.ForeignKey(User, related_name="proxy_bids", on_delete=models.CASCADE)
+    max_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("auction_item", "bidder")
+        indexes = [
+            models.Index(
+                fields=["auction_item", "created_at"],
+                condition=models.Q(is_active=True),
+                name="proxybid_active_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.bidder.username} max ${self.max_amount} on {self.auction_item.title}"
+
+
+class EscrowHold(models.Model):
+    """
+    Funds a user has committed to an auction. Bidding moves holds instead of
+    the account balance; what a user can spend is their balance minus their
+    active holds (see services.Escrow).
+    """
+
+    STATUS_CHOICES = [
+        ("active", "Active"),
+        ("released", "Released"),  # Outbid, or the auction ended without them.
+        ("captured", "Captured"),  # Paid out of the balance for a won item.
+    ]
+
+    user = models.ForeignKey(User, related_name="escrow_holds", on_delete=models.CASCADE)
+    auction_item = models.ForeignKey(
+        AuctionItem, related_name="escrow_holds", on_delete=models.CASCADE
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="active")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "auction_item")
+        indexes = [
+            models.Index(
+                fields=["user"],
+                condition=models.Q(status="active"),
+                name="escrowhold_active_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} holds ${self.amount} on {self.auction_item.title} ({self.status})"
+
+
 class AuctionImage(models.Model):
     auction_item = models.ForeignKey(
         AuctionItem, related_name="images", on_delete=models.CASCADE
@@ -235,3 +372,152 @@ class Notification(models.Model):
 
     def __str__(self):
         return f"{self.get_notification_type_display()} for {self.user.username}: {self.title}"
+
+
+class SearchTerm(models.Model):
+    """A distinct word from some auction's title or description."""
+
+    term = models.CharField(max_length=50, unique=True)
+    length = models.PositiveSmallIntegerField(db_index=True)
+
+    def __str__(self):
+        return self.term
+
+
+class SearchTermTrigram(models.Model):
+    """Character trigram of a search term, used to shortlist fuzzy matches."""
+
+    trigram = models.CharField(max_length=3)
+    term = models.ForeignKey(SearchTerm, related_name="trigrams", on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ("trigram", "term")
+
+    def __str__(self):
+        return f"{self.trigram!r} in {self.term.term}"
+
+
+class SearchPosting(models.Model):
+    """Inverted-index entry: `term` occurs in `auction_item`."""
+
+    term = models.ForeignKey(SearchTerm, related_name="postings", on_delete=models.CASCADE)
+    auction_item = models.ForeignKey(
+        AuctionItem, related_name="search_postings", on_delete=models.CASCADE
+    )
+    in_title = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ("term", "auction_item")
+
+    def __str__(self):
+        return f"{self.term.term} -> {self.auction_item_id}"
+
+
+class OutboxEvent(models.Model):
+    """
+    A side effect (notification row or WebSocket push) recorded in the same
+    transaction as the state change that caused it. The outbox dispatcher
+    delivers pending events after commit.
+    """
+
+    KIND_CHOICES = [
+        ("notification", "Notification"),
+        ("balance", "Balance update"),
+        ("group_send", "Channel group message"),
+        ("fanout", "Notification to every bidder"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(dispatched_at__isnull=True),
+                name="outbox_pending_idx",
+            ),
+            # Purging dispatched events by age (see OutboxDispatcher.purge)
+            models.Index(
+                fields=["dispatched_at"],
+                condition=models.Q(dispatched_at__isnull=False),
+                name="outbox_dispatched_idx",
+            ),
+        ]
+
+    def __str__(self):
+        state = "dispatched" if self.dispatched_at else "pending"
+        return f"{self.get_kind_display()} #{self.pk} ({state})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    An Idempotency-Key sent with a request (or a Stripe event id) and the
+    response it produced, so a retried request is answered from here
+    instead of running again. status_code is null while the first request
+    is still running.
+    """
+
+    user = models.ForeignKey(
+        User, null=True, blank=True, related_name="idempotency_keys", on_delete=models.CASCADE
+    )
+    scope = models.CharField(max_length=30)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64, blank=True, default="")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "scope", "key"],
+                condition=models.Q(user__isnull=False),
+                name="idempotency_user_key_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["scope", "key"],
+                condition=models.Q(user__isnull=True),
+                name="idempotency_key_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        state = self.status_code or "in progress"
+        return f"{self.scope} {self.key} ({state})"
+
+
+class Lease(models.Model):
+    """
+    A named, expiring claim on a job that must run in one process at a time
+    (see LeaderLease). The holder renews it before expires_at; once it has
+    expired, any other process may take it over.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    holder = models.CharField(max_length=255)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} held by {self.holder} until {self.expires_at}"
+
+
+class SweepMarker(models.Model):
+    """
+    The last window a periodic sweep processed, e.g. the end times for
+    which "ending soon" notices were sent. Each sweep starts where the
+    previous window ended, so rows are only looked at once.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    window_start = models.DateTimeField()
+    window_end = models.DateTimeField()
+    swept_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.window_start} - {self.window_end}"
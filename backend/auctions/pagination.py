@@ -0,0 +1,170 @@
+# auctions/pagination.py
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class AuctionKeysetPagination(BasePagination):
+    """
+    Opaque-cursor keyset pagination for the auction listing.
+
+    Every sort mode orders by (sort field, id) and the cursor stores the
+    values of the last row on the page, so the next page is a range scan
+    on the matching (status, <field>, id) index instead of an OFFSET.
+    Pages stay stable when auctions are created or re-priced concurrently.
+    """
+
+    page_size = 24
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    sort_query_param = "sort_by"
+    default_sort = "newest"
+    invalid_cursor_message = "Invalid cursor"
+
+    # sort_by -> (field, descending). id breaks ties in the same direction.
+    SORT_ORDERINGS = {
+        "newest": ("created_at", True),
+        "ending_soon": ("end_time", False),
+        "highest_bid": ("current_bid", True),
+        "lowest_price": ("starting_bid", False),
+    }
+
+    @classmethod
+    def get_sort(cls, request):
+        sort_by = request.query_params.get(cls.sort_query_param, cls.default_sort)
+        if sort_by not in cls.SORT_ORDERINGS:
+            sort_by = cls.default_sort
+        return sort_by
+
+    @classmethod
+    def get_ordering(cls, sort_by):
+        """
+        Return the order_by() arguments for a sort mode. Nulls sort last;
+        the modifier is only added for nullable fields, so the other orders
+        match their index exactly (see the AuctionItem indexes).
+        """
+        from .models import AuctionItem
+
+        field, descending = cls.SORT_ORDERINGS.get(sort_by, cls.SORT_ORDERINGS[cls.default_sort])
+        nulls_last = True if AuctionItem._meta.get_field(field).null else None
+        if descending:
+            return (F(field).desc(nulls_last=nulls_last), F("id").desc())
+        return (F(field).asc(nulls_last=nulls_last), F("id").asc())
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.sort_by = self.get_sort(request)
+        self.limit = self.get_page_size(request)
+        field, descending = self.SORT_ORDERINGS[self.sort_by]
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(queryset.model, field, descending, cursor))
+
+        queryset = queryset.order_by(*self.get_ordering(self.sort_by))
+        results = list(queryset[: self.limit + 1])
+        self.has_next = len(results) > self.limit
+        page = results[: self.limit]
+        self.last_item = page[-1] if page else None
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_item is None:
+            return None
+        field, _ = self.SORT_ORDERINGS[self.sort_by]
+        value = getattr(self.last_item, field)
+        cursor = self.encode_cursor(
+            {
+                "s": self.sort_by,
+                "v": None if value is None else self._to_cursor_value(value),
+                "i": self.last_item.pk,
+            }
+        )
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    # --- Cursor encoding ---
+
+    @staticmethod
+    def _to_cursor_value(value):
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def encode_cursor(payload):
+        raw = json.dumps(payload, separators=(",", ":")).encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            cursor = {"s": payload["s"], "v": payload["v"], "i": int(payload["i"])}
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if cursor["s"] != self.sort_by:
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def _after(self, model, field, descending, cursor):
+        """Build the keyset predicate selecting rows strictly after the cursor."""
+        model_field = model._meta.get_field(field)
+        beyond = "lt" if descending else "gt"
+        pk = cursor["i"]
+
+        if cursor["v"] is None:
+            # Nulls sort last, so only the remaining null rows can follow.
+            return Q(**{f"{field}__isnull": True, f"id__{beyond}": pk})
+
+        try:
+            value = model_field.to_python(cursor["v"])
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+        after = Q(**{f"{field}__{beyond}": value}) | Q(**{field: value, f"id__{beyond}": pk})
+        if model_field.null:
+            after |= Q(**{f"{field}__isnull": True})
+        return after
+
+
+class SearchResultsPagination(PageNumberPagination):
+    """Page-number pagination over ranked search results."""
+
+    page_size = 24
+    page_size_query_param = "page_size"
+    max_page_size = 100
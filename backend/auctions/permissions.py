@@ -1,5 +1,8 @@
 # backend/auctions/permissions.py
 
+import hmac
+
+from django.conf import settings
 from rest_framework import permissions
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -25,4 +28,17 @@ class IsBidderOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return obj.bidder == request.user
-        return False
\ No newline at end of file
+        return False
+
+
+class CanScrapeMetrics(permissions.BasePermission):
+    """
+    Allow staff users, and scrapers sending settings.METRICS_TOKEN in the
+    X-Metrics-Token header (when a token is configured).
+    """
+
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        token = request.headers.get("X-Metrics-Token", "")
+        return bool(settings.METRICS_TOKEN) and hmac.compare_digest(token, settings.METRICS_TOKEN)
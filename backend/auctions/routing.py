@@ -5,4 +5,6 @@ from . import consumers
 websocket_urlpatterns = [
     re_path(r"^ws/chat/(?P<room_name>\w+)/$", consumers.ChatConsumer.as_asgi()),
     re_path(r"^ws/balance/$", consumers.BalanceConsumer.as_asgi()),
+    re_path(r"^ws/notifications/$", consumers.NotificationConsumer.as_asgi()),
+    re_path(r"^ws/auctions/(?P<auction_id>\d+)/$", consumers.AuctionConsumer.as_asgi()),
 ]
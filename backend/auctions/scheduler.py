@@ -1,146 +1,295 @@
 """
-Auction closing scheduler using APScheduler.
-Runs a periodic job to check and close expired auctions.
+Auction closing: the deadline queue (see DeadlineQueue) closes each auction
+as its end_time passes; APScheduler runs the periodic housekeeping jobs.
+Every web worker process starts both. Closers claim expired auctions with
+SELECT ... FOR UPDATE SKIP LOCKED where the database supports it, so they
+never settle the same auction; on SQLite a leader lease picks one closer.
 """
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from django.utils import timezone
-from django.db import transaction
-from django.contrib.auth.models import User
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from django.db import connection, transaction
+from django.db.models import F
+
+from auctions.services.metrics import Metrics
 
 logger = logging.getLogger(__name__)
 
 
-def close_expired_auctions():
+# Auctions settled per transaction by close_expired_auctions
+CLOSE_BATCH_SIZE = 200
+
+CLOSE_LAG = Metrics.histogram(
+    "auction_close_lag_seconds",
+    "Time from an auction's end_time until the batch closing it committed.",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+)
+BATCH_DURATION = Metrics.histogram(
+    "auction_close_batch_duration_seconds",
+    "Time to settle one batch of auctions, in one transaction.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+AUCTIONS_CLOSED = Metrics.counter("auctions_closed_total", "Auctions closed.")
+HOLDS_RELEASED = Metrics.counter(
+    "auction_close_refunds_total", "Losing bidders' escrow holds released when closing."
+)
+NOTIFICATIONS_QUEUED = Metrics.counter(
+    "auction_close_notifications_total", "Notifications queued for winners, owners and losers."
+)
+CLOSE_FAILURES = Metrics.counter("auction_close_failures_total", "Closing runs that raised.")
+LAST_SUCCESSFUL_RUN = Metrics.gauge(
+    "auction_close_last_success_timestamp_seconds",
+    "Unix time a closing run (deadline queue pass or sweep) last completed.",
+)
+
+# Housekeeping jobs run in the process holding this lease; the
+# every-minute ending-soon sweep keeps it renewed
+HOUSEKEEPING_LEASE = "housekeeping"
+HOUSEKEEPING_LEASE_TTL = timedelta(minutes=5)
+
+
+def parallel_closing():
     """
-    Close all auctions that have passed their end_time.
-    - Resolve winner (highest bidder)
-    - Update auction status to 'closed'
-    - Release funds for losing bidders
-    - Create notifications for winner and owner
-    - Broadcast balance updates
+    Whether concurrent closers can claim disjoint batches with SKIP LOCKED
+    (PostgreSQL, MySQL 8+, Oracle). Otherwise only one closer may run.
     """
-    from auctions.models import AuctionItem, Bid, UserAccount, Notification, Transaction
+    return connection.features.has_select_for_update_skip_locked
 
-    now = timezone.now()
-    expired_auctions = AuctionItem.objects.filter(
-        status="active", end_time__lte=now
-    ).select_related("owner")
 
-    if not expired_auctions.exists():
+def close_expired_auctions(batch_size=CLOSE_BATCH_SIZE, workers=1):
+    """
+    Close all auctions that have passed their end_time, `batch_size` per
+    transaction (see settle_auctions). The deadline queue closes auctions
+    as they expire; this sweep backs the close_auctions command and catches
+    up after downtime.
+
+    Args:
+        batch_size: Auctions claimed and settled per transaction
+        workers: Threads claiming batches concurrently; 1 unless the
+            database supports SKIP LOCKED
+
+    Returns:
+        int: Number of auctions closed
+    """
+    if workers > 1 and not parallel_closing():
+        logger.warning(f"{connection.vendor} cannot claim batches with SKIP LOCKED; closing with one worker.")
+        workers = 1
+    try:
+        if workers == 1:
+            closed = _close_batches(batch_size)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auction-closer") as pool:
+                closed = sum(pool.map(_close_batches_in_thread, [batch_size] * workers))
+    except Exception:
+        CLOSE_FAILURES.inc()
+        raise
+    LAST_SUCCESSFUL_RUN.set(time.time())
+    if not closed:
         logger.debug("No expired auctions to close.")
-        return
+    return closed
 
-    channel_layer = get_channel_layer()
 
-    for auction in expired_auctions:
-        with transaction.atomic():
-            # Lock the auction row
-            auction = AuctionItem.objects.select_for_update().get(pk=auction.pk)
+def _close_batches(batch_size):
+    """Claim and settle batches of expired auctions until none are left."""
+    from auctions.models import AuctionItem
 
-            # Double-check it's still active (another process might have closed it)
-            if auction.status != "active":
-                continue
+    parallel = parallel_closing()
+    closed = 0
+    while True:
+        # With SKIP LOCKED the claim's row locks last until its batch is
+        # settled. A lone closer reads outside the transaction instead, which
+        # keeps SQLite from having to upgrade a read lock to write
+        with transaction.atomic() if parallel else nullcontext():
+            expired = AuctionItem.objects.filter(
+                status="active", end_time__lte=timezone.now()
+            ).order_by("end_time", "id")
+            if parallel:
+                # Concurrent workers skip these rows and claim the next batch
+                expired = expired.select_for_update(skip_locked=True)
+            expired_ids = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not expired_ids:
+                break
+            settled = settle_auctions(expired_ids)
+        closed += len(settled)
+        if not settled:
+            # Everything left was extended or closed elsewhere meanwhile
+            break
+    return closed
 
-            # Get the highest bid
-            highest_bid = (
-                Bid.objects.filter(auction_item=auction).order_by("-amount").first()
-            )
 
-            if highest_bid:
-                winner = highest_bid.bidder
-                winning_amount = highest_bid.amount
+def _close_batches_in_thread(batch_size):
+    try:
+        return _close_batches(batch_size)
+    finally:
+        connection.close()
 
-                # Set the winner
-                auction.winner = winner
-                auction.status = "closed"
-                auction.save()
 
-                # Release funds for all OTHER bidders
-                losing_bids = Bid.objects.filter(auction_item=auction).exclude(
-                    bidder=winner
-                )
-                for bid in losing_bids:
-                    bidder_account = UserAccount.objects.select_for_update().get(
-                        user=bid.bidder
-                    )
-                    bidder_account.balance += bid.amount
-                    bidder_account.save()
-
-                    # Create transaction record
-                    Transaction.objects.create(
-                        user=bid.bidder,
-                        transaction_type="bid_release",
-                        amount=bid.amount,
-                        status="completed",
-                        description=f"Bid refund for '{auction.title}'",
-                    )
+def settle_auctions(auction_ids):
+    """
+    Close the given auctions that are due, in one transaction and a fixed
+    number of statements however many auctions and bids there are:
+    - Mark them closed, with the top bidder as winner
+    - Pay each winning bid from the winner's escrow hold and release any
+      other holds left (see Escrow.settle)
+    - Notify winners, owners and, once each, every losing bidder
+    - Push balance updates and the final live state
+    Notifications and pushes go through the outbox and are delivered after
+    the transaction commits.
 
-                    # Notify losing bidder
-                    Notification.objects.create(
-                        user=bid.bidder,
-                        notification_type="ended",
-                        title="Auction Ended",
-                        message=f"The auction for '{auction.title}' has ended. You did not win.",
-                        auction_item=auction,
-                    )
+    Args:
+        auction_ids: AuctionItem ids; ones no longer due or active are skipped
 
-                # Notify winner
-                Notification.objects.create(
-                    user=winner,
-                    notification_type="won",
-                    title="Congratulations!",
-                    message=f"You won the auction for '{auction.title}' with a bid of ${winning_amount}.",
-                    auction_item=auction,
-                )
+    Returns:
+        list: IDs of the auctions closed
+    """
+    from auctions.models import AuctionItem, Bid
+    from auctions.services import Escrow, Outbox, invalidate_auction_caches
 
-                # Notify owner
-                Notification.objects.create(
-                    user=auction.owner,
-                    notification_type="ended",
-                    title="Auction Ended",
-                    message=f"Your auction for '{auction.title}' has ended. Winner: {winner.username} with ${winning_amount}.",
-                    auction_item=auction,
-                )
+    started = time.perf_counter()
+    now = timezone.now()
+    with transaction.atomic():
+        if parallel_closing():
+            # Auctions another worker is settling are skipped, not waited on
+            auction_ids = list(
+                AuctionItem.objects.select_for_update(skip_locked=True)
+                .filter(pk__in=auction_ids, status="active", end_time__lte=now)
+                .values_list("pk", flat=True)
+            )
+        # Closing first takes the write locks up front; the updated_at stamp
+        # then identifies the rows this call closed
+        AuctionItem.objects.filter(pk__in=auction_ids, status="active", end_time__lte=now).update(
+            status="closed", winner=F("top_bidder"), updated_at=now
+        )
+        auctions = list(
+            AuctionItem.objects.filter(pk__in=auction_ids, status="closed", updated_at=now)
+            .select_related("owner", "top_bidder")
+            .order_by("end_time", "id")
+        )
+        if not auctions:
+            return []
+
+        released = Escrow.settle(auctions)
+        events = [Outbox.balance_update(user_id) for user_id in sorted(set(released))]
 
-                logger.info(
-                    f"Closed auction '{auction.title}' (ID {auction.pk}). Winner: {winner.username} with ${winning_amount}."
+        # Each losing bidder is told once per auction, not once per bid
+        losers = (
+            Bid.objects.filter(auction_item__in=auctions)
+            .exclude(bidder=F("auction_item__top_bidder"))
+            .order_by()
+            .values_list("auction_item_id", "bidder_id")
+            .distinct()
+        )
+        by_id = {auction.pk: auction for auction in auctions}
+        for auction_id, bidder_id in losers:
+            events.append(
+                Outbox.notification(
+                    bidder_id,
+                    "ended",
+                    "Auction Ended",
+                    f"The auction for '{by_id[auction_id].title}' has ended. You did not win.",
+                    auction_id,
                 )
+            )
 
+        for auction in auctions:
+            winner = auction.top_bidder
+            if winner:
+                events.append(
+                    Outbox.notification(
+                        winner,
+                        "won",
+                        "Congratulations!",
+                        f"You won the auction for '{auction.title}' with a bid of ${auction.current_bid}.",
+                        auction,
+                    )
+                )
+                events.append(
+                    Outbox.notification(
+                        auction.owner,
+                        "ended",
+                        "Auction Ended",
+                        f"Your auction for '{auction.title}' has ended. Winner: {winner.username} with ${auction.current_bid}.",
+                        auction,
+                    )
+                )
             else:
-                # No bids, just close the auction
-                auction.status = "closed"
-                auction.save()
-
-                # Notify owner
-                Notification.objects.create(
-                    user=auction.owner,
-                    notification_type="ended",
-                    title="Auction Ended",
-                    message=f"Your auction for '{auction.title}' has ended with no bids.",
-                    auction_item=auction,
+                events.append(
+                    Outbox.notification(
+                        auction.owner,
+                        "ended",
+                        "Auction Ended",
+                        f"Your auction for '{auction.title}' has ended with no bids.",
+                        auction,
+                    )
                 )
+            events.append(Outbox.auction_update(auction))
+            invalidate_auction_caches(auction.pk)
+        Outbox.enqueue(events)
 
-                logger.info(
-                    f"Closed auction '{auction.title}' (ID {auction.pk}) with no bids."
-                )
+    finished = timezone.now()
+    BATCH_DURATION.observe(time.perf_counter() - started)
+    for auction in auctions:
+        CLOSE_LAG.observe((finished - auction.end_time).total_seconds())
+    AUCTIONS_CLOSED.inc(len(auctions))
+    HOLDS_RELEASED.inc(len(released))
+    NOTIFICATIONS_QUEUED.inc(sum(event.kind == "notification" for event in events))
 
-        # Broadcast balance updates outside the transaction (post-commit)
-        if highest_bid:
-            # Notify all losing bidders of balance update
-            losing_bids = Bid.objects.filter(auction_item=auction).exclude(
-                bidder=auction.winner
+    for auction in auctions:
+        if auction.top_bidder:
+            logger.debug(
+                f"Closed auction '{auction.title}' (ID {auction.pk}). Winner: {auction.top_bidder.username} with ${auction.current_bid}."
             )
-            for bid in losing_bids:
-                bidder_account = UserAccount.objects.get(user=bid.bidder)
-                group_name = f"user_balance_{bid.bidder.id}"
-                async_to_sync(channel_layer.group_send)(
-                    group_name,
-                    {"type": "balance_update", "balance": float(bidder_account.balance)},
-                )
+        else:
+            logger.debug(f"Closed auction '{auction.title}' (ID {auction.pk}) with no bids.")
+    logger.info(f"Closed {len(auctions)} auctions.")
+    return [auction.pk for auction in auctions]
+
+
+def purge_idempotency_keys():
+    """
+    Delete Idempotency-Keys and processed webhook event ids past their TTL.
+    Runs in the process holding the housekeeping lease.
+    """
+    from auctions.services import Idempotency, LeaderLease
+
+    if not LeaderLease.acquire(HOUSEKEEPING_LEASE, ttl=HOUSEKEEPING_LEASE_TTL):
+        return
+
+    deleted = Idempotency.purge()
+    if deleted:
+        logger.info(f"Purged {deleted} expired idempotency keys.")
+
+
+def purge_outbox_events():
+    """
+    Delete outbox events dispatched longer ago than OUTBOX_RETENTION.
+    Runs in the process holding the housekeeping lease.
+    """
+    from auctions.services import LeaderLease, OutboxDispatcher
+
+    if not LeaderLease.acquire(HOUSEKEEPING_LEASE, ttl=HOUSEKEEPING_LEASE_TTL):
+        return
+
+    deleted = OutboxDispatcher.purge()
+    if deleted:
+        logger.info(f"Purged {deleted} dispatched outbox events.")
+
+
+def notify_ending_soon():
+    """
+    Notify bidders and watchers of auctions entering the ending-soon
+    window. Runs in the process holding the housekeeping lease.
+    """
+    from auctions.services import EndingSoonNotifier, LeaderLease
+
+    if not LeaderLease.acquire(HOUSEKEEPING_LEASE, ttl=HOUSEKEEPING_LEASE_TTL):
+        return
+    EndingSoonNotifier.sweep()
 
 
 # Global scheduler instance
@@ -149,32 +298,61 @@ scheduler = None
 
 def start_scheduler():
     """
-    Start the APScheduler background scheduler.
-    Runs close_expired_auctions every 60 seconds.
+    Start the auction deadline queue and the APScheduler background
+    scheduler, which runs notify_ending_soon every minute and
+    purge_idempotency_keys and purge_outbox_events hourly. Safe to call in
+    every process: closing and housekeeping are coordinated through the
+    database (see the module docstring).
     """
     global scheduler
     if scheduler is not None:
         logger.warning("Scheduler already running.")
         return
 
+    from auctions.services import DeadlineQueue
+
+    # Closes anything that expired while no process was running, then each
+    # auction at its deadline
+    DeadlineQueue.start()
+
     scheduler = BackgroundScheduler(timezone=str(timezone.get_current_timezone()))
     scheduler.add_job(
-        close_expired_auctions,
-        trigger=IntervalTrigger(seconds=60),
-        id="close_expired_auctions",
-        name="Close expired auctions",
+        notify_ending_soon,
+        trigger=IntervalTrigger(minutes=1),
+        id="notify_ending_soon",
+        name="Notify users of auctions ending soon",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        purge_idempotency_keys,
+        trigger=IntervalTrigger(hours=1),
+        id="purge_idempotency_keys",
+        name="Purge expired idempotency keys",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        purge_outbox_events,
+        trigger=IntervalTrigger(hours=1),
+        id="purge_outbox_events",
+        name="Purge dispatched outbox events",
         replace_existing=True,
     )
     scheduler.start()
-    logger.info("Auction closing scheduler started. Checking every 60 seconds.")
+    logger.info("Auction closing scheduler started.")
 
 
 def stop_scheduler():
     """
-    Stop the scheduler gracefully.
+    Stop the scheduler and the deadline queue gracefully.
     """
     global scheduler
     if scheduler is not None:
+        from auctions.services import DeadlineQueue, LeaderLease
+
         scheduler.shutdown()
         scheduler = None
+        DeadlineQueue.stop()
+        # Let another process take over without waiting for expiry
+        LeaderLease.release(HOUSEKEEPING_LEASE)
+        LeaderLease.release(DeadlineQueue.LEASE)
         logger.info("Auction closing scheduler stopped.")
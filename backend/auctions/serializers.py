@@ -3,6 +3,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.db.models import Prefetch
 from .models import AuctionItem, Bid, AuctionImage, ChatMessage, Category, Favorite, Notification
 
 
@@ -76,6 +77,14 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "email", "first_name", "last_name", "bids"]
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Collapsed user reference used by compact auction representations."""
+
+    class Meta:
+        model = User
+        fields = ["id", "username"]
+
+
 class AuctionImageSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
 
@@ -90,7 +99,44 @@ class AuctionImageSerializer(serializers.ModelSerializer):
         return None
 
 
-class AuctionItemSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """
+    Lets read requests shape the payload through query parameters:
+    - ?fields=id,title,current_bid keeps only the listed top-level keys
+    - ?expand=owner,bids replaces collapsed relations with their full form
+
+    Fields are resolved once per serializer instance (for many=True the
+    child is shared), so filtering also skips the work of serializing
+    whatever was dropped.
+    """
+
+    # field name -> factory returning the expanded field
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method not in ("GET", "HEAD", "OPTIONS"):
+            return fields
+
+        for name in self._query_param_set(request, "expand"):
+            factory = self.expandable_fields.get(name)
+            if factory is not None:
+                fields[name] = factory()
+
+        requested = self._query_param_set(request, "fields")
+        if requested:
+            for name in set(fields) - requested:
+                fields.pop(name)
+        return fields
+
+    @staticmethod
+    def _query_param_set(request, param):
+        value = request.query_params.get(param, "")
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class AuctionItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     owner = UserSerializer(read_only=True)  # Serialize 'owner' as a nested object
     bids = BidSerializer(many=True, read_only=True)
     images = AuctionImageSerializer(many=True, read_only=True)
@@ -100,6 +146,11 @@ class AuctionItemSerializer(serializers.ModelSerializer):
     category_data = CategorySerializer(source="category", read_only=True)
     condition = serializers.CharField()
     location = serializers.CharField()
+    # Status is "closed" once end_time has passed, even before the scheduler runs
+    status = serializers.CharField(source="effective_status", read_only=True)
+    top_bid = serializers.SerializerMethodField()
+    top_bidder = serializers.SerializerMethodField()
+    is_winning = serializers.SerializerMethodField()
 
     class Meta:
         model = AuctionItem
@@ -124,6 +175,11 @@ class AuctionItemSerializer(serializers.ModelSerializer):
             "location",
             "shipping_status",
             "verified",
+            "bid_count",
+            "last_bid_at",
+            "top_bid",
+            "top_bidder",
+            "is_winning",
         ]
         read_only_fields = [
             "status",
@@ -131,6 +187,8 @@ class AuctionItemSerializer(serializers.ModelSerializer):
             "winner",
             "shipping_status",
             "verified",
+            "bid_count",
+            "last_bid_at",
         ]
 
     def validate(self, data):
@@ -148,47 +206,139 @@ class AuctionItemSerializer(serializers.ModelSerializer):
                 )
         return data
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        request = self.context.get("request")
+    @classmethod
+    def optimize_queryset(cls, queryset, context=None, prefix=""):
+        """
+        Apply the select_related/prefetch_related plan matching the fields
+        this serializer will actually render (after ?fields= and ?expand=),
+        so serializing N items costs a constant number of queries.
 
-        # Override the status with effective_status (closed if the end_time has passed)
-        representation["status"] = instance.effective_status
+        `prefix` is the lookup path to the auction item when the queryset
+        is of another model (e.g. "auction_item__" for favorites).
+        """
+        fields = cls(context=context or {}).fields
+        related = {f"{prefix}top_bidder"} if "top_bidder" in fields else set()
+        prefetches = []
+
+        for name in ("owner", "winner", "buy_now_buyer"):
+            field = fields.get(name)
+            if field is None:
+                continue
+            related.add(f"{prefix}{name}")
+            if isinstance(field, UserSerializer):
+                # Full users nest their whole bid history
+                prefetches.append(
+                    Prefetch(
+                        f"{prefix}{name}__bids",
+                        queryset=Bid.objects.select_related("bidder", "auction_item"),
+                    )
+                )
+        if "category_data" in fields:
+            related.add(f"{prefix}category")
+        if "bids" in fields:
+            prefetches.append(
+                Prefetch(f"{prefix}bids", queryset=Bid.objects.select_related("bidder"))
+            )
+        if "images" in fields:
+            prefetches.append(f"{prefix}images")
+
+        if prefix:
+            related.add(prefix.rstrip("_"))
+        return queryset.select_related(*sorted(related)).prefetch_related(*prefetches)
+
+    # Highest bid information comes from the denormalized top-bid state
+    def get_top_bid(self, instance):
+        return str(instance.current_bid) if instance.top_bidder_id else None
 
-        # Add computed highest bid information
-        highest_bid = instance.bids.order_by("-amount").first()
-        if highest_bid:
-            representation["top_bid"] = str(highest_bid.amount)
-            representation["top_bidder"] = highest_bid.bidder.username
-        else:
-            representation["top_bid"] = None
-            representation["top_bidder"] = None
+    def get_top_bidder(self, instance):
+        return instance.top_bidder.username if instance.top_bidder_id else None
 
+    def get_is_winning(self, instance):
         # Determine if the current request.user is the highest bidder
+        request = self.context.get("request")
         if request and hasattr(request, "user") and request.user.is_authenticated:
-            representation["is_winning"] = bool(
-                highest_bid and highest_bid.bidder == request.user
-            )
-        else:
-            representation["is_winning"] = False
+            return instance.top_bidder_id == request.user.id
+        return False
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        request = self.context.get("request")
 
         # Serialize the main image properly
-        if instance.image and request:
-            representation["image"] = request.build_absolute_uri(instance.image.url)
-        else:
-            representation["image"] = None
+        if "image" in representation:
+            if instance.image and request:
+                representation["image"] = request.build_absolute_uri(instance.image.url)
+            else:
+                representation["image"] = None
 
         # Process additional images
-        if "images" in representation:
+        if "images" in representation and request:
             for img in representation["images"]:
                 if "image" in img and img["image"]:
                     img["image"] = request.build_absolute_uri(img["image"])
         return representation
 
 
+class AuctionItemCardSerializer(AuctionItemSerializer):
+    """
+    Compact "card" representation for listing pages (list, search,
+    favorites, purchases). Users collapse to {id, username}, the card
+    carries the main image and a summary (start of the description)
+    instead of the image gallery and full text, and bids are left out; pass
+    ?expand=owner,winner,buy_now_buyer,bids,images,description to get the
+    full forms back.
+    """
+
+    SUMMARY_LENGTH = 150
+
+    owner = UserSummarySerializer(read_only=True)
+    buy_now_buyer = UserSummarySerializer(read_only=True)
+    winner = UserSummarySerializer(read_only=True)
+    summary = serializers.SerializerMethodField()
+
+    expandable_fields = {
+        "owner": lambda: UserSerializer(read_only=True),
+        "winner": lambda: UserSerializer(read_only=True),
+        "buy_now_buyer": lambda: UserSerializer(read_only=True),
+        "bids": lambda: BidSerializer(many=True, read_only=True),
+        "images": lambda: AuctionImageSerializer(many=True, read_only=True),
+        "description": lambda: serializers.CharField(read_only=True),
+    }
+
+    class Meta(AuctionItemSerializer.Meta):
+        fields = [
+            "id",
+            "title",
+            "starting_bid",
+            "current_bid",
+            "buy_now_price",
+            "buy_now_buyer",
+            "owner",
+            "image",
+            "summary",
+            "status",
+            "end_time",
+            "winner",
+            "category",
+            "category_data",
+            "condition",
+            "location",
+            "shipping_status",
+            "verified",
+            "bid_count",
+            "last_bid_at",
+            "top_bid",
+            "top_bidder",
+            "is_winning",
+        ]
+
+    def get_summary(self, instance):
+        return instance.description[: self.SUMMARY_LENGTH]
+
+
 class FavoriteSerializer(serializers.ModelSerializer):
-    # Return full auction item details for GET requests
-    auction_item = AuctionItemSerializer(read_only=True)
+    # Return the auction item as a listing card for GET requests
+    auction_item = AuctionItemCardSerializer(read_only=True)
     # Allow posting using auction_item_id
     auction_item_id = serializers.PrimaryKeyRelatedField(
         source="auction_item", queryset=AuctionItem.objects.all(), write_only=True
@@ -4,8 +4,41 @@ Service layer for auction business logic.
 Separates business logic from views for better maintainability and testability.
 """
 
+from .escrow import Escrow, InsufficientFunds
 from .bid_validator import BidValidator
-from .bid_processor import BidProcessor
+from .bid_processor import BidConflict, BidProcessor
+from .proxy_bidding import ProxyBidding
+from .rate_limiter import BidRateLimiter
+from .bid_sequencer import BidSequencer
 from .bid_notification_service import BidNotificationService
+from .search_index import SearchIndex
+from .outbox import Outbox, OutboxDispatcher
+from .idempotency import Idempotency
+from .metrics import Metrics
+from .leader_lease import LeaderLease
+from .deadline_queue import DeadlineQueue
+from .ending_soon import EndingSoonNotifier
+from .auction_cache import AuctionDetailCache, ListingCache, invalidate_auction_caches
 
-__all__ = ['BidValidator', 'BidProcessor', 'BidNotificationService']
+__all__ = [
+    'BidValidator',
+    'BidProcessor',
+    'BidConflict',
+    'ProxyBidding',
+    'Escrow',
+    'InsufficientFunds',
+    'BidRateLimiter',
+    'BidSequencer',
+    'BidNotificationService',
+    'SearchIndex',
+    'Outbox',
+    'OutboxDispatcher',
+    'Idempotency',
+    'Metrics',
+    'LeaderLease',
+    'DeadlineQueue',
+    'EndingSoonNotifier',
+    'AuctionDetailCache',
+    'ListingCache',
+    'invalidate_auction_caches',
+]
@@ -0,0 +1,210 @@
+# auctions/services/auction_cache.py
+"""
+Auction Cache Service
+Caches serialized auction payloads and invalidates them through
+per-auction version counters bumped by every write path.
+"""
+
+import hashlib
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+class AuctionDetailCache:
+    """
+    Cache for the shared (viewer-independent) part of an auction's detail
+    payload. Entries are keyed by auction id and a version counter, so
+    bumping the counter invalidates every cached variant at once.
+    """
+
+    TIMEOUT = 300  # seconds
+    VERSION_KEY = "auction:{auction_id}:version"
+    DETAIL_KEY = "auction:{auction_id}:v{version}:detail:{variant}"
+
+    @staticmethod
+    def get_version(auction_id):
+        """
+        Return the current version of an auction, initialising it if needed.
+        Versions start from a millisecond timestamp so an evicted counter can
+        never come back at a value that still has entries cached under it.
+        """
+        key = AuctionDetailCache.VERSION_KEY.format(auction_id=auction_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def bump(auction_id):
+        """Invalidate every cached payload of an auction immediately."""
+        key = AuctionDetailCache.VERSION_KEY.format(auction_id=auction_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+
+    @staticmethod
+    def invalidate(auction_id):
+        """
+        Bump the auction's version once the current transaction commits
+        (immediately when called outside a transaction).
+        """
+        transaction.on_commit(lambda: AuctionDetailCache.bump(auction_id))
+
+    @staticmethod
+    def get(auction_id, request):
+        """
+        Returns:
+            tuple: (version, entry) where entry is None on a miss
+        """
+        version = AuctionDetailCache.get_version(auction_id)
+        key = AuctionDetailCache._key(auction_id, version, request)
+        return version, cache.get(key)
+
+    @staticmethod
+    def set(auction_id, version, request, entry, end_time):
+        """
+        Store an entry under the version read before it was built. The TTL
+        never outlives end_time, because the effective status flips then.
+        """
+        timeout = AuctionDetailCache.TIMEOUT
+        seconds_left = (end_time - timezone.now()).total_seconds()
+        if seconds_left > 0:
+            timeout = min(timeout, int(seconds_left))
+        key = AuctionDetailCache._key(auction_id, version, request)
+        cache.set(key, entry, timeout=timeout)
+
+    @staticmethod
+    def _key(auction_id, version, request):
+        # Image URLs are absolute, so the payload depends on scheme and host
+        variant = hashlib.md5(
+            f"{request.scheme}://{request.get_host()}".encode()
+        ).hexdigest()[:12]
+        return AuctionDetailCache.DETAIL_KEY.format(
+            auction_id=auction_id, version=version, variant=variant
+        )
+
+
+class ListingCache:
+    """
+    Result cache for anonymous auction listing requests. Keys are built
+    from the normalized filter parameters plus a global generation number;
+    any auction create, update, bid or close bumps the generation, which
+    drops every cached listing at once.
+    """
+
+    TIMEOUT = 60  # seconds
+    GENERATION_KEY = "auction_list:generation"
+    RESULT_KEY = "auction_list:g{generation}:{digest}"
+    HITS_KEY = "auction_list:hits"
+    MISSES_KEY = "auction_list:misses"
+
+    # Query parameters that shape the listing response
+    CASE_INSENSITIVE_PARAMS = ("condition", "location", "category", "q")
+    DECIMAL_PARAMS = ("min_price", "max_price")
+    SET_PARAMS = ("fields", "expand")
+    OPAQUE_PARAMS = ("cursor", "page_size")
+
+    @staticmethod
+    def get_generation():
+        generation = cache.get(ListingCache.GENERATION_KEY)
+        if generation is None:
+            cache.add(ListingCache.GENERATION_KEY, int(time.time() * 1000), timeout=None)
+            generation = cache.get(ListingCache.GENERATION_KEY)
+        return generation
+
+    @staticmethod
+    def bump():
+        try:
+            cache.incr(ListingCache.GENERATION_KEY)
+        except ValueError:
+            cache.add(ListingCache.GENERATION_KEY, int(time.time() * 1000), timeout=None)
+
+    @staticmethod
+    def invalidate():
+        """Bump the generation once the current transaction commits."""
+        transaction.on_commit(ListingCache.bump)
+
+    @staticmethod
+    def normalize(params, default_sort):
+        """
+        Reduce query parameters to a canonical, sorted tuple so equivalent
+        requests (case, decimal formatting, field order) share one entry.
+        """
+        normalized = {}
+        for name in ListingCache.CASE_INSENSITIVE_PARAMS:
+            value = params.get(name, "").strip().lower()
+            if value:
+                normalized[name] = value
+        for name in ListingCache.DECIMAL_PARAMS:
+            value = params.get(name, "").strip()
+            if value:
+                try:
+                    value = str(Decimal(value).normalize())
+                except InvalidOperation:
+                    pass
+                normalized[name] = value
+        for name in ListingCache.SET_PARAMS:
+            values = {v.strip() for v in params.get(name, "").split(",") if v.strip()}
+            if values:
+                normalized[name] = ",".join(sorted(values))
+        for name in ListingCache.OPAQUE_PARAMS:
+            value = params.get(name, "").strip()
+            if value:
+                normalized[name] = value
+        # The caller resolves sort_by, so unknown values share the default's entry
+        normalized["sort_by"] = default_sort
+        return tuple(sorted(normalized.items()))
+
+    @staticmethod
+    def key_for(request, default_sort):
+        normalized = ListingCache.normalize(request.query_params, default_sort)
+        origin = f"{request.scheme}://{request.get_host()}"
+        digest = hashlib.md5(repr((origin, normalized)).encode()).hexdigest()
+        return ListingCache.RESULT_KEY.format(
+            generation=ListingCache.get_generation(), digest=digest
+        )
+
+    @staticmethod
+    def get(key):
+        data = cache.get(key)
+        if data is None:
+            ListingCache._count(ListingCache.MISSES_KEY)
+        else:
+            ListingCache._count(ListingCache.HITS_KEY)
+        return data
+
+    @staticmethod
+    def set(key, data):
+        cache.set(key, data, timeout=ListingCache.TIMEOUT)
+
+    @staticmethod
+    def stats():
+        hits = cache.get(ListingCache.HITS_KEY, 0)
+        misses = cache.get(ListingCache.MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+            "generation": ListingCache.get_generation(),
+        }
+
+    @staticmethod
+    def _count(key):
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+
+
+def invalidate_auction_caches(auction_id):
+    """Invalidate an auction's detail payloads and every cached listing."""
+    AuctionDetailCache.invalidate(auction_id)
+    ListingCache.invalidate()
@@ -1,175 +1,278 @@
 # auctions/services/bid_processor.py
 """
 Bid Processing Service
-Handles the actual bid processing, refunds, and anti-snipe logic.
+Handles committing bids (escrow hold, bid record, top-bid state, outbox events)
+and anti-snipe logic.
 """
 
 from decimal import Decimal
 from datetime import timedelta
-from django.utils import timezone
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .bid_notification_service import BidNotificationService
+from .bid_validator import BidValidator
+from .deadline_queue import DeadlineQueue
+from .escrow import Escrow, InsufficientFunds
+from .outbox import Outbox
+from .proxy_bidding import ProxyBidding
+
+
+class BidConflict(Exception):
+    """The auction changed between the snapshot a bid was validated against and its commit."""
 
 
 class BidProcessor:
     """Service class for processing bids and related operations."""
-    
+
     ANTI_SNIPE_THRESHOLD_SECONDS = 120  # 2 minutes
     EXTENSION_DURATION_SECONDS = 120    # Extend by 2 minutes
-    
-    @staticmethod
-    def handle_outbid_refund(old_bid, auction_item, current_user):
-        """
-        Refund the previous highest bidder if they're being outbid.
-        
-        Args:
-            old_bid: The previous highest Bid instance
-            auction_item: The AuctionItem instance
-            current_user: The User placing the new bid
-            
-        Returns:
-            tuple: (old_bidder, old_amount) or (None, None) if no refund needed
-        """
-        if not old_bid or old_bid.bidder == current_user:
-            return None, None
-        
-        from ..models import UserAccount
-        
-        old_bidder = old_bid.bidder
-        old_amount = old_bid.amount
-        
-        # Refund the old bidder
-        old_account = UserAccount.objects.select_for_update().get(user=old_bidder)
-        old_account.balance += old_amount
-        old_account.save()
-        
-        return old_bidder, old_amount
-    
+    MAX_COMMIT_ATTEMPTS = 5             # Snapshot/validate/commit rounds before giving up
+
     @staticmethod
-    def process_new_bid(auction_item, user, amount, bidder_account):
+    def prepare_bid(auction_item, user, amount_str=None, max_amount_str=None):
         """
-        Process a new bid from a user who hasn't bid before or is not the current highest.
-        
+        Validate a bid against an auction snapshot, resolve it against the
+        stored maxima (see ProxyBidding) and build the outbox events to commit
+        with it. Runs without locks; commit_bid decides whether the snapshot
+        is still current.
+
         Args:
-            auction_item: The AuctionItem instance
+            auction_item: The AuctionItem snapshot (owner and top_bidder selected)
             user: The User placing the bid
-            amount: The bid amount as Decimal
-            bidder_account: The UserAccount instance (already locked)
-            
+            amount_str: The bid amount as submitted, or None for a maximum only
+            max_amount_str: The maximum to bid up to, as submitted, or None
+
         Returns:
-            Bid: The newly created Bid instance
+            tuple: (plan, error_response); plan holds the keyword arguments
+            for commit_bid. If another bidder's maximum wins, plan["user"] is
+            that bidder.
         """
-        from ..models import Bid
-        
-        # Deduct funds from bidder
-        bidder_account.balance -= amount
-        bidder_account.save()
-        
-        # Create new bid
-        new_bid = Bid.objects.create(
-            auction_item=auction_item,
-            bidder=user,
-            amount=amount
+        # 1. Check bid eligibility (auction status, ownership, etc.)
+        is_valid, error = BidValidator.validate_bid_eligibility(auction_item, user)
+        if not is_valid:
+            return None, error
+
+        # 2. Validate bid amount and maximum
+        amount = max_amount = None
+        if amount_str or not max_amount_str:
+            is_valid, amount, error = BidValidator.validate_bid_amount(amount_str, auction_item)
+            if not is_valid:
+                return None, error
+        if max_amount_str:
+            is_valid, max_amount, error = BidValidator.validate_bid_amount(max_amount_str, auction_item)
+            if not is_valid:
+                return None, error
+            if amount is not None and max_amount < amount:
+                return None, Response(
+                    {"detail": "Maximum bid must be at least your bid amount."},
+                    status=400
+                )
+
+        # 3. Check the bidder can cover what they would pay right now
+        old_bidder, old_amount = BidProcessor.get_highest_bid(auction_item)
+        is_rebid = old_bidder is not None and old_bidder == user
+        is_valid, available, error = BidValidator.validate_user_balance(
+            user,
+            amount or BidValidator.get_min_required_bid(auction_item),
+            is_rebid=is_rebid,
+            current_bid_amount=old_amount if is_rebid else None
         )
-        
-        # Update auction item current bid
-        auction_item.current_bid = amount
-        auction_item.save()
-        
-        return new_bid
-    
+        if not is_valid:
+            return None, error
+
+        # 4. Resolve against the other bidders' maxima
+        proxies, balances = ProxyBidding.load(auction_item)
+        # The bidder's hold on this auction is theirs to raise
+        balances[user.pk] = available + (old_amount if is_rebid else 0)
+        winner, price, losing_bids, exhausted = ProxyBidding.resolve(
+            auction_item, user, amount, max_amount, proxies, balances
+        )
+        proxy_update = None
+        if max_amount is not None or exhausted:
+            proxy_update = {
+                "user": user,
+                "max_amount": max_amount,
+                "is_active": winner == user,
+                "exhausted": exhausted,
+            }
+        plan = {
+            "user": winner,
+            "amount": price,
+            "new_end_time": None,
+            "events": [],
+            "losing_bids": losing_bids,
+            "proxy_update": proxy_update,
+        }
+        if price is None:
+            # The top bidder only raised their own maximum
+            return plan, None
+
+        # 5. Anti-snipe extension (if bid is placed close to end time)
+        new_end_time = BidProcessor.get_extended_end_time(auction_item)
+
+        # 6. Side effects, written to the outbox with the bid and delivered
+        #    after commit
+        events = [Outbox.balance_update(winner.id)]
+        if old_bidder is not None and old_bidder != winner:
+            events.append(Outbox.balance_update(old_bidder.id))
+            events += BidNotificationService.outbid(old_bidder, auction_item, price)
+        for bidder, _ in losing_bids:
+            if bidder != old_bidder:
+                events += BidNotificationService.outbid(bidder, auction_item, price)
+        if winner == old_bidder:
+            events += BidNotificationService.owner_bid_increased(
+                auction_item.owner, auction_item, winner.username, price
+            )
+        else:
+            events += BidNotificationService.owner_new_bid(
+                auction_item.owner, auction_item, winner.username, price
+            )
+        if new_end_time:
+            events += BidNotificationService.auction_extended(auction_item, new_end_time)
+
+        plan["new_end_time"] = new_end_time
+        plan["events"] = events
+        return plan, None
+
     @staticmethod
-    def process_rebid(auction_item, user, amount, bidder_account, old_bid):
+    def commit_bid(auction_item, user, amount, new_end_time=None, events=(), losing_bids=(),
+                   proxy_update=None):
         """
-        Process a rebid from the current highest bidder increasing their bid.
-        
+        Commit a validated bid with a compare-and-set on the auction row.
+
+        `auction_item` is an unlocked snapshot the bid was validated against.
+        The escrow hold is moved and the bids are inserted first; the conditional
+        UPDATE of the auction runs last and only matches if the top bid, end
+        time, status and last update are still those of the snapshot. The
+        auction row is therefore only locked between that UPDATE and COMMIT.
+
         Args:
-            auction_item: The AuctionItem instance
-            user: The User placing the bid
-            amount: The new bid amount as Decimal
-            bidder_account: The UserAccount instance (already locked)
-            old_bid: The user's previous highest Bid instance
-            
+            auction_item: The AuctionItem snapshot (top_bidder selected)
+            user: The User whose bid becomes the top bid
+            amount: The validated bid amount as Decimal, or None if the top
+                bid does not change (only proxy_update is applied)
+            new_end_time: Extended end time (anti-snipe), or None
+            events: OutboxEvents (notifications, pushes) committed with the bid
+            losing_bids: (bidder, amount) pairs outbid on the way to `amount`;
+                recorded in the bid history without holding funds
+            proxy_update: Keyword arguments for ProxyBidding.apply, or None
+
         Returns:
-            Bid: The newly created Bid instance
+            tuple: (new_bid, error_response); new_bid is None if the top bid
+            did not change
+
+        Raises:
+            BidConflict: If the auction changed since the snapshot; nothing
+                was written and the caller should re-read and re-validate.
         """
-        from ..models import Bid
-        
-        difference = amount - old_bid.amount
-        
-        # Deduct only the difference
-        bidder_account.balance -= difference
-        bidder_account.save()
-        
-        # Create new bid
-        new_bid = Bid.objects.create(
-            auction_item=auction_item,
-            bidder=user,
-            amount=amount
-        )
-        
-        # Update auction item current bid
-        auction_item.current_bid = amount
-        auction_item.save()
-        
-        return new_bid
-    
+        from ..models import AuctionItem, Bid
+
+        old_bidder, old_amount = BidProcessor.get_highest_bid(auction_item)
+
+        new_bid = None
+        try:
+            with transaction.atomic():
+                if amount is not None:
+                    Escrow.move(auction_item, user, amount, old_bidder, old_amount)
+                    Bid.objects.bulk_create(
+                        [
+                            Bid(auction_item=auction_item, bidder=bidder, amount=losing_amount)
+                            for bidder, losing_amount in losing_bids
+                        ]
+                    )
+                    new_bid = Bid.objects.create(auction_item=auction_item, bidder=user, amount=amount)
+                if proxy_update:
+                    ProxyBidding.apply(auction_item, **proxy_update)
+                now = new_bid.timestamp if new_bid else timezone.now()
+                end_time = new_end_time or auction_item.end_time
+                if new_bid:
+                    events = [
+                        *events,
+                        Outbox.auction_update(
+                            auction_item,
+                            current_bid=amount,
+                            top_bidder=user,
+                            bid_count=auction_item.bid_count + 1 + len(losing_bids),
+                            end_time=end_time,
+                        ),
+                    ]
+                Outbox.enqueue(events)
+
+                changes = {"updated_at": now}
+                if new_bid:
+                    changes.update(
+                        current_bid=amount,
+                        top_bidder=user,
+                        bid_count=F("bid_count") + 1 + len(losing_bids),
+                        last_bid_at=now,
+                        end_time=end_time,
+                    )
+                # updated_at is part of the compare so that a top bidder
+                # raising their maximum invalidates concurrent snapshots
+                swapped = AuctionItem.objects.filter(
+                    pk=auction_item.pk,
+                    status="active",
+                    buy_now_buyer__isnull=True,
+                    end_time=auction_item.end_time,
+                    end_time__gt=now,
+                    current_bid=auction_item.current_bid,
+                    top_bidder=auction_item.top_bidder_id,
+                    updated_at=auction_item.updated_at,
+                ).update(**changes)
+                if not swapped:
+                    raise BidConflict(auction_item.pk)
+                if new_bid and new_end_time:
+                    DeadlineQueue.schedule(auction_item.pk, end_time)
+        except InsufficientFunds:
+            return None, Response({"detail": "Insufficient funds."}, status=400)
+
+        # Bring the snapshot in line with what was committed
+        auction_item.updated_at = now
+        if new_bid:
+            auction_item.current_bid = amount
+            auction_item.top_bidder = user
+            auction_item.bid_count += 1 + len(losing_bids)
+            auction_item.last_bid_at = now
+            auction_item.end_time = end_time
+        return new_bid, None
+
     @staticmethod
-    def handle_anti_snipe_extension(auction_item):
+    def get_extended_end_time(auction_item):
         """
-        Extend auction end time if bid is placed close to the end (anti-sniping).
-        
+        Anti-sniping: compute the extended end time for a bid placed close to
+        the end. The extension is applied by commit_bid.
+
         Args:
             auction_item: The AuctionItem instance
-            
+
         Returns:
-            bool: True if the auction was extended, False otherwise
+            datetime: The new end time, or None if no extension applies
         """
         now = timezone.now()
         time_left = auction_item.end_time - now
-        
+
         if time_left.total_seconds() < BidProcessor.ANTI_SNIPE_THRESHOLD_SECONDS:
-            # Calculate new end time
             new_end = now + timedelta(seconds=BidProcessor.EXTENSION_DURATION_SECONDS)
-            
             # Only extend if the new time is later than current end time
             if new_end > auction_item.end_time:
-                auction_item.end_time = new_end
-                auction_item.save()
-                return True
-        
-        return False
-    
-    @staticmethod
-    def notify_balance_update(user_id, new_balance):
-        """
-        Send WebSocket notification about balance update.
-        
-        Args:
-            user_id: The user's ID
-            new_balance: The new balance as Decimal
-        """
-        from channels.layers import get_channel_layer
-        from asgiref.sync import async_to_sync
-        
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            async_to_sync(channel_layer.group_send)(
-                f"user_balance_{user_id}",
-                {
-                    "type": "balance_update",
-                    "balance": str(new_balance)
-                }
-            )
-    
+                return new_end
+
+        return None
+
     @staticmethod
     def get_highest_bid(auction_item):
         """
-        Get the current highest bid for an auction.
-        
+        Get the current highest bid for an auction from its denormalized state.
+
         Args:
             auction_item: The AuctionItem instance
-            
+
         Returns:
-            Bid or None: The highest bid or None if no bids exist
+            tuple: (bidder, amount) or (None, None) if no bids exist
         """
-        return auction_item.bids.order_by("-amount").first()
+        if auction_item.top_bidder_id is None:
+            return None, None
+        return auction_item.top_bidder, auction_item.current_bid
@@ -0,0 +1,197 @@
+# auctions/services/bid_sequencer.py
+"""
+Bid Sequencer
+Optional single-writer mode for bids. Every auction is routed to one of a
+fixed pool of writer threads, so bids on a hot auction queue up in process
+instead of piling up on the auction row and retrying compare-and-set
+conflicts.
+"""
+
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from rest_framework.response import Response
+
+from .bid_processor import BidConflict, BidProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class _Ticket:
+    """A queued bid and the slot its reply is delivered through."""
+
+    def __init__(self, auction_id, user, amount_str, max_amount_str):
+        self.auction_id = auction_id
+        self.user = user
+        self.amount_str = amount_str
+        self.max_amount_str = max_amount_str
+        self.result = None
+        self.exception = None
+        self.state = "queued"
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        with self._lock:
+            if self.state != "queued":
+                return False
+            self.state = state
+            return True
+
+    def claim(self):
+        """Called by the writer; False if the submitter already gave up."""
+        return self._transition("running")
+
+    def cancel(self):
+        """Called by the submitter; False if the writer already picked it up."""
+        return self._transition("cancelled")
+
+    def resolve(self, result=None, exception=None):
+        self.result = result
+        self.exception = exception
+        self.done.set()
+
+
+class BidSequencer:
+    """
+    Routes bids to per-auction writer threads. A writer drains its queue,
+    groups the queued bids by auction and, for each auction, validates them
+    in arrival order against one snapshot that is updated in memory as bids
+    are accepted. Accepted bids are committed in a single transaction and
+    every waiter gets its reply once that transaction has committed.
+    """
+
+    MAX_BATCH = 100
+    SUBMIT_TIMEOUT_SECONDS = 10
+    DEFAULT_WORKERS = 4
+
+    _queues = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled():
+        return getattr(settings, "BID_SEQUENCER", {}).get("enabled", False)
+
+    @classmethod
+    def start(cls):
+        """Start the writer pool (idempotent)."""
+        with cls._lock:
+            if cls._queues:
+                return
+            workers = getattr(settings, "BID_SEQUENCER", {}).get("workers", cls.DEFAULT_WORKERS)
+            queues = [queue.SimpleQueue() for _ in range(max(1, workers))]
+            for index, tickets in enumerate(queues):
+                threading.Thread(
+                    target=cls._run, args=(tickets,), name=f"bid-sequencer-{index}", daemon=True
+                ).start()
+            cls._queues = queues
+            logger.info(f"Bid sequencer started with {len(queues)} writers.")
+
+    @classmethod
+    def submit(cls, auction_id, user, amount_str, max_amount_str=None):
+        """
+        Queue a bid on its auction's writer and wait for the outcome.
+
+        Args:
+            auction_id: ID of the AuctionItem
+            user: The User placing the bid
+            amount_str: The bid amount as submitted
+            max_amount_str: The proxy maximum as submitted, or None
+
+        Returns:
+            tuple: (new_bid, error_response)
+        """
+        cls.start()
+        ticket = _Ticket(auction_id, user, amount_str, max_amount_str)
+        # A stable hash keeps every bid on an auction on the same writer
+        cls._queues[int(auction_id) % len(cls._queues)].put(ticket)
+
+        if not ticket.done.wait(cls.SUBMIT_TIMEOUT_SECONDS) and ticket.cancel():
+            return None, Response(
+                {"detail": "This auction is receiving many bids. Please try again."},
+                status=409
+            )
+        # Once claimed, the bid may commit: wait for the real outcome
+        ticket.done.wait()
+        if ticket.exception is not None:
+            raise ticket.exception
+        return ticket.result
+
+    @classmethod
+    def _run(cls, tickets):
+        while True:
+            batch = [tickets.get()]
+            while len(batch) < cls.MAX_BATCH:
+                try:
+                    batch.append(tickets.get_nowait())
+                except queue.Empty:
+                    break
+
+            close_old_connections()
+            by_auction = {}
+            for ticket in batch:
+                if ticket.claim():
+                    by_auction.setdefault(ticket.auction_id, []).append(ticket)
+
+            for auction_id, claimed in by_auction.items():
+                try:
+                    results = cls.process_batch(
+                        auction_id,
+                        [(ticket.user, ticket.amount_str, ticket.max_amount_str) for ticket in claimed],
+                    )
+                except Exception as e:
+                    logger.exception(f"Bid sequencer failed on auction {auction_id}.")
+                    for ticket in claimed:
+                        ticket.resolve(exception=e)
+                    continue
+                for ticket, result in zip(claimed, results):
+                    ticket.resolve(result)
+
+    @staticmethod
+    def process_batch(auction_id, bids):
+        """
+        Validate and commit queued bids on one auction in arrival order.
+
+        Bids that fail validation against the state left by the bids before
+        them are answered with their error and write nothing. If the auction
+        is changed outside the sequencer (Buy Now, closing) the whole batch
+        is rolled back and re-run from a fresh snapshot.
+
+        Args:
+            auction_id: ID of the AuctionItem
+            bids: List of (user, amount_str, max_amount_str) in arrival order
+
+        Returns:
+            list: (new_bid, error_response) per bid, in the same order
+        """
+        from ..models import AuctionItem
+
+        for _ in range(BidProcessor.MAX_COMMIT_ATTEMPTS):
+            results = []
+            try:
+                with transaction.atomic():
+                    auction_item = AuctionItem.objects.select_related("owner", "top_bidder").get(
+                        pk=auction_id
+                    )
+                    for user, amount_str, max_amount_str in bids:
+                        plan, error = BidProcessor.prepare_bid(
+                            auction_item, user, amount_str, max_amount_str
+                        )
+                        if error:
+                            results.append((None, error))
+                            continue
+                        # Updates the snapshot in memory, so the next bid is
+                        # validated against this one
+                        results.append(BidProcessor.commit_bid(auction_item, **plan))
+            except BidConflict:
+                continue
+            return results
+
+        conflict = Response(
+            {"detail": "This auction is receiving many bids. Please try again."},
+            status=409
+        )
+        return [(None, conflict)] * len(bids)
@@ -8,6 +8,8 @@ from decimal import Decimal, InvalidOperation
 from django.utils import timezone
 from rest_framework.response import Response
 
+from .escrow import Escrow
+
 
 class BidValidator:
     """Service class for validating bids before processing."""
@@ -28,15 +30,8 @@ class BidValidator:
                    If valid: (True, None)
                    If invalid: (False, Response object with error)
         """
-        # Check if auction has ended
-        now = timezone.now()
-        if auction_item.end_time <= now:
-            from ..models import Bid
-            highest_bid = auction_item.bids.order_by("-amount").first()
-            if highest_bid:
-                auction_item.winner = highest_bid.bidder
-            auction_item.status = "closed"
-            auction_item.save()
+        # Check if auction has ended (the scheduler closes it and resolves the winner)
+        if auction_item.end_time <= timezone.now():
             return False, Response({"detail": "Bidding is closed for this item."}, status=400)
         
         # Check auction status
@@ -53,6 +48,23 @@ class BidValidator:
         
         return True, None
     
+    @staticmethod
+    def get_min_increment_over(amount):
+        """
+        Returns:
+            Decimal: The smallest bid that beats `amount`
+        """
+        min_increment = (amount * BidValidator.MIN_BID_INCREMENT_PERCENTAGE).quantize(Decimal("0.01"))
+        return (amount + min_increment).quantize(Decimal("0.01"))
+    
+    @staticmethod
+    def get_min_required_bid(auction_item):
+        """
+        Returns:
+            Decimal: The smallest bid the auction currently accepts
+        """
+        return BidValidator.get_min_increment_over(auction_item.current_bid or auction_item.starting_bid)
+    
     @staticmethod
     def validate_bid_amount(amount_str, auction_item):
         """
@@ -77,9 +89,7 @@ class BidValidator:
             return False, None, Response({"detail": "Invalid bid amount."}, status=400)
         
         # Calculate minimum required bid
-        min_bid = auction_item.current_bid or auction_item.starting_bid
-        min_increment = (min_bid * BidValidator.MIN_BID_INCREMENT_PERCENTAGE).quantize(Decimal("0.01"))
-        min_required_bid = (min_bid + min_increment).quantize(Decimal("0.01"))
+        min_required_bid = BidValidator.get_min_required_bid(auction_item)
         
         # Check against Buy Now price
         if auction_item.buy_now_price and amount >= auction_item.buy_now_price:
@@ -100,7 +110,10 @@ class BidValidator:
     @staticmethod
     def validate_user_balance(user, amount, is_rebid=False, current_bid_amount=None):
         """
-        Validate if user has sufficient balance.
+        Validate if user has sufficient available balance (see
+        Escrow.available_balance). This is a cached fast pre-check; the
+        locked check in Escrow.move is what actually guarantees holds never
+        exceed the balance.
         
         Args:
             user: The User instance
@@ -109,11 +122,9 @@ class BidValidator:
             current_bid_amount: Current bid amount if re-bidding
             
         Returns:
-            tuple: (is_valid, bidder_account, error_response)
+            tuple: (is_valid, available_balance, error_response)
         """
-        from ..models import UserAccount
-        
-        bidder_account = UserAccount.objects.select_for_update().get(user=user)
+        available = Escrow.available_balance(user)
         
         if is_rebid:
             difference = amount - current_bid_amount
@@ -123,38 +134,37 @@ class BidValidator:
                     status=400
                 )
             
-            if bidder_account.balance < difference:
+            if available < difference:
                 return False, None, Response({"detail": "Insufficient funds."}, status=400)
         else:
-            if bidder_account.balance < amount:
+            if available < amount:
                 return False, None, Response({"detail": "Insufficient funds."}, status=400)
         
-        return True, bidder_account, None
+        return True, available, None
     
     @staticmethod
-    def validate_bid_rate_limit(auction_item, user):
+    def validate_bid_rate_limit(auction_item, user, count=False):
         """
         Check if user is attempting to bid too quickly (rate limiting).
+        Reads the cache only (see BidRateLimiter), so it costs no database
+        work and should run before anything else touches the DB. Call it
+        again with count=True once the bid has passed validation.
         
         Args:
             auction_item: The AuctionItem instance
             user: The User instance
+            count: Count this bid towards the limit
             
         Returns:
             tuple: (is_valid, error_response)
         """
-        from ..models import Bid
-        
-        now = timezone.now()
-        last_bid = Bid.objects.filter(
-            auction_item=auction_item,
-            bidder=user
-        ).order_by("-timestamp").first()
+        from .rate_limiter import BidRateLimiter
         
-        if last_bid and (now - last_bid.timestamp).total_seconds() < 30:
-            remaining = 30 - int((now - last_bid.timestamp).total_seconds())
+        check = BidRateLimiter.hit if count else BidRateLimiter.check
+        allowed, retry_after = check(auction_item, user)
+        if not allowed:
             return False, Response(
-                {"detail": f"You must wait {remaining} more seconds before bidding again."},
+                {"detail": f"You must wait {retry_after} more seconds before bidding again."},
                 status=400
             )
         
@@ -0,0 +1,241 @@
+# auctions/services/deadline_queue.py
+"""
+Deadline Queue Service
+An in-process min-heap of upcoming auction end times. A worker thread sleeps
+until the earliest deadline and closes that auction right after it passes,
+instead of polling for expired auctions on a fixed interval. Write paths that
+set an end time (creation, edits, anti-snipe extensions) push the new
+deadline; stale entries are skipped when they surface.
+
+Every process runs a queue. Where the database supports SKIP LOCKED each
+of them closes what is due, claiming disjoint rows; elsewhere (SQLite) only
+the process holding the closer lease does, and the others stand by.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineQueue:
+    """
+    Closes auctions at their deadlines. Only deadlines within HORIZON are
+    kept in memory; the rest are loaded from the (status, end_time) index
+    as they come into range.
+    """
+
+    HORIZON = timedelta(minutes=10)
+    # Re-read the upcoming deadlines this often, which also picks up
+    # auctions created or extended by other processes
+    RELOAD_INTERVAL = timedelta(minutes=5)
+    # Leader lease for databases without SKIP LOCKED; renewed well before
+    # LeaderLease.TTL runs out
+    LEASE = "auction-closer"
+    LEASE_RENEW_INTERVAL = timedelta(seconds=10)
+
+    _heap = []        # (end_time, auction_id)
+    _deadlines = {}   # auction_id -> the end_time its heap entry must match
+    _condition = threading.Condition()
+    _stopping = threading.Event()
+    _thread = None
+    _next_reload = None
+    _closing = False  # whether this process closed auctions on its last pass
+
+    @classmethod
+    def start(cls):
+        """Load the upcoming deadlines and start the closer thread (idempotent)."""
+        if cls.is_running():
+            return
+        cls._stopping.clear()
+        cls._thread = threading.Thread(target=cls._run, name="auction-deadlines", daemon=True)
+        cls._thread.start()
+        logger.info("Auction deadline queue started.")
+
+    @classmethod
+    def stop(cls, timeout=30):
+        """
+        Stop the closer thread after its current pass and wait for it, so
+        it no longer closes auctions or takes the closer lease.
+        """
+        if cls._thread is None:
+            return
+        with cls._condition:
+            cls._stopping.set()
+            cls._condition.notify()
+        cls._thread.join(timeout)
+        cls._thread = None
+        logger.info("Auction deadline queue stopped.")
+
+    @classmethod
+    def is_running(cls):
+        return cls._thread is not None and cls._thread.is_alive()
+
+    @classmethod
+    def schedule(cls, auction_id, end_time):
+        """
+        Record an auction's new end time once the current transaction
+        commits. A no-op unless the queue is running in this process.
+
+        Args:
+            auction_id: The AuctionItem id
+            end_time: Its end time as committed
+        """
+        if not cls.is_running():
+            return
+        transaction.on_commit(lambda: cls.push(auction_id, end_time))
+
+    @classmethod
+    def push(cls, auction_id, end_time):
+        """Replace the auction's deadline and wake the closer if it moved up."""
+        with cls._condition:
+            if end_time > timezone.now() + cls.HORIZON:
+                # Out of range for now; a later reload brings it back
+                cls._deadlines.pop(auction_id, None)
+                return
+            cls._deadlines[auction_id] = end_time
+            heapq.heappush(cls._heap, (end_time, auction_id))
+            if cls._heap[0] == (end_time, auction_id):
+                cls._condition.notify()
+
+    @classmethod
+    def reload(cls):
+        """
+        Read the active auctions ending within HORIZON (including overdue
+        ones) and queue their deadlines.
+
+        Returns:
+            int: Number of deadlines loaded
+        """
+        from ..models import AuctionItem
+
+        now = timezone.now()
+        upcoming = list(
+            AuctionItem.objects.filter(status="active", end_time__lte=now + cls.HORIZON)
+            .values_list("pk", "end_time")
+        )
+        with cls._condition:
+            cls._heap = [(end_time, auction_id) for auction_id, end_time in upcoming]
+            heapq.heapify(cls._heap)
+            cls._deadlines = {auction_id: end_time for auction_id, end_time in upcoming}
+            cls._next_reload = now + cls.RELOAD_INTERVAL
+            cls._condition.notify()
+        return len(upcoming)
+
+    @classmethod
+    def pop_due(cls):
+        """
+        Remove and return the auctions whose deadline has passed.
+
+        Returns:
+            list: AuctionItem ids, earliest deadline first
+        """
+        now = timezone.now()
+        due = []
+        with cls._condition:
+            while cls._heap and cls._heap[0][0] <= now:
+                end_time, auction_id = heapq.heappop(cls._heap)
+                if cls._deadlines.get(auction_id) == end_time:
+                    del cls._deadlines[auction_id]
+                    due.append(auction_id)
+        return due
+
+    @classmethod
+    def may_close(cls):
+        """
+        Whether this process should close auctions now: always where claims
+        use SKIP LOCKED, otherwise while it holds (and has just renewed)
+        the closer lease.
+        """
+        from ..scheduler import parallel_closing
+        from .leader_lease import LeaderLease
+
+        if parallel_closing():
+            return True
+        leading = LeaderLease.acquire(cls.LEASE)
+        if leading and not cls._closing:
+            # Taking over: the heap may be stale, start from the database
+            cls._next_reload = None
+        return leading
+
+    @classmethod
+    def _wait(cls):
+        """
+        Sleep until the earliest deadline, a reload, a lease renewal or an
+        earlier push. A standby process only wakes to retry the lease.
+        """
+        from ..scheduler import parallel_closing
+
+        now = timezone.now()
+        with cls._condition:
+            if cls._stopping.is_set():
+                return
+            if cls._closing:
+                wake_at = cls._next_reload
+                if cls._heap:
+                    wake_at = min(wake_at, cls._heap[0][0])
+            else:
+                wake_at = now + cls.LEASE_RENEW_INTERVAL
+            if not parallel_closing():
+                wake_at = min(wake_at, now + cls.LEASE_RENEW_INTERVAL)
+            timeout = (wake_at - now).total_seconds()
+            if timeout > 0:
+                cls._condition.wait(timeout)
+
+    @classmethod
+    def close_due(cls):
+        """
+        Close the auctions whose deadline has passed in one batch, and
+        re-queue any that another process extended since they were queued.
+
+        Returns:
+            list: IDs of the auctions closed
+        """
+        from ..models import AuctionItem
+        from ..scheduler import settle_auctions
+
+        due = cls.pop_due()
+        if not due:
+            return []
+        closed = settle_auctions(due)
+        # Still-due leftovers were claimed by another worker; it closes them
+        extended = AuctionItem.objects.filter(
+            pk__in=set(due) - set(closed), status="active", end_time__gt=timezone.now()
+        ).values_list("pk", "end_time")
+        for auction_id, end_time in extended:
+            cls.push(auction_id, end_time)
+        return closed
+
+    @classmethod
+    def tick(cls):
+        """One pass of the closer: reload if due, then close what is due."""
+        from ..scheduler import LAST_SUCCESSFUL_RUN
+
+        cls._closing = cls.may_close()
+        if not cls._closing:
+            return
+        if cls._next_reload is None or timezone.now() >= cls._next_reload:
+            cls.reload()
+        cls.close_due()
+        LAST_SUCCESSFUL_RUN.set(time.time())
+
+    @classmethod
+    def _run(cls):
+        from ..scheduler import CLOSE_FAILURES
+
+        while not cls._stopping.is_set():
+            close_old_connections()
+            try:
+                cls.tick()
+            except Exception:
+                CLOSE_FAILURES.inc()
+                logger.exception("Closing due auctions failed.")
+                # Try again from a fresh read rather than spinning on the error
+                cls._next_reload = timezone.now() + timedelta(seconds=5)
+            cls._wait()
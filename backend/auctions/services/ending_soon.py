@@ -0,0 +1,146 @@
+# auctions/services/ending_soon.py
+"""
+Ending Soon Service
+Tells bidders and watchers (users who favorited an auction) that it is
+about to end. A periodic sweep picks up the auctions whose end time entered
+the notice window since the previous sweep, reading only those from the
+(status, end_time) index, and notifies each interested user once.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from .outbox import Outbox
+
+logger = logging.getLogger(__name__)
+
+
+class EndingSoonNotifier:
+    """Service class for "ending soon" notifications."""
+
+    MARKER = "ending_soon"
+
+    @staticmethod
+    def sweep(window=None):
+        """
+        Notify users of auctions whose end time entered the window, i.e.
+        now lies within `window` of it, since the last sweep. Notification
+        rows are created here; pushes go through the outbox.
+
+        Args:
+            window: How long before the end to notify, as timedelta
+                (defaults to settings.ENDING_SOON_WINDOW)
+
+        Returns:
+            int: Number of notifications created
+        """
+        from ..models import AuctionItem
+
+        window = window or settings.ENDING_SOON_WINDOW
+        now = timezone.now()
+        with transaction.atomic():
+            start, end = EndingSoonNotifier._advance(now, now + window)
+            if start is None:
+                return 0
+            # Auctions that ended while no sweep ran are skipped
+            auctions = {
+                pk: (title, end_time)
+                for pk, title, end_time in AuctionItem.objects.filter(
+                    status="active", end_time__gt=max(start, now), end_time__lte=end
+                )
+                .order_by()
+                .values_list("pk", "title", "end_time")
+            }
+            if not auctions:
+                return 0
+            created = EndingSoonNotifier._notify(auctions)
+        logger.info(f"Sent {created} ending-soon notifications for {len(auctions)} auctions.")
+        return created
+
+    @staticmethod
+    def _advance(now, until):
+        """
+        Move the marker to the window (previous end, until].
+
+        Returns:
+            tuple: (start, end) of the window to process, or (None, None) if
+            another sweep already covered it
+        """
+        from ..models import SweepMarker
+
+        # Writing first takes the marker's lock, so concurrent sweeps get
+        # consecutive windows rather than the same one
+        advanced = SweepMarker.objects.filter(
+            name=EndingSoonNotifier.MARKER, window_end__lt=until
+        ).update(window_start=F("window_end"), window_end=until, swept_at=now)
+        if not advanced:
+            try:
+                with transaction.atomic():
+                    SweepMarker.objects.create(
+                        name=EndingSoonNotifier.MARKER, window_start=now, window_end=until
+                    )
+            except IntegrityError:
+                return None, None
+        return (
+            SweepMarker.objects.filter(name=EndingSoonNotifier.MARKER)
+            .values_list("window_start", "window_end")
+            .get()
+        )
+
+    @staticmethod
+    def _notify(auctions):
+        """
+        Create one notification per (user, auction) for everyone who bid on
+        or favorited the auctions and was not told already, e.g. before an
+        extension moved the auction back out of the window.
+
+        Args:
+            auctions: {auction id: (title, end_time)}
+
+        Returns:
+            int: Number of notifications created
+        """
+        from ..models import Bid, Favorite, Notification
+
+        def not_notified(user_field):
+            return ~Exists(
+                Notification.objects.filter(
+                    user_id=OuterRef(user_field),
+                    auction_item_id=OuterRef("auction_item_id"),
+                    notification_type="ending_soon",
+                )
+            )
+
+        # One query; UNION drops users who both bid and favorited
+        bidders = (
+            Bid.objects.filter(not_notified("bidder_id"), auction_item_id__in=list(auctions))
+            .order_by()
+            .values_list("auction_item_id", "bidder_id")
+        )
+        watchers = (
+            Favorite.objects.filter(not_notified("user_id"), auction_item_id__in=list(auctions))
+            .order_by()
+            .values_list("auction_item_id", "user_id")
+        )
+        rows = [
+            Notification(
+                user_id=user_id,
+                auction_item_id=auction_id,
+                notification_type="ending_soon",
+                title="Auction Ending Soon",
+                message=(
+                    f"The auction for '{auctions[auction_id][0]}' ends at "
+                    f"{auctions[auction_id][1].strftime('%Y-%m-%d %H:%M')}."
+                ),
+            )
+            for auction_id, user_id in bidders.union(watchers)
+        ]
+        Notification.objects.bulk_create(rows)
+        Outbox.enqueue(
+            Outbox.notification_push(row, auctions[row.auction_item_id][0]) for row in rows
+        )
+        return len(rows)
@@ -0,0 +1,268 @@
+# auctions/services/escrow.py
+"""
+Escrow Service
+Keeps bid funds in per-(user, auction) hold rows instead of moving them in
+and out of the account balance. A bid only locks its bidder's own account
+row; the user it outbids is released by updating their hold on this auction,
+so busy bidders' accounts stop being contended across auctions. Every move
+is recorded as a Transaction.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+class InsufficientFunds(Exception):
+    """The user's available balance does not cover the hold."""
+
+
+class Escrow:
+    """Service class for bid holds and available balances."""
+
+    CACHE_TIMEOUT = 300  # seconds
+    CACHE_KEY = "escrow:available:{user_id}"
+
+    @staticmethod
+    def _held(exclude_auction=None):
+        """Subquery: the sum of a UserAccount's active holds."""
+        from ..models import EscrowHold
+
+        holds = EscrowHold.objects.filter(user_id=OuterRef("user_id"), status="active")
+        if exclude_auction is not None:
+            holds = holds.exclude(auction_item=exclude_auction)
+        total = holds.values("user_id").annotate(total=Sum("amount")).values("total")
+        return Coalesce(
+            Subquery(total),
+            Value(Decimal("0.00")),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+
+    @staticmethod
+    def available_balances(user_ids, exclude_auction=None):
+        """
+        Read what users can spend, in one query and bypassing the cache.
+
+        Args:
+            user_ids: Iterable of user ids
+            exclude_auction: AuctionItem whose holds count as available, for
+                bids that would replace them
+
+        Returns:
+            dict: {user_id: available balance}
+        """
+        from ..models import UserAccount
+
+        accounts = UserAccount.objects.filter(user_id__in=list(user_ids)).annotate(
+            held=Escrow._held(exclude_auction)
+        )
+        return {
+            user_id: balance - held
+            for user_id, balance, held in accounts.values_list("user_id", "balance", "held")
+        }
+
+    @staticmethod
+    def available_balance(user):
+        """
+        What the user can spend: their balance minus their active holds.
+        Cached until a hold or the balance changes (see invalidate).
+
+        Args:
+            user: The User (or user id)
+
+        Returns:
+            Decimal: The available balance
+        """
+        user_id = getattr(user, "pk", user)
+        key = Escrow.CACHE_KEY.format(user_id=user_id)
+        available = cache.get(key)
+        if available is None:
+            available = Escrow.available_balances([user_id]).get(user_id, Decimal("0.00"))
+            cache.set(key, available, timeout=Escrow.CACHE_TIMEOUT)
+        return available
+
+    @staticmethod
+    def invalidate(user_ids):
+        """
+        Drop cached available balances now and again once the current
+        transaction commits, so a value read in between is not kept.
+        """
+        keys = [Escrow.CACHE_KEY.format(user_id=user_id) for user_id in user_ids]
+        if not keys:
+            return
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @staticmethod
+    def move(auction_item, user, amount, old_bidder=None, old_amount=None):
+        """
+        Hold `amount` for `user`'s top bid and release the bid it replaces.
+        Must run inside the bid's transaction.
+
+        Only `user`'s account row is locked, which serializes their holds
+        across auctions; the account is read, never written. Their other
+        holds are summed after the lock is taken, in a statement of its own. The outbid
+        user's hold on this auction is released without touching their
+        account. Nothing is written if the funds check fails.
+
+        Args:
+            auction_item: The AuctionItem bid on
+            user: The User whose bid becomes the top bid
+            amount: The bid amount as Decimal
+            old_bidder: The previous top bidder, or None
+            old_amount: The previous top bid amount
+
+        Raises:
+            InsufficientFunds: If `user` cannot cover `amount` with their
+                balance minus their holds on other auctions
+        """
+        from ..models import EscrowHold, Transaction, UserAccount
+
+        with transaction.atomic():
+            # Write first: SQLite then takes its write lock up front instead
+            # of failing to upgrade a read lock under contention
+            held = EscrowHold.objects.filter(user=user, auction_item=auction_item)
+            if not held.update(amount=amount, status="active"):
+                EscrowHold.objects.create(user=user, auction_item=auction_item, amount=amount)
+            balance = (
+                UserAccount.objects.select_for_update()
+                .filter(user_id=user.pk)
+                .values_list("balance", flat=True)
+                .first()
+            )
+            if balance is None:
+                raise InsufficientFunds
+            # A separate statement, run once the lock is ours: on PostgreSQL
+            # it reads a fresh snapshot that includes holds committed by the
+            # transaction we waited for, which a subquery of the locking
+            # statement would not see
+            held = (
+                EscrowHold.objects.filter(user=user, status="active")
+                .exclude(auction_item=auction_item)
+                .aggregate(total=Sum("amount"))["total"]
+            )
+            if balance - (held or Decimal("0.00")) < amount:
+                raise InsufficientFunds
+
+        is_rebid = old_bidder is not None and old_bidder.pk == user.pk
+        records = [
+            Transaction(
+                user=user,
+                transaction_type="bid_lock",
+                amount=amount - old_amount if is_rebid else amount,
+                status="completed",
+                description=f"Bid hold for '{auction_item.title}'",
+            )
+        ]
+        invalidated = [user.pk]
+        if old_bidder is not None and not is_rebid:
+            EscrowHold.objects.filter(
+                user=old_bidder, auction_item=auction_item, status="active"
+            ).update(status="released")
+            records.append(
+                Transaction(
+                    user=old_bidder,
+                    transaction_type="bid_release",
+                    amount=old_amount,
+                    status="completed",
+                    description=f"Outbid on '{auction_item.title}'",
+                )
+            )
+            invalidated.append(old_bidder.pk)
+        Transaction.objects.bulk_create(records)
+        Escrow.invalidate(invalidated)
+
+    @staticmethod
+    def capture(auction_item, user, amount):
+        """
+        Pay `amount` for a won auction out of `user`'s balance, consuming
+        their hold on it. Must run inside a transaction.
+
+        Args:
+            auction_item: The AuctionItem won
+            user: The winning User
+            amount: The price as Decimal
+        """
+        from ..models import EscrowHold, Transaction, UserAccount
+
+        EscrowHold.objects.filter(user=user, auction_item=auction_item, status="active").update(
+            status="captured"
+        )
+        UserAccount.objects.filter(user_id=user.pk).update(balance=F("balance") - amount)
+        Transaction.objects.create(
+            user=user,
+            transaction_type="bid_capture",
+            amount=amount,
+            status="completed",
+            description=f"Payment for '{auction_item.title}'",
+        )
+        Escrow.invalidate([user.pk])
+
+    @staticmethod
+    def settle(auctions):
+        """
+        Settle closed auctions in a fixed number of statements: each top
+        bidder pays their winning bid out of their hold (one balance UPDATE
+        for all winners) and every other hold still active on the auctions
+        is released. Must run inside the closing transaction.
+
+        Args:
+            auctions: The closed AuctionItems, with their final current_bid
+                and top_bidder
+
+        Returns:
+            list: The user id of each hold released, sorted (a user appears
+            once per auction they lost)
+        """
+        from ..models import EscrowHold, Transaction, UserAccount
+
+        sold = [auction for auction in auctions if auction.top_bidder_id is not None]
+        owed = {}
+        records = []
+        for auction in sold:
+            owed[auction.top_bidder_id] = owed.get(auction.top_bidder_id, 0) + auction.current_bid
+            records.append(
+                Transaction(
+                    user_id=auction.top_bidder_id,
+                    transaction_type="bid_capture",
+                    amount=auction.current_bid,
+                    status="completed",
+                    description=f"Payment for '{auction.title}'",
+                )
+            )
+        if sold:
+            EscrowHold.objects.filter(
+                auction_item__in=sold, user=F("auction_item__top_bidder"), status="active"
+            ).update(status="captured")
+            UserAccount.objects.filter(user_id__in=owed).update(
+                balance=F("balance") - Case(
+                    *[When(user_id=user_id, then=Value(total)) for user_id, total in owed.items()],
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                )
+            )
+
+        titles = {auction.pk: auction.title for auction in auctions}
+        held = list(
+            EscrowHold.objects.filter(auction_item__in=auctions, status="active").values_list(
+                "pk", "user_id", "amount", "auction_item_id"
+            )
+        )
+        if held:
+            EscrowHold.objects.filter(pk__in=[pk for pk, _, _, _ in held]).update(status="released")
+            records += [
+                Transaction(
+                    user_id=user_id,
+                    transaction_type="bid_release",
+                    amount=amount,
+                    status="completed",
+                    description=f"Bid released for '{titles[auction_id]}'",
+                )
+                for _, user_id, amount, auction_id in held
+            ]
+        Transaction.objects.bulk_create(records)
+        released = sorted(user_id for _, user_id, _, _ in held)
+        Escrow.invalidate({*owed, *released})
+        return released
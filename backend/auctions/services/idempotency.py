@@ -0,0 +1,179 @@
+# auctions/services/idempotency.py
+"""
+Idempotency Service
+Answers a retried request (same Idempotency-Key header) with the response of
+the first attempt, so a client retrying a timed-out bid, Buy Now or deposit
+does not take locks or run validation again. Also records processed Stripe
+webhook events so a redelivered event is applied once.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.response import Response
+
+
+class Idempotency:
+    """Service class for Idempotency-Key replays and webhook deduplication."""
+
+    HEADER = "Idempotency-Key"
+    MAX_KEY_LENGTH = 255
+    # A claim whose request never finished (e.g. the process died) can be
+    # taken over after this long
+    IN_PROGRESS_TIMEOUT = timedelta(seconds=60)
+    # Outcomes that say nothing about the request itself; the key is freed
+    # so the client can retry
+    NOT_STORED = (409, 429)
+
+    @staticmethod
+    def run(request, user, scope, payload, handler):
+        """
+        Run `handler` once per Idempotency-Key. Without the header the
+        handler simply runs.
+
+        Args:
+            request: The request carrying the Idempotency-Key header
+            user: The authenticated User; keys are per user
+            scope: Name of the action, e.g. "bid"
+            payload: JSON-serializable description of the request; a key
+                reused with a different payload is rejected
+            handler: Callable returning the Response
+
+        Returns:
+            Response: The handler's response, or the stored one for a replay
+            (marked with an Idempotent-Replayed header)
+        """
+        key = request.headers.get(Idempotency.HEADER)
+        if not key:
+            return handler()
+        if len(key) > Idempotency.MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{Idempotency.HEADER} must be at most {Idempotency.MAX_KEY_LENGTH} characters."},
+                status=400,
+            )
+
+        fingerprint = hashlib.sha256(
+            json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder).encode()
+        ).hexdigest()
+        record, replay = Idempotency._claim(user, scope, key, fingerprint)
+        if replay is not None:
+            return replay
+
+        from ..models import IdempotencyKey
+
+        try:
+            response = handler()
+        except Exception:
+            IdempotencyKey.objects.filter(pk=record.pk).delete()
+            raise
+        if response.status_code >= 500 or response.status_code in Idempotency.NOT_STORED:
+            IdempotencyKey.objects.filter(pk=record.pk).delete()
+        else:
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                status_code=response.status_code, response=response.data
+            )
+        return response
+
+    @staticmethod
+    def _claim(user, scope, key, fingerprint):
+        """
+        Insert the key as in progress, or find the request that owns it.
+
+        Returns:
+            tuple: (IdempotencyKey, None) if this request owns the key, or
+            (None, response) to answer with instead
+        """
+        from ..models import IdempotencyKey
+
+        now = timezone.now()
+        for _ in range(2):
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=user,
+                        scope=scope,
+                        key=key,
+                        fingerprint=fingerprint,
+                        expires_at=now + settings.IDEMPOTENCY_KEY_TTL,
+                    )
+                return record, None
+            except IntegrityError:
+                pass
+
+            existing = IdempotencyKey.objects.filter(user=user, scope=scope, key=key).first()
+            if existing is None:
+                continue
+            abandoned = (
+                existing.status_code is None
+                and existing.created_at < now - Idempotency.IN_PROGRESS_TIMEOUT
+            )
+            if existing.expires_at <= now or abandoned:
+                # Only the request that removes the stale row claims the key
+                IdempotencyKey.objects.filter(pk=existing.pk, status_code=existing.status_code).delete()
+                continue
+            if existing.status_code is None:
+                return None, Response(
+                    {"detail": f"A request with this {Idempotency.HEADER} is still in progress."},
+                    status=409,
+                )
+            if existing.fingerprint != fingerprint:
+                return None, Response(
+                    {"detail": f"{Idempotency.HEADER} was already used for a different request."},
+                    status=422,
+                )
+            return None, Response(
+                existing.response,
+                status=existing.status_code,
+                headers={"Idempotent-Replayed": "true"},
+            )
+        return None, Response(
+            {"detail": f"A request with this {Idempotency.HEADER} is still in progress."},
+            status=409,
+        )
+
+    @staticmethod
+    def mark(scope, key, ttl):
+        """
+        Record that an event was processed. Call inside the transaction that
+        applies the event, so the record and its effects commit together.
+
+        Args:
+            scope: Event source, e.g. "stripe_event"
+            key: The event's unique id
+            ttl: How long to remember it, as timedelta
+
+        Returns:
+            bool: False if the event was already processed
+        """
+        from ..models import IdempotencyKey
+
+        now = timezone.now()
+        IdempotencyKey.objects.filter(
+            user__isnull=True, scope=scope, key=key, expires_at__lte=now
+        ).delete()
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    scope=scope, key=key, status_code=200, expires_at=now + ttl
+                )
+        except IntegrityError:
+            return False
+        return True
+
+    @staticmethod
+    def purge():
+        """
+        Delete expired keys.
+
+        Returns:
+            int: Number of keys deleted
+        """
+        from ..models import IdempotencyKey
+
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
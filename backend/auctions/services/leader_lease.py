@@ -0,0 +1,70 @@
+# auctions/services/leader_lease.py
+"""
+Leader Lease Service
+Every web worker process starts the background jobs, so jobs that must run
+in one place at a time (closing auctions on SQLite, hourly housekeeping)
+take a named lease row first. The holder keeps renewing it; when it stops
+(the process died), the lease expires and another process takes over.
+"""
+
+import os
+import socket
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+
+class LeaderLease:
+    """Service class for database-backed leases."""
+
+    TTL = timedelta(seconds=30)
+
+    @staticmethod
+    def holder():
+        """
+        Identifies this process; its threads share its leases. Read per
+        call, as workers forked after import (gunicorn --preload) get their
+        own pid.
+        """
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def acquire(name, ttl=None, holder=None):
+        """
+        Take or renew the lease `name` unless another holder has it.
+
+        Args:
+            name: Lease name, e.g. "auction-closer"
+            ttl: How long the lease lasts without renewal, as timedelta
+            holder: Holder id (defaults to this process)
+
+        Returns:
+            bool: True if `holder` now holds the lease until now + ttl
+        """
+        from ..models import Lease
+
+        holder = holder or LeaderLease.holder()
+        now = timezone.now()
+        expires_at = now + (ttl or LeaderLease.TTL)
+        # A single conditional UPDATE renews our own lease or takes over an
+        # expired one; only one of two racing processes matches it
+        taken = Lease.objects.filter(
+            Q(holder=holder) | Q(expires_at__lte=now), name=name
+        ).update(holder=holder, expires_at=expires_at)
+        if taken:
+            return True
+        try:
+            with transaction.atomic():
+                Lease.objects.create(name=name, holder=holder, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        return True
+
+    @staticmethod
+    def release(name, holder=None):
+        """Give up the lease `name` if `holder` (defaults to this process) has it."""
+        from ..models import Lease
+
+        Lease.objects.filter(name=name, holder=holder or LeaderLease.holder()).delete()
@@ -0,0 +1,149 @@
+# auctions/services/metrics.py
+"""
+Metrics Service
+A small in-process registry of counters, gauges and histograms, rendered in
+the Prometheus text exposition format by the metrics scrape endpoint. Values
+are per process: each worker is scraped (or reports, for management
+commands) on its own.
+"""
+
+import bisect
+import math
+import threading
+
+
+class Counter:
+    """A value that only goes up, e.g. auctions closed."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def samples(self):
+        return [(self.name, {}, self._value)]
+
+
+class Gauge:
+    """A value that is set, e.g. the time of the last successful run."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._value = 0
+
+    def set(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    def samples(self):
+        return [(self.name, {}, self._value)]
+
+
+class Histogram:
+    """Counts observations into cumulative `le` buckets, with their sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # the last is +Inf
+        self._sum = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    @property
+    def count(self):
+        return sum(self._counts)
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def samples(self):
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        samples, cumulative = [], 0
+        for bound, count in zip((*self.buckets, math.inf), counts):
+            cumulative += count
+            samples.append((f"{self.name}_bucket", {"le": _format(bound)}, cumulative))
+        samples.append((f"{self.name}_sum", {}, total))
+        samples.append((f"{self.name}_count", {}, cumulative))
+        return samples
+
+
+def _format(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """The process-wide registry. Metrics are created once, by name."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    _metrics = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def counter(cls, name, help_text):
+        return cls._register(Counter, name, help_text)
+
+    @classmethod
+    def gauge(cls, name, help_text):
+        return cls._register(Gauge, name, help_text)
+
+    @classmethod
+    def histogram(cls, name, help_text, buckets):
+        return cls._register(Histogram, name, help_text, buckets)
+
+    @classmethod
+    def _register(cls, metric_class, name, *args):
+        with cls._lock:
+            metric = cls._metrics.get(name)
+            if metric is None:
+                metric = cls._metrics[name] = metric_class(name, *args)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}.")
+            return metric
+
+    @classmethod
+    def render(cls):
+        """
+        Returns:
+            str: Every registered metric in the Prometheus text format
+        """
+        lines = []
+        for name, metric in sorted(cls._metrics.items()):
+            lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, labels, value in metric.samples():
+                if labels:
+                    sample += "{" + ",".join(f'{key}="{label}"' for key, label in labels.items()) + "}"
+                lines.append(f"{sample} {_format(value)}")
+        return "\n".join(lines) + "\n"
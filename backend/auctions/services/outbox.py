@@ -0,0 +1,600 @@
+# auctions/services/outbox.py
+"""
+Outbox Service
+Records side effects in the transaction that causes them and delivers them
+after commit, so notification inserts and WebSocket pushes never run under a
+row lock and a failed push cannot roll back a bid.
+"""
+
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# False while an async caller will drain the outbox itself after commit
+_drain_on_wake = contextvars.ContextVar("outbox_drain_on_wake", default=True)
+
+
+class Outbox:
+    """Builds outbox events and appends them in one bulk insert."""
+
+    @staticmethod
+    def notification(user, notification_type, title, message, auction_item=None):
+        """
+        Args:
+            user: The User (or user id) to notify
+            notification_type: One of Notification.NOTIFICATION_TYPES
+            title: Notification title
+            message: Notification body
+            auction_item: Optional AuctionItem (or id) the notification refers to
+
+        Returns:
+            OutboxEvent: Unsaved event creating the Notification row
+        """
+        from ..models import OutboxEvent
+
+        return OutboxEvent(
+            kind="notification",
+            payload={
+                "user_id": getattr(user, "pk", user),
+                "notification_type": notification_type,
+                "title": title,
+                "message": message,
+                "auction_item_id": getattr(auction_item, "pk", auction_item),
+            },
+        )
+
+    @staticmethod
+    def balance_update(user_id):
+        """
+        Returns:
+            OutboxEvent: Unsaved event pushing the user's available balance.
+            It is read when the event is dispatched, so the latest value is sent.
+        """
+        from ..models import OutboxEvent
+
+        return OutboxEvent(kind="balance", payload={"user_id": user_id})
+
+    @staticmethod
+    def group_send(group, message):
+        """
+        Returns:
+            OutboxEvent: Unsaved event sending `message` to a channel layer group
+        """
+        from ..models import OutboxEvent
+
+        return OutboxEvent(kind="group_send", payload={"group": group, "message": message})
+
+    @staticmethod
+    def bidder_fanout(auction_item, notification_type, title, message):
+        """
+        Returns:
+            OutboxEvent: Unsaved event creating one Notification for every
+            user who had bid on the auction when the event was written. The
+            bidders are resolved at dispatch time with a single query.
+        """
+        from ..models import OutboxEvent
+
+        return OutboxEvent(
+            kind="fanout",
+            payload={
+                "auction_item_id": getattr(auction_item, "pk", auction_item),
+                "notification_type": notification_type,
+                "title": title,
+                "message": message,
+            },
+        )
+
+    @staticmethod
+    def auction_group(auction_id):
+        """Channel layer group of everyone watching an auction."""
+        return f"auction_{auction_id}"
+
+    @staticmethod
+    def notification_group(user_id):
+        """Channel layer group of a user's notification sockets."""
+        return f"user_notifications_{user_id}"
+
+    @staticmethod
+    def notification_push(notification, auction_title=None):
+        """
+        Args:
+            notification: A saved Notification
+            auction_title: Title of its auction, to avoid loading it
+
+        Returns:
+            OutboxEvent: Unsaved event pushing the notification to its user,
+            shaped like NotificationSerializer's output
+        """
+        return Outbox.group_send(
+            Outbox.notification_group(notification.user_id),
+            {
+                "type": "notification",
+                "id": notification.pk,
+                "notification_type": notification.notification_type,
+                "notification_type_display": notification.get_notification_type_display(),
+                "title": notification.title,
+                "message": notification.message,
+                "auction_item": notification.auction_item_id,
+                "auction_item_title": auction_title,
+                "is_read": notification.is_read,
+                "created_at": notification.created_at.isoformat(),
+            },
+        )
+
+    @staticmethod
+    def auction_state(auction_item, **changes):
+        """
+        The live fields of an auction as sent to its watchers.
+
+        Args:
+            auction_item: The AuctionItem (top_bidder selected)
+            **changes: Field values overriding the instance's, for state
+                that is about to be committed
+
+        Returns:
+            dict: current_bid, top_bidder, bid_count, end_time and status
+        """
+        state = {
+            "current_bid": auction_item.current_bid,
+            "top_bidder": auction_item.top_bidder,
+            "bid_count": auction_item.bid_count,
+            "end_time": auction_item.end_time,
+            "status": auction_item.status,
+        }
+        state.update(changes)
+        return {
+            "current_bid": str(state["current_bid"]) if state["current_bid"] is not None else None,
+            "top_bidder": state["top_bidder"].username if state["top_bidder"] is not None else None,
+            "bid_count": state["bid_count"],
+            "end_time": state["end_time"].isoformat(),
+            "status": state["status"],
+        }
+
+    @staticmethod
+    def auction_update(auction_item, **changes):
+        """
+        Returns:
+            OutboxEvent: Unsaved event publishing the auction's live state
+            (see auction_state) to its watchers. Updates for the same auction
+            in one dispatch batch collapse into the latest, and are published
+            at most AUCTION_LIVE_UPDATES_PER_SECOND times a second (see
+            AuctionUpdateThrottle).
+        """
+        return Outbox.group_send(
+            Outbox.auction_group(auction_item.pk),
+            {
+                "type": "auction_update",
+                "auction_id": auction_item.pk,
+                **Outbox.auction_state(auction_item, **changes),
+            },
+        )
+
+    @staticmethod
+    def enqueue(events):
+        """
+        Append events to the outbox in a single insert and wake the
+        dispatcher once the surrounding transaction commits.
+
+        Args:
+            events: Iterable of unsaved OutboxEvent instances
+        """
+        from ..models import OutboxEvent
+
+        events = list(events)
+        if not events:
+            return
+        OutboxEvent.objects.bulk_create(events)
+        transaction.on_commit(OutboxDispatcher.wake)
+
+
+class AuctionUpdateThrottle:
+    """
+    Publishes each auction's live state at most AUCTION_LIVE_UPDATES_PER_SECOND
+    times a second from this process. An update that comes sooner is held
+    as the auction's pending one, replacing any older one, and the auction's
+    flush timer sends it when the next slot opens. The state is absolute,
+    so only the latest matters.
+    """
+
+    # Past this many tracked auctions, forget those free to publish again
+    MAX_TRACKED = 1000
+
+    _lock = threading.Lock()
+    _last_sent = {}  # group -> time.monotonic() of its last publish
+    _pending = {}    # group -> latest held message
+    _timers = {}     # group -> threading.Timer that sends the held message
+
+    @staticmethod
+    def interval():
+        return 1 / getattr(settings, "AUCTION_LIVE_UPDATES_PER_SECOND", 4)
+
+    @classmethod
+    def admit(cls, group, message):
+        """
+        Decide whether an auction_update goes out now or is held.
+
+        Args:
+            group: The auction's channel layer group
+            message: The auction_update message
+
+        Returns:
+            bool: True if the caller sends `message` now; otherwise it is
+            held and sent by the group's flush timer
+        """
+        now = time.monotonic()
+        interval = cls.interval()
+        with cls._lock:
+            if group not in cls._timers:
+                wait = cls._last_sent.get(group, -math.inf) + interval - now
+                if wait <= 0:
+                    cls._last_sent[group] = now
+                    cls._prune(now - interval)
+                    return True
+                timer = threading.Timer(wait, cls._flush, [group])
+                timer.daemon = True
+                cls._timers[group] = timer
+                timer.start()
+            held = cls._pending.get(group)
+            # Concurrent dispatchers may hand updates over out of order
+            if held is None or message.get("bid_count", 0) >= held.get("bid_count", 0):
+                cls._pending[group] = message
+            return False
+
+    @classmethod
+    def _flush(cls, group):
+        with cls._lock:
+            cls._timers.pop(group, None)
+            message = cls._pending.pop(group, None)
+            cls._last_sent[group] = time.monotonic()
+        if message is None:
+            return
+        try:
+            [result] = async_to_sync(OutboxDispatcher._push)([(group, message)])
+        except Exception as e:
+            result = e
+        if isinstance(result, Exception):
+            # A later update or a reconnect's snapshot carries the state
+            logger.warning(f"Dropping held live update for {group}: {result}")
+
+    @classmethod
+    def _prune(cls, before):
+        if len(cls._last_sent) > cls.MAX_TRACKED:
+            cls._last_sent = {
+                group: sent for group, sent in cls._last_sent.items() if sent > before
+            }
+
+
+class OutboxDispatcher:
+    """
+    Delivers pending outbox events in batches: notification rows in one bulk
+    insert, WebSocket pushes in one event-loop round trip. Runs as a worker
+    thread when started; otherwise wake() drains inline after commit.
+    """
+
+    BATCH_SIZE = 500
+    MAX_ATTEMPTS = 5
+    POLL_INTERVAL_SECONDS = 5
+    PURGE_BATCH_SIZE = 5000
+
+    _thread = None
+    _wakeup = threading.Event()
+
+    @classmethod
+    def start(cls):
+        """Start the dispatcher worker thread (idempotent)."""
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+        cls._thread = threading.Thread(target=cls._run, name="outbox-dispatcher", daemon=True)
+        cls._thread.start()
+        logger.info("Outbox dispatcher started.")
+
+    @classmethod
+    def wake(cls):
+        """Signal that new events were committed."""
+        if not _drain_on_wake.get():
+            return
+        if cls._thread is not None and cls._thread.is_alive():
+            cls._wakeup.set()
+            return
+        # Runs after the caller's commit: a failure here must not fail the
+        # request, the events stay pending for the next drain
+        try:
+            cls.drain()
+        except Exception:
+            logger.exception("Outbox dispatch failed.")
+
+    @staticmethod
+    @contextmanager
+    def deferred():
+        """
+        Suppress wake() for commits made inside this context (including
+        sync_to_async calls from it); the caller awaits adrain() instead.
+        """
+        token = _drain_on_wake.set(False)
+        try:
+            yield
+        finally:
+            _drain_on_wake.reset(token)
+
+    @classmethod
+    def _run(cls):
+        while True:
+            cls._wakeup.wait(cls.POLL_INTERVAL_SECONDS)
+            cls._wakeup.clear()
+            close_old_connections()
+            try:
+                cls.drain()
+            except Exception:
+                logger.exception("Outbox dispatch failed.")
+
+    @staticmethod
+    def purge(retention=None):
+        """
+        Delete events dispatched (or given up on) longer ago than
+        `retention`, in short batches so bid transactions are not held up.
+
+        Args:
+            retention: timedelta (defaults to settings.OUTBOX_RETENTION)
+
+        Returns:
+            int: Number of events deleted
+        """
+        from ..models import OutboxEvent
+
+        cutoff = timezone.now() - (retention or settings.OUTBOX_RETENTION)
+        deleted = 0
+        while True:
+            ids = list(
+                OutboxEvent.objects.filter(dispatched_at__lt=cutoff).values_list("id", flat=True)[
+                    : OutboxDispatcher.PURGE_BATCH_SIZE
+                ]
+            )
+            if not ids:
+                return deleted
+            deleted += OutboxEvent.objects.filter(id__in=ids).delete()[0]
+
+    @staticmethod
+    def drain(batch_size=None):
+        """
+        Dispatch pending events until a batch comes back short.
+
+        Returns:
+            int: Number of events processed
+        """
+        batch_size = batch_size or OutboxDispatcher.BATCH_SIZE
+        total = 0
+        while True:
+            processed = OutboxDispatcher.dispatch_batch(batch_size)
+            total += processed
+            if processed < batch_size:
+                return total
+
+    @staticmethod
+    async def adrain(batch_size=None):
+        """
+        Async drain: the channel-layer sends are awaited on the caller's
+        event loop, so async views deliver their own events without a
+        nested async_to_sync.
+
+        Returns:
+            int: Number of events processed
+        """
+        batch_size = batch_size or OutboxDispatcher.BATCH_SIZE
+        total = 0
+        while True:
+            processed = await OutboxDispatcher.adispatch_batch(batch_size)
+            total += processed
+            if processed < batch_size:
+                return total
+
+    @staticmethod
+    def dispatch_batch(batch_size):
+        """Synchronous entry point for adispatch_batch."""
+        return async_to_sync(OutboxDispatcher.adispatch_batch)(batch_size)
+
+    @staticmethod
+    async def adispatch_batch(batch_size):
+        """
+        Claim and deliver up to `batch_size` pending events.
+
+        Events are claimed by stamping dispatched_at, so two dispatchers
+        never deliver the same event: rows locked by another dispatcher are
+        skipped (PostgreSQL), or the claim matches nothing once the other
+        transaction commits (SQLite). Notification rows are inserted in the
+        claiming transaction; pushes are sent after it commits, so no lock
+        is held across channel-layer I/O. Failed events are released for
+        retry until MAX_ATTEMPTS.
+
+        Returns:
+            int: Number of events claimed
+        """
+        events, messages, errors = await sync_to_async(OutboxDispatcher._claim)(batch_size)
+        if messages:
+            results = await OutboxDispatcher._push([(group, message) for _, group, message in messages])
+            for (sources, _, _), result in zip(messages, results):
+                if isinstance(result, Exception):
+                    errors.update({event.pk: str(result) for event in sources})
+        if errors:
+            await sync_to_async(OutboxDispatcher._release)(events, errors)
+        return len(events)
+
+    @staticmethod
+    def _claim(batch_size):
+        """
+        Claim a batch and insert its notification rows.
+
+        Returns:
+            tuple: (events, [(source events, group, message)], {event id: error})
+        """
+        from ..models import OutboxEvent
+
+        with transaction.atomic():
+            pending = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(dispatched_at__isnull=True)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not pending:
+                return [], [], {}
+
+            now = timezone.now()
+            OutboxEvent.objects.filter(id__in=pending, dispatched_at__isnull=True).update(
+                dispatched_at=now
+            )
+            events = list(OutboxEvent.objects.filter(id__in=pending, dispatched_at=now))
+            messages, errors = OutboxDispatcher._deliver(events)
+        return events, messages, errors
+
+    @staticmethod
+    def _release(events, errors):
+        """Put failed events back in the queue, or give up on them."""
+        from ..models import OutboxEvent
+
+        for event in events:
+            if event.pk not in errors:
+                continue
+            gave_up = event.attempts + 1 >= OutboxDispatcher.MAX_ATTEMPTS
+            OutboxEvent.objects.filter(pk=event.pk).update(
+                attempts=F("attempts") + 1,
+                last_error=errors[event.pk],
+                dispatched_at=event.dispatched_at if gave_up else None,
+            )
+            if gave_up:
+                logger.error(f"Dropping outbox event {event.pk}: {errors[event.pk]}")
+
+    @staticmethod
+    def _deliver(events):
+        """
+        Write the notification rows of a claimed batch (expanding fan-out
+        events to the auction's bidders) and build its pushes, one per user
+        for balance updates, carrying the available balance as of now.
+
+        Returns:
+            tuple: ([(source events, group, message)], {event id: error})
+        """
+        from ..models import Bid, Notification
+        from .escrow import Escrow
+
+        errors = {}
+        by_kind = {}
+        for event in events:
+            by_kind.setdefault(event.kind, []).append(event)
+
+        notifications = by_kind.get("notification", []) + by_kind.get("fanout", [])
+        if notifications:
+            try:
+                with transaction.atomic():
+                    rows = {}
+                    for event in notifications:
+                        if event.kind == "notification":
+                            rows[event.pk] = [Notification(**event.payload)]
+                            continue
+                        bidder_ids = (
+                            Bid.objects.filter(
+                                auction_item_id=event.payload["auction_item_id"],
+                                timestamp__lte=event.created_at,
+                            )
+                            .order_by()
+                            .values_list("bidder_id", flat=True)
+                            .distinct()
+                        )
+                        rows[event.pk] = [
+                            Notification(user_id=bidder_id, **event.payload)
+                            for bidder_id in bidder_ids
+                        ]
+                    errors.update(OutboxDispatcher._dangling(rows))
+                    Notification.objects.bulk_create(
+                        [
+                            row
+                            for event_id, event_rows in rows.items()
+                            if event_id not in errors
+                            for row in event_rows
+                        ]
+                    )
+            except Exception as e:
+                errors.update({event.pk: str(e) for event in notifications})
+
+        balance_events = {}
+        for event in by_kind.get("balance", []):
+            balance_events.setdefault(event.payload["user_id"], []).append(event)
+        balances = Escrow.available_balances(balance_events).items()
+        messages = [
+            (
+                balance_events[user_id],
+                f"user_balance_{user_id}",
+                {"type": "balance_update", "balance": str(balance)},
+            )
+            for user_id, balance in balances
+        ]
+        # Live auction state is absolute, so only the latest per auction is sent
+        auction_updates = {}
+        for event in by_kind.get("group_send", []):
+            group, message = event.payload["group"], event.payload["message"]
+            if message.get("type") == "auction_update":
+                auction_updates.setdefault(group, []).append(event)
+            else:
+                messages.append(([event], group, message))
+        # Held updates count as delivered: the throttle sends the latest
+        messages += [
+            (sources, group, sources[-1].payload["message"])
+            for group, sources in auction_updates.items()
+            if AuctionUpdateThrottle.admit(group, sources[-1].payload["message"])
+        ]
+        return messages, errors
+
+    @staticmethod
+    def _dangling(rows):
+        """
+        Find events whose notifications point at a user or auction deleted
+        since the event was written. Foreign keys are checked at COMMIT, so
+        inserting them would fail the whole batch's claim, over and over.
+
+        Args:
+            rows: {event id: [unsaved Notification]}
+
+        Returns:
+            dict: {event id: error} for the events to fail
+        """
+        from django.contrib.auth.models import User
+
+        from ..models import AuctionItem
+
+        user_ids = {row.user_id for event_rows in rows.values() for row in event_rows}
+        auction_ids = {
+            row.auction_item_id for event_rows in rows.values() for row in event_rows
+        } - {None}
+        users = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+        auctions = set(AuctionItem.objects.filter(pk__in=auction_ids).values_list("pk", flat=True))
+        errors = {}
+        for event_id, event_rows in rows.items():
+            for row in event_rows:
+                if row.user_id not in users:
+                    errors[event_id] = f"User {row.user_id} no longer exists."
+                elif row.auction_item_id is not None and row.auction_item_id not in auctions:
+                    errors[event_id] = f"Auction {row.auction_item_id} no longer exists."
+        return errors
+
+    @staticmethod
+    async def _push(messages):
+        from channels.layers import get_channel_layer
+
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return [None] * len(messages)
+        return await asyncio.gather(
+            *(channel_layer.group_send(group, message) for group, message in messages),
+            return_exceptions=True,
+        )
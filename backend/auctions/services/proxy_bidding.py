@@ -0,0 +1,141 @@
+# auctions/services/proxy_bidding.py
+"""
+Proxy Bidding Service
+Resolves stored maximum bids against an incoming bid in one step, so a
+bidding war between maxima costs one commit instead of a request per
+increment.
+"""
+
+from .bid_validator import BidValidator
+from .escrow import Escrow
+
+
+class ProxyBidding:
+    """Service class for resolving proxy (maximum) bids."""
+
+    @staticmethod
+    def load(auction_item):
+        """
+        Read the active maxima on an auction and what their holders can pay.
+
+        Args:
+            auction_item: The AuctionItem instance
+
+        Returns:
+            tuple: (proxies ordered by creation, {user_id: available balance});
+            a holder's hold on this auction counts as available to them
+        """
+        from ..models import ProxyBid
+
+        proxies = list(
+            ProxyBid.objects.filter(auction_item=auction_item, is_active=True)
+            .select_related("bidder")
+            .order_by("created_at", "id")
+        )
+        if not proxies:
+            return [], {}
+        balances = Escrow.available_balances(
+            [proxy.bidder_id for proxy in proxies], exclude_auction=auction_item
+        )
+        return proxies, balances
+
+    @staticmethod
+    def resolve(auction_item, user, amount=None, max_amount=None, proxies=(), balances=None):
+        """
+        Work out the outcome of a bid against the active maxima.
+
+        The highest maximum wins at one minimum increment above the runner-up,
+        capped at its own maximum. On equal maxima the current top bidder
+        wins, then the earlier proxy, then the incoming bid. A manual amount
+        is a floor: if its bidder wins they pay at least what they bid.
+        Maxima are capped at what their holders can pay.
+
+        Args:
+            auction_item: The AuctionItem snapshot (top_bidder selected)
+            user: The User placing the bid
+            amount: Validated manual bid amount, or None
+            max_amount: Validated maximum to store for `user`, or None
+            proxies: Active ProxyBids from load()
+            balances: {user_id: available balance} from load(), plus the
+                bidder's own
+
+        Returns:
+            tuple: (winner, price, losing_bids, exhausted_proxy_ids); price
+            is None if the top bid does not change. losing_bids are
+            (bidder, amount) pairs reached on the way to the final price.
+        """
+        balances = balances or {}
+        incumbent = auction_item.top_bidder
+        current = auction_item.current_bid
+        min_required = BidValidator.get_min_required_bid(auction_item)
+        by_bidder = {proxy.bidder_id: proxy for proxy in proxies}
+
+        def affordable(bidder_id, maximum):
+            if bidder_id not in balances:
+                return maximum
+            return min(maximum, balances[bidder_id])
+
+        # bidder_id -> [effective maximum, tie-break rank, bidder, floor]
+        contenders = {}
+        if incumbent is not None:
+            held = by_bidder.get(incumbent.pk)
+            maximum = affordable(incumbent.pk, held.max_amount) if held else current
+            contenders[incumbent.pk] = [max(maximum, current), 0, incumbent, current]
+        for rank, proxy in enumerate(proxies, start=1):
+            if proxy.bidder_id in contenders or proxy.bidder_id == user.pk:
+                continue
+            maximum = affordable(proxy.bidder_id, proxy.max_amount)
+            if maximum >= min_required:
+                contenders[proxy.bidder_id] = [maximum, rank, proxy.bidder, min_required]
+
+        offers = [offer for offer in (amount, max_amount) if offer is not None]
+        if user.pk in by_bidder:
+            offers.append(by_bidder[user.pk].max_amount)
+        offer = affordable(user.pk, max(offers))
+        if user.pk in contenders:
+            entry = contenders[user.pk]
+            entry[0] = max(entry[0], offer)
+            entry[3] = max(entry[3], amount or entry[3])
+        else:
+            contenders[user.pk] = [offer, len(proxies) + 1, user, amount or min_required]
+
+        ranked = sorted(contenders.values(), key=lambda entry: (-entry[0], entry[1]))
+        maximum, _, winner, floor = ranked[0]
+        price = floor
+        if len(ranked) > 1:
+            price = max(floor, min(maximum, BidValidator.get_min_increment_over(ranked[1][0])))
+
+        exhausted = [proxy.pk for proxy in proxies if proxy.bidder_id != winner.pk]
+        if winner == incumbent and price == current:
+            return winner, None, [], exhausted
+
+        losing_bids = [
+            (bidder, loser_max)
+            for loser_max, _, bidder, _ in ranked[1:]
+            if bidder != incumbent or loser_max > current
+        ]
+        return winner, price, losing_bids, exhausted
+
+    @staticmethod
+    def apply(auction_item, user, max_amount, is_active, exhausted):
+        """
+        Store the bidder's maximum and retire maxima that can no longer win.
+        Runs inside BidProcessor.commit_bid's transaction.
+
+        Args:
+            auction_item: The AuctionItem instance
+            user: The User whose maximum is stored
+            max_amount: The maximum, or None to leave it unchanged
+            is_active: Whether the stored maximum can still bid
+            exhausted: IDs of other ProxyBids to deactivate
+        """
+        from ..models import ProxyBid
+
+        if exhausted:
+            ProxyBid.objects.filter(pk__in=exhausted).update(is_active=False)
+        if max_amount is not None:
+            ProxyBid.objects.update_or_create(
+                auction_item=auction_item,
+                bidder=user,
+                defaults={"max_amount": max_amount, "is_active": is_active},
+            )
@@ -0,0 +1,126 @@
+# auctions/services/rate_limiter.py
+"""
+Bid Rate Limiter
+Sliding-window limit on bids per (auction, user), kept entirely in the
+cache so that rejected attempts never reach the database. Only bids that
+pass validation are counted.
+"""
+
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class BidRateLimiter:
+    """
+    Approximates a sliding window from two fixed windows: the attempts in the
+    current window plus the previous window's attempts weighted by how much
+    of it still overlaps the sliding window. Counting uses cache.incr, which
+    is atomic on Redis and on the local-memory backend.
+    """
+
+    # The single-bid-per-30-seconds rule bids always had, and one bid a
+    # minute inside the anti-snipe window, where each bid extends the auction
+    DEFAULT_LIMITS = {
+        "open": {"count": 1, "window": 30},
+        "closing": {"count": 1, "window": 60},
+    }
+    COUNTER_KEY = "bidrl:{auction_id}:{user_id}:{phase}:{slot}"
+    REJECTED_KEY = "bidrl:rejected:{phase}"
+
+    @staticmethod
+    def get_limits():
+        return getattr(settings, "BID_RATE_LIMITS", BidRateLimiter.DEFAULT_LIMITS)
+
+    @staticmethod
+    def get_phase(auction_item):
+        """Auctions inside the anti-snipe window are in the stricter "closing" phase."""
+        from .bid_processor import BidProcessor
+
+        seconds_left = auction_item.end_time.timestamp() - time.time()
+        if seconds_left < BidProcessor.ANTI_SNIPE_THRESHOLD_SECONDS:
+            return "closing"
+        return "open"
+
+    @staticmethod
+    def check(auction_item, user):
+        """
+        Decide whether one more bid would stay within the limit, without
+        counting it. Runs before validation, so invalid attempts are free.
+
+        Args:
+            auction_item: The AuctionItem instance
+            user: The User attempting to bid
+
+        Returns:
+            tuple: (allowed, retry_after_seconds)
+        """
+        return BidRateLimiter._decide(auction_item, user, count=False)
+
+    @staticmethod
+    def hit(auction_item, user):
+        """
+        Count a bid that passed validation, unless it would exceed the
+        limit (a concurrent bid may have been counted since check).
+
+        Args:
+            auction_item: The AuctionItem instance
+            user: The User bidding
+
+        Returns:
+            tuple: (allowed, retry_after_seconds)
+        """
+        return BidRateLimiter._decide(auction_item, user, count=True)
+
+    @staticmethod
+    def _decide(auction_item, user, count):
+        phase = BidRateLimiter.get_phase(auction_item)
+        limit = BidRateLimiter.get_limits()[phase]
+        window = limit["window"]
+
+        now = time.time()
+        slot = int(now // window)
+        key = BidRateLimiter.COUNTER_KEY.format(
+            auction_id=auction_item.pk, user_id=user.pk, phase=phase, slot=slot
+        )
+        previous_key = BidRateLimiter.COUNTER_KEY.format(
+            auction_id=auction_item.pk, user_id=user.pk, phase=phase, slot=slot - 1
+        )
+
+        if count:
+            current = BidRateLimiter._incr(key, timeout=2 * window)
+        else:
+            current = cache.get(key, 0) + 1
+        previous = cache.get(previous_key, 0)
+        elapsed = (now % window) / window
+        estimated = previous * (1 - elapsed) + current
+
+        if estimated <= limit["count"]:
+            return True, 0
+
+        if count:
+            cache.decr(key)
+        BidRateLimiter._incr(BidRateLimiter.REJECTED_KEY.format(phase=phase), timeout=None)
+        return False, max(1, math.ceil(window - now % window))
+
+    @staticmethod
+    def stats():
+        """
+        Returns:
+            dict: Rejected attempt counts per phase
+        """
+        phases = list(BidRateLimiter.get_limits())
+        keys = {BidRateLimiter.REJECTED_KEY.format(phase=phase): phase for phase in phases}
+        counts = cache.get_many(list(keys))
+        return {"rejected": {phase: counts.get(key, 0) for key, phase in keys.items()}}
+
+    @staticmethod
+    def _incr(key, timeout):
+        try:
+            return cache.incr(key)
+        except ValueError:
+            if cache.add(key, 1, timeout=timeout):
+                return 1
+            return cache.incr(key)
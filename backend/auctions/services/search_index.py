@@ -0,0 +1,194 @@
+# auctions/services/search_index.py
+"""
+Search Index Service
+Maintains the inverted word index over auction titles/descriptions and
+answers ranked fuzzy queries against it.
+"""
+
+from django.db import transaction
+from django.db.models import Count
+
+from ..utils.search import batch_within_distance, tokenize, trigrams
+
+
+class SearchIndex:
+    """Service class for indexing and searching auction items."""
+
+    # Match quality for a query word against an indexed term
+    EXACT_MATCH = 3
+    PARTIAL_MATCH = 2  # query word is a substring of the term
+    FUZZY_MATCH = 1    # within edit-distance threshold
+    TITLE_WEIGHT = 2   # multiplier when the term occurs in the title
+
+    # Query words up to this length only match terms they are a prefix of
+    # (too short to fuzzy-match usefully); longer ones are fuzzy-matched.
+    # Both are shortlisted through the trigram index.
+    SHORT_WORD_LENGTH = 3
+
+    @staticmethod
+    def index_item(auction_item):
+        """
+        (Re)index a single auction item. Call after create and after any
+        update that may have changed its title or description.
+
+        Args:
+            auction_item: The AuctionItem instance
+        """
+        from ..models import SearchPosting
+
+        title_words = set(tokenize(auction_item.title))
+        words = title_words | set(tokenize(auction_item.description))
+
+        with transaction.atomic():
+            term_ids = SearchIndex._ensure_terms(words)
+            SearchPosting.objects.filter(auction_item=auction_item).delete()
+            SearchPosting.objects.bulk_create(
+                [
+                    SearchPosting(
+                        term_id=term_ids[word],
+                        auction_item=auction_item,
+                        in_title=word in title_words,
+                    )
+                    for word in words
+                ]
+            )
+
+    @staticmethod
+    def rank(query, queryset):
+        """
+        Rank the auction items in `queryset` that match every word of `query`.
+
+        Args:
+            query: The raw search string
+            queryset: AuctionItem queryset restricting the candidates
+
+        Returns:
+            list: Matching auction item ids, best match first
+        """
+        from ..models import SearchPosting
+
+        words = tokenize(query)
+        if not words:
+            return []
+
+        term_matches = []
+        for word in words:
+            matches = SearchIndex.match_terms(word)
+            if not matches:
+                return []
+            term_matches.append(matches)
+
+        # Start from the word with the fewest matching terms so the
+        # candidate set shrinks as quickly as possible.
+        term_matches.sort(key=len)
+        scores = None
+        for matches in term_matches:
+            postings = SearchPosting.objects.filter(term_id__in=matches)
+            if scores is None:
+                postings = postings.filter(auction_item__in=queryset.values("id"))
+            else:
+                postings = postings.filter(auction_item_id__in=list(scores))
+
+            best = {}
+            for item_id, term_id, in_title in postings.values_list(
+                "auction_item_id", "term_id", "in_title"
+            ):
+                score = matches[term_id] * (SearchIndex.TITLE_WEIGHT if in_title else 1)
+                if score > best.get(item_id, 0):
+                    best[item_id] = score
+
+            if scores is None:
+                scores = best
+            else:
+                scores = {item_id: scores[item_id] + score for item_id, score in best.items()}
+            if not scores:
+                return []
+
+        return sorted(scores, key=lambda item_id: (-scores[item_id], -item_id))
+
+    @staticmethod
+    def match_terms(word):
+        """
+        Find indexed terms matching a single query word.
+
+        Args:
+            word: A lowercase query token
+
+        Returns:
+            dict: term id -> match quality
+        """
+        from ..models import SearchTerm, SearchTermTrigram
+
+        if len(word) == 1:
+            return dict.fromkeys(
+                SearchTerm.objects.filter(term=word).values_list("id", flat=True),
+                SearchIndex.EXACT_MATCH,
+            )
+        if len(word) <= SearchIndex.SHORT_WORD_LENGTH:
+            # Terms starting with the word have its leading trigram (and,
+            # for three letters, the word itself as a trigram)
+            grams = {f" {word[:2]}", word} if len(word) == 3 else {f" {word}"}
+            candidates = (
+                SearchTermTrigram.objects.filter(trigram__in=grams)
+                .values("term_id")
+                .annotate(shared=Count("id"))
+                .filter(shared=len(grams))
+                .values_list("term_id", "term__term")
+            )
+            return {
+                term_id: SearchIndex.EXACT_MATCH if term == word else SearchIndex.PARTIAL_MATCH
+                for term_id, term in candidates
+                if term.startswith(word)
+            }
+
+        # Each edit destroys at most three trigrams, so a term within
+        # `max_distance` edits shares at least this many with the word.
+        # When that bound reaches zero we still require one shared
+        # trigram, trading rare multi-edit matches for a usable shortlist.
+        max_distance = max(1, len(word) // 3)
+        grams = trigrams(word)
+        min_shared = max(1, len(grams) - 3 * max_distance)
+        candidates = (
+            SearchTermTrigram.objects.filter(trigram__in=grams)
+            .values("term_id")
+            .annotate(shared=Count("id"))
+            .filter(shared__gte=min_shared)
+            .values_list("term_id", "term__term")
+        )
+
+        candidates = list(candidates)
+        fuzzy = dict(batch_within_distance(word, [term for _, term in candidates], max_distance))
+
+        matches = {}
+        for term_id, term in candidates:
+            if term == word:
+                matches[term_id] = SearchIndex.EXACT_MATCH
+            elif word in term:
+                matches[term_id] = SearchIndex.PARTIAL_MATCH
+            elif term in fuzzy:
+                matches[term_id] = SearchIndex.FUZZY_MATCH
+        return matches
+
+    @staticmethod
+    def _ensure_terms(words):
+        """Return {word: term id}, creating missing terms and their trigrams."""
+        from ..models import SearchTerm, SearchTermTrigram
+
+        term_ids = dict(SearchTerm.objects.filter(term__in=words).values_list("term", "id"))
+        missing = set(words) - term_ids.keys()
+        if missing:
+            SearchTerm.objects.bulk_create(
+                [SearchTerm(term=word, length=len(word)) for word in missing],
+                ignore_conflicts=True,
+            )
+            created = dict(SearchTerm.objects.filter(term__in=missing).values_list("term", "id"))
+            SearchTermTrigram.objects.bulk_create(
+                [
+                    SearchTermTrigram(trigram=gram, term_id=term_id)
+                    for word, term_id in created.items()
+                    for gram in trigrams(word)
+                ],
+                ignore_conflicts=True,
+            )
+            term_ids.update(created)
+        return term_ids
@@ -1,3 +1,792 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from .models import AuctionItem, Bid, Category, EscrowHold, Lease, OutboxEvent, ProxyBid, Transaction
+from .pagination import AuctionKeysetPagination
+from .scheduler import (
+    AUCTIONS_CLOSED,
+    CLOSE_LAG,
+    HOLDS_RELEASED,
+    LAST_SUCCESSFUL_RUN,
+    NOTIFICATIONS_QUEUED,
+    close_expired_auctions,
+)
+from .services import (
+    BidConflict,
+    BidProcessor,
+    BidRateLimiter,
+    BidSequencer,
+    BidValidator,
+    DeadlineQueue,
+    Escrow,
+    InsufficientFunds,
+    LeaderLease,
+)
+
+
+def create_auction(owner, category, **kwargs):
+    defaults = {
+        "title": "Vintage camera",
+        "description": "A working film camera",
+        "starting_bid": Decimal("100.00"),
+        "end_time": timezone.now() + timedelta(days=1),
+        "condition": "Used",
+        "location": "Sofia",
+    }
+    defaults.update(kwargs)
+    return AuctionItem.objects.create(owner=owner, category=category, **defaults)
+
+
+def fund(user, amount):
+    user.account.balance = Decimal(amount)
+    user.account.save()
+
+
+def available(user):
+    return Escrow.available_balances([user.pk])[user.pk]
+
+
+class BidSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        fund(self.alice, "1000.00")
+        fund(self.bob, "1000.00")
+        self.auction = create_auction(self.owner, self.category, buy_now_price=Decimal("500.00"))
+        self.client = APIClient()
+
+    def place_bid(self, user, amount):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            f"/api/auction-items/{self.auction.pk}/bid/", {"amount": amount}, format="json"
+        )
+
+    def test_bids_maintain_top_bid_state(self):
+        self.assertEqual(self.place_bid(self.alice, "110.00").status_code, 201)
+        self.assertEqual(self.place_bid(self.bob, "120.00").status_code, 201)
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.top_bidder, self.bob)
+        self.assertEqual(self.auction.current_bid, Decimal("120.00"))
+        self.assertEqual(self.auction.bid_count, 2)
+        self.assertEqual(
+            self.auction.last_bid_at, Bid.objects.get(bidder=self.bob).timestamp
+        )
+
+        self.assertEqual(available(self.alice), Decimal("1000.00"))
+
+    def test_buy_now_makes_buyer_top_bidder_and_winner(self):
+        self.place_bid(self.alice, "110.00")
+        self.client.force_authenticate(self.bob)
+        response = self.client.post(f"/api/auction-items/{self.auction.pk}/buy_now/", format="json")
+        self.assertEqual(response.status_code, 200)
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.top_bidder, self.bob)
+        self.assertEqual(self.auction.winner, self.bob)
+        self.assertEqual(self.auction.status, "closed")
+        self.assertEqual(self.auction.bid_count, 1)
+
+    def test_backfill_bid_summary(self):
+        Bid.objects.create(auction_item=self.auction, bidder=self.alice, amount=Decimal("110.00"))
+        latest = Bid.objects.create(auction_item=self.auction, bidder=self.bob, amount=Decimal("130.00"))
+
+        call_command("backfill_bid_summary", stdout=StringIO())
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.top_bidder, self.bob)
+        self.assertEqual(self.auction.bid_count, 2)
+        self.assertEqual(self.auction.last_bid_at, latest.timestamp)
+
+
+class BidCommitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        fund(self.alice, "1000.00")
+        fund(self.bob, "1000.00")
+        self.auction = create_auction(owner, category)
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def bid_with_competitor(self, amount, competing_amount):
+        """Let bob commit a bid between alice's snapshot and her commit."""
+        original = BidValidator.validate_user_balance
+        calls = []
+
+        def interleave(*args, **kwargs):
+            if not calls:
+                snapshot = AuctionItem.objects.select_related("top_bidder").get(pk=self.auction.pk)
+                BidProcessor.commit_bid(snapshot, self.bob, Decimal(competing_amount))
+            calls.append(args)
+            return original(*args, **kwargs)
+
+        with mock.patch.object(BidValidator, "validate_user_balance", side_effect=interleave):
+            response = self.client.post(
+                f"/api/auction-items/{self.auction.pk}/bid/", {"amount": amount}, format="json"
+            )
+        return response, len(calls)
+
+    def test_conflicting_commit_is_retried_from_a_fresh_snapshot(self):
+        response, attempts = self.bid_with_competitor("150.00", "120.00")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(attempts, 2)
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.current_bid, Decimal("150.00"))
+        self.assertEqual(self.auction.top_bidder, self.alice)
+        self.assertEqual(self.auction.bid_count, 2)
+        self.assertEqual(available(self.alice), Decimal("850.00"))
+        self.assertEqual(available(self.bob), Decimal("1000.00"))
+
+    def test_retry_revalidates_the_amount(self):
+        response, _ = self.bid_with_competitor("110.00", "130.00")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Bid.objects.filter(bidder=self.alice).count(), 0)
+        self.assertEqual(available(self.alice), Decimal("1000.00"))
+
+    def test_conditional_debit_rejects_insufficient_funds(self):
+        snapshot = AuctionItem.objects.select_related("top_bidder").get(pk=self.auction.pk)
+        bid, error = BidProcessor.commit_bid(snapshot, self.alice, Decimal("5000.00"))
+        self.assertIsNone(bid)
+        self.assertEqual(error.status_code, 400)
+        self.assertFalse(Bid.objects.exists())
+
+
+class ProxyBidTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        fund(self.alice, "1000.00")
+        fund(self.bob, "1000.00")
+        self.auction = create_auction(owner, category)
+        self.client = APIClient()
+
+    def bid(self, user, **data):
+        self.client.force_authenticate(user)
+        return self.client.post(f"/api/auction-items/{self.auction.pk}/bid/", data, format="json")
+
+    def assert_balances(self, alice, bob):
+        self.assertEqual(available(self.alice), Decimal(alice))
+        self.assertEqual(available(self.bob), Decimal(bob))
+
+    def test_maximum_bids_the_minimum_and_defends_against_manual_bids(self):
+        response = self.bid(self.alice, max_amount="200.00")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["amount"], "102.00")
+
+        response = self.bid(self.bob, amount="150.00")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["current_bid"], "153.00")
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.top_bidder, self.alice)
+        self.assertEqual(self.auction.current_bid, Decimal("153.00"))
+        self.assertEqual(self.auction.bid_count, 3)
+        self.assertEqual(
+            list(self.auction.bids.values_list("bidder__username", "amount")),
+            [("alice", Decimal("153.00")), ("bob", Decimal("150.00")), ("alice", Decimal("102.00"))],
+        )
+        self.assert_balances("847.00", "1000.00")
+        self.assertTrue(
+            OutboxEvent.objects.filter(kind="notification", payload__user_id=self.bob.pk).exists()
+        )
+
+    def test_competing_maxima_resolve_in_one_commit(self):
+        self.bid(self.alice, max_amount="200.00")
+        with CaptureQueriesContext(connection) as captured:
+            response = self.bid(self.bob, max_amount="300.00")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["amount"], "204.00")
+        auction_writes = [
+            query for query in captured if query["sql"].startswith('UPDATE "auctions_auctionitem"')
+        ]
+        self.assertEqual(len(auction_writes), 1)
+
+        self.assertEqual(
+            list(self.auction.bids.values_list("bidder__username", "amount")[:2]),
+            [("bob", Decimal("204.00")), ("alice", Decimal("200.00"))],
+        )
+        self.assertFalse(ProxyBid.objects.get(bidder=self.alice).is_active)
+        self.assertTrue(ProxyBid.objects.get(bidder=self.bob).is_active)
+        self.assert_balances("1000.00", "796.00")
+
+    def test_maxima_are_capped_by_balance(self):
+        self.bid(self.alice, max_amount="500.00")
+        fund(self.alice, "180.00")  # Her 102.00 hold is part of this
+        response = self.bid(self.bob, max_amount="400.00")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["amount"], "183.60")
+
+    @override_settings(BID_RATE_LIMITS={"open": {"count": 2, "window": 30}})
+    def test_top_bidder_raising_their_maximum_invalidates_snapshots(self):
+        self.bid(self.alice, max_amount="200.00")
+        snapshot = AuctionItem.objects.select_related("top_bidder").get(pk=self.auction.pk)
+
+        response = self.bid(self.alice, max_amount="250.00")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ProxyBid.objects.get(bidder=self.alice).max_amount, Decimal("250.00"))
+        self.assertEqual(Bid.objects.count(), 1)
+
+        # A bid validated before the raise must not commit against it
+        with self.assertRaises(BidConflict):
+            BidProcessor.commit_bid(snapshot, self.bob, Decimal("210.00"))
+
+
+class BidSequencerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        fund(self.alice, "1000.00")
+        fund(self.bob, "1000.00")
+        self.auction = create_auction(owner, category)
+
+    def test_batch_is_validated_in_order_against_in_memory_state(self):
+        results = BidSequencer.process_batch(
+            self.auction.pk,
+            [
+                (self.alice, "110.00", None),
+                (self.bob, "110.00", None),
+                (self.bob, "130.00", None),
+                (self.alice, "2000.00", None),
+            ],
+        )
+        self.assertEqual(
+            [error.status_code if error else 201 for _, error in results], [201, 400, 201, 400]
+        )
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.current_bid, Decimal("130.00"))
+        self.assertEqual(self.auction.top_bidder, self.bob)
+        self.assertEqual(self.auction.bid_count, 2)
+        self.assertEqual(available(self.alice), Decimal("1000.00"))
+        self.assertEqual(available(self.bob), Decimal("870.00"))
+
+    def test_batch_is_rerun_when_the_auction_changes_underneath(self):
+        original = BidProcessor.commit_bid
+        calls = []
+
+        def conflict_once(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                AuctionItem.objects.filter(pk=self.auction.pk).update(current_bid=Decimal("115.00"))
+            return original(*args, **kwargs)
+
+        with mock.patch.object(BidProcessor, "commit_bid", side_effect=conflict_once):
+            results = BidSequencer.process_batch(self.auction.pk, [(self.alice, "120.00", None)])
+
+        self.assertEqual(len(calls), 2)
+        self.assertIsNotNone(results[0][0])
+        self.assertEqual(Bid.objects.count(), 1)
+
+    @override_settings(BID_SEQUENCER={"enabled": True, "workers": 2})
+    def test_bid_endpoint_waits_for_the_writer(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        bid = Bid(pk=1, auction_item=self.auction, bidder=self.alice, amount=Decimal("110.00"))
+
+        with mock.patch.object(BidSequencer, "process_batch", return_value=[(bid, None)]) as process:
+            response = self.client.post(
+                f"/api/auction-items/{self.auction.pk}/bid/", {"amount": "110.00"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        process.assert_called_once_with(self.auction.pk, [(self.alice, "110.00", None)])
+
+
+class EscrowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        fund(self.alice, "1000.00")
+        fund(self.bob, "1000.00")
+        self.auction = create_auction(self.owner, self.category)
+        self.client = APIClient()
+
+    def bid(self, user, amount, auction=None):
+        self.client.force_authenticate(user)
+        auction = auction or self.auction
+        return self.client.post(f"/api/auction-items/{auction.pk}/bid/", {"amount": amount}, format="json")
+
+    def test_outbidding_moves_holds_without_writing_accounts(self):
+        self.bid(self.alice, "110.00")
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.bid(self.bob, "120.00").status_code, 201)
+        self.assertFalse(
+            [query for query in captured if query["sql"].startswith('UPDATE "auctions_useraccount"')]
+        )
+
+        self.alice.account.refresh_from_db()
+        self.assertEqual(self.alice.account.balance, Decimal("1000.00"))
+        self.assertEqual(
+            set(EscrowHold.objects.values_list("user__username", "amount", "status")),
+            {("alice", Decimal("110.00"), "released"), ("bob", Decimal("120.00"), "active")},
+        )
+        self.assertEqual(
+            list(Transaction.objects.order_by("id").values_list("user__username", "transaction_type", "amount")),
+            [
+                ("alice", "bid_lock", Decimal("110.00")),
+                ("bob", "bid_lock", Decimal("120.00")),
+                ("alice", "bid_release", Decimal("110.00")),
+            ],
+        )
+
+    def test_holds_on_other_auctions_are_not_spendable(self):
+        fund(self.alice, "150.00")
+        other = create_auction(self.owner, self.category, title="Tripod")
+        self.assertEqual(self.bid(self.alice, "110.00").status_code, 201)
+        self.assertEqual(self.bid(self.alice, "110.00", auction=other).status_code, 400)
+
+        self.client.force_authenticate(self.alice)
+        response = self.client.get("/api/user-balance/")
+        self.assertEqual(response.data["balance"], "40.00")
+
+    def test_second_hold_beyond_the_balance_is_rejected(self):
+        other = create_auction(self.owner, self.category, title="Tripod")
+        with transaction.atomic():
+            Escrow.move(self.auction, self.alice, Decimal("700.00"))
+        with CaptureQueriesContext(connection) as captured:
+            with self.assertRaises(InsufficientFunds), transaction.atomic():
+                Escrow.move(other, self.alice, Decimal("700.00"))
+        # The holds are summed apart from the account lock, so on
+        # PostgreSQL the sum sees holds committed while we waited for it
+        self.assertFalse(
+            [
+                query
+                for query in captured
+                if '"auctions_useraccount"' in query["sql"] and '"auctions_escrowhold"' in query["sql"]
+            ]
+        )
+        self.assertEqual(
+            list(EscrowHold.objects.values_list("auction_item", "amount")),
+            [(self.auction.pk, Decimal("700.00"))],
+        )
+        self.assertEqual(available(self.alice), Decimal("300.00"))
+
+    def test_closing_captures_the_winners_hold(self):
+        self.bid(self.alice, "110.00")
+        self.bid(self.bob, "120.00")
+        AuctionItem.objects.filter(pk=self.auction.pk).update(
+            end_time=timezone.now() - timedelta(seconds=1)
+        )
+        close_expired_auctions()
+
+        self.alice.account.refresh_from_db()
+        self.bob.account.refresh_from_db()
+        self.assertEqual(self.alice.account.balance, Decimal("1000.00"))
+        self.assertEqual(self.bob.account.balance, Decimal("880.00"))
+        self.assertEqual(EscrowHold.objects.get(user=self.bob).status, "captured")
+        self.assertEqual(available(self.bob), Decimal("880.00"))
+
+
+class DeadlineQueueTests(TestCase):
+    def setUp(self):
+        DeadlineQueue._heap = []
+        DeadlineQueue._deadlines = {}
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+
+    def test_due_deadlines_pop_in_order_and_moved_ones_are_skipped(self):
+        now = timezone.now()
+        DeadlineQueue.push(1, now - timedelta(seconds=2))
+        DeadlineQueue.push(2, now - timedelta(seconds=3))
+        DeadlineQueue.push(3, now - timedelta(seconds=1))
+        DeadlineQueue.push(1, now + timedelta(seconds=60))  # extended
+        DeadlineQueue.push(4, now + timedelta(days=1))  # beyond the horizon
+
+        self.assertEqual(DeadlineQueue.pop_due(), [2, 3])
+        self.assertEqual(DeadlineQueue._deadlines, {1: now + timedelta(seconds=60)})
+
+    def test_reload_reads_only_upcoming_deadlines(self):
+        now = timezone.now()
+        overdue = create_auction(self.owner, self.category, end_time=now - timedelta(seconds=5))
+        soon = create_auction(self.owner, self.category, end_time=now + timedelta(minutes=5))
+        create_auction(self.owner, self.category, end_time=now + timedelta(days=1))
+        create_auction(
+            self.owner, self.category, end_time=now - timedelta(days=1), status="closed"
+        )
+
+        self.assertEqual(DeadlineQueue.reload(), 2)
+        self.assertEqual(DeadlineQueue.pop_due(), [overdue.pk])
+        self.assertEqual(list(DeadlineQueue._deadlines), [soon.pk])
+
+    def test_close_due_settles_and_requeues_extended_auctions(self):
+        now = timezone.now()
+        due = create_auction(self.owner, self.category, end_time=now - timedelta(seconds=1))
+        extended = create_auction(self.owner, self.category, end_time=now + timedelta(seconds=60))
+        DeadlineQueue.push(due.pk, due.end_time)
+        # Queued before another process extended it
+        DeadlineQueue.push(extended.pk, now - timedelta(seconds=2))
+
+        self.assertEqual(DeadlineQueue.close_due(), [due.pk])
+        self.assertEqual(
+            dict(AuctionItem.objects.values_list("pk", "status")),
+            {due.pk: "closed", extended.pk: "active"},
+        )
+        self.assertEqual(DeadlineQueue._deadlines, {extended.pk: extended.end_time})
+
+    def test_only_the_lease_holder_closes_without_skip_locked(self):
+        DeadlineQueue._closing = False
+        due = create_auction(self.owner, self.category, end_time=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(LeaderLease.acquire(DeadlineQueue.LEASE, holder="other-process"))
+
+        with mock.patch("auctions.scheduler.parallel_closing", return_value=False):
+            DeadlineQueue.tick()
+            self.assertFalse(DeadlineQueue._closing)
+            self.assertEqual(AuctionItem.objects.get(pk=due.pk).status, "active")
+
+            # The holder died: its lease runs out and this process takes over
+            Lease.objects.update(expires_at=timezone.now())
+            DeadlineQueue.tick()
+        self.assertTrue(DeadlineQueue._closing)
+        self.assertEqual(AuctionItem.objects.get(pk=due.pk).status, "closed")
+        self.assertEqual(Lease.objects.get().holder, LeaderLease.holder())
+
+    def test_stop_ends_the_closer_thread(self):
+        DeadlineQueue._closing = False
+        ticked = threading.Event()
+        with mock.patch.object(DeadlineQueue, "tick", side_effect=ticked.set) as tick:
+            DeadlineQueue.start()
+            self.assertTrue(ticked.wait(5))
+            # Woken from its wait, not left sleeping until the next renewal
+            DeadlineQueue.stop(timeout=5)
+        self.assertFalse(DeadlineQueue.is_running())
+        self.assertEqual(tick.call_count, 1)
+
+
+class LeaderLeaseTests(TestCase):
+    def test_lease_is_exclusive_until_it_expires(self):
+        self.assertTrue(LeaderLease.acquire("job", holder="a"))
+        self.assertTrue(LeaderLease.acquire("job", holder="a"))  # renewal
+        self.assertFalse(LeaderLease.acquire("job", holder="b"))
+
+        Lease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(LeaderLease.acquire("job", holder="b"))
+        self.assertFalse(LeaderLease.acquire("job", holder="a"))
+
+        LeaderLease.release("job", holder="a")  # not a's to release
+        self.assertFalse(LeaderLease.acquire("job", holder="a"))
+        LeaderLease.release("job", holder="b")
+        self.assertTrue(LeaderLease.acquire("job", holder="a"))
+
+    def test_forked_worker_holds_its_own_lease(self):
+        # Workers forked after import (gunicorn --preload) must not share
+        # the parent's holder id
+        with mock.patch("os.getpid", return_value=1001):
+            self.assertTrue(LeaderLease.acquire("job"))
+        with mock.patch("os.getpid", return_value=1002):
+            self.assertFalse(LeaderLease.acquire("job"))
+            LeaderLease.release("job")
+        self.assertTrue(Lease.objects.filter(name="job").exists())
+
+
+class SettlementTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.bidders = [
+            User.objects.create_user(username=f"bidder{i}", password="pass") for i in range(3)
+        ]
+        for bidder in self.bidders:
+            fund(bidder, "1000.00")
+
+    def sold_auction(self, *bids):
+        """An expired auction with (bidder, amount) bids, as the bid path leaves it."""
+        auction = create_auction(
+            self.owner, self.category, end_time=timezone.now() - timedelta(seconds=1)
+        )
+        Bid.objects.bulk_create(
+            [Bid(auction_item=auction, bidder=bidder, amount=Decimal(amount)) for bidder, amount in bids]
+        )
+        top_bidder, top_amount = bids[-1]
+        EscrowHold.objects.create(user=top_bidder, auction_item=auction, amount=Decimal(top_amount))
+        AuctionItem.objects.filter(pk=auction.pk).update(
+            top_bidder=top_bidder, current_bid=Decimal(top_amount), bid_count=len(bids)
+        )
+        return auction
+
+    def test_winner_pays_and_each_loser_is_notified_once(self):
+        alice, bob, carol = self.bidders
+        auction = self.sold_auction((alice, "110.00"), (bob, "120.00"), (alice, "130.00"), (carol, "140.00"))
+        self.assertEqual(close_expired_auctions(), 1)
+
+        auction.refresh_from_db()
+        self.assertEqual(auction.winner, carol)
+        self.assertEqual(available(carol), Decimal("860.00"))
+        self.assertEqual(available(alice), Decimal("1000.00"))
+        self.assertEqual(EscrowHold.objects.get(user=carol).status, "captured")
+        lost = OutboxEvent.objects.filter(
+            kind="notification", payload__title="Auction Ended", payload__user_id__in=[alice.pk, bob.pk]
+        )
+        self.assertEqual(
+            sorted(event.payload["user_id"] for event in lost), sorted([alice.pk, bob.pk])
+        )
+
+    def test_settlement_costs_a_constant_number_of_queries(self):
+        alice, bob, carol = self.bidders
+
+        def close(count):
+            for _ in range(count):
+                self.sold_auction((alice, "110.00"), (bob, "120.00"), (carol, "130.00"))
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(close_expired_auctions(), count)
+            return len(captured)
+
+        self.assertEqual(close(2), close(8))
+
+    def test_closing_is_measured_and_scraped(self):
+        alice, bob, _ = self.bidders
+        auction = self.sold_auction((alice, "110.00"), (bob, "120.00"))
+        # A hold left on a losing bid is refunded at close
+        EscrowHold.objects.create(user=alice, auction_item=auction, amount=Decimal("110.00"))
+        metrics = (AUCTIONS_CLOSED, HOLDS_RELEASED, NOTIFICATIONS_QUEUED)
+        before = [metric.value for metric in metrics]
+        lags = CLOSE_LAG.count
+
+        close_expired_auctions()
+        # Winner, owner and the one loser are notified
+        self.assertEqual([metric.value - value for metric, value in zip(metrics, before)], [1, 1, 3])
+        self.assertEqual(CLOSE_LAG.count, lags + 1)
+        self.assertAlmostEqual(LAST_SUCCESSFUL_RUN.value, time.time(), delta=5)
+
+        client = APIClient()
+        self.assertEqual(client.get("/api/metrics/").status_code, 401)
+        with override_settings(METRICS_TOKEN="scrape-token"):
+            self.assertEqual(
+                client.get("/api/metrics/", HTTP_X_METRICS_TOKEN="wrong").status_code, 401
+            )
+            response = client.get("/api/metrics/", HTTP_X_METRICS_TOKEN="scrape-token")
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("# TYPE auction_close_lag_seconds histogram", body)
+        self.assertIn(f'auction_close_lag_seconds_bucket{{le="+Inf"}} {CLOSE_LAG.count}', body)
+        self.assertIn(f"auctions_closed_total {AUCTIONS_CLOSED.value}", body)
+
+
+@override_settings(
+    BID_RATE_LIMITS={"open": {"count": 2, "window": 60}, "closing": {"count": 1, "window": 60}}
+)
+class BidRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        fund(self.alice, "1000.00")
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def attempt(self, auction, amount):
+        return self.client.post(f"/api/auction-items/{auction.pk}/bid/", {"amount": amount}, format="json")
+
+    def test_rejected_attempts_never_reach_the_bid_tables(self):
+        auction = create_auction(self.owner, self.category)
+        self.assertEqual(self.attempt(auction, "110.00").status_code, 201)
+        self.assertEqual(self.attempt(auction, "abc").status_code, 400)  # not counted
+        self.assertEqual(self.attempt(auction, "120.00").status_code, 201)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.attempt(auction, "130.00")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("wait", response.data["detail"])
+        # Only the auction snapshot is read
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(BidRateLimiter.stats(), {"rejected": {"open": 1, "closing": 0}})
+
+    def test_closing_phase_is_stricter(self):
+        auction = create_auction(
+            self.owner, self.category, end_time=timezone.now() + timedelta(seconds=60)
+        )
+        self.assertEqual(self.attempt(auction, "110.00").status_code, 201)
+        self.assertEqual(self.attempt(auction, "130.00").status_code, 400)
+        self.assertEqual(BidRateLimiter.stats()["rejected"]["closing"], 1)
+
+
+class AuctionListPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        owner = User.objects.create_user(username="seller", password="pass")
+        now = timezone.now()
+        self.items = [
+            create_auction(
+                owner,
+                category,
+                title=f"Camera {i}",
+                starting_bid=Decimal(100 + (i % 3)),
+                current_bid=None if i % 2 else Decimal(200 + (i % 4)),
+                end_time=now + timedelta(hours=1 + (i % 3)),
+            )
+            for i in range(7)
+        ]
+        self.client = APIClient()
+
+    def walk(self, sort_by):
+        ids = []
+        url = f"/api/auction-items/?sort_by={sort_by}&page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_cursor_walk_matches_full_ordering_for_every_sort(self):
+        expected = {
+            "newest": sorted(self.items, key=lambda a: (a.created_at, a.id), reverse=True),
+            "ending_soon": sorted(self.items, key=lambda a: (a.end_time, a.id)),
+            "highest_bid": sorted(
+                self.items,
+                key=lambda a: (a.current_bid is not None, a.current_bid or 0, a.id),
+                reverse=True,
+            ),
+            "lowest_price": sorted(self.items, key=lambda a: (a.starting_bid, a.id)),
+        }
+        for sort_by, ordered in expected.items():
+            with self.subTest(sort_by=sort_by):
+                self.assertEqual(self.walk(sort_by), [a.id for a in ordered])
+
+    def test_every_sort_reads_its_index_in_order(self):
+        for sort_by in AuctionKeysetPagination.SORT_ORDERINGS:
+            with self.subTest(sort_by=sort_by):
+                plan = (
+                    AuctionItem.objects.filter(status="active")
+                    .order_by(*AuctionKeysetPagination.get_ordering(sort_by))[:25]
+                    .explain()
+                )
+                self.assertIn("USING INDEX", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        first = self.client.get("/api/auction-items/?sort_by=newest&page_size=2")
+        cursor = parse_qs(urlparse(first.data["next"]).query)["cursor"][0]
+        response = self.client.get(f"/api/auction-items/?sort_by=ending_soon&cursor={cursor}")
+        self.assertEqual(response.status_code, 404)
+
+
+class AuctionRepresentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.auction = create_auction(self.owner, category)
+        self.client = APIClient()
+
+    def test_list_returns_compact_cards(self):
+        card = self.client.get("/api/auction-items/").data["results"][0]
+        self.assertEqual(card["owner"], {"id": self.owner.id, "username": "seller"})
+        self.assertNotIn("bids", card)
+        self.assertNotIn("description", card)
+        self.assertIn("top_bid", card)
+
+    def test_card_carries_what_listing_screens_render(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+        def photo(name):
+            content = BytesIO()
+            Image.new("RGB", (1, 1)).save(content, "PNG")
+            return SimpleUploadedFile(name, content.getvalue(), content_type="image/png")
+
+        self.client.force_authenticate(self.owner)
+        with self.settings(MEDIA_ROOT=media_root):
+            response = self.client.post(
+                "/api/auction-items/",
+                {
+                    "title": "Rangefinder",
+                    "description": "x" * 400,
+                    "starting_bid": "100.00",
+                    "end_time": (timezone.now() + timedelta(days=1)).isoformat(),
+                    "category": self.auction.category_id,
+                    "condition": "Used",
+                    "location": "Sofia",
+                    "images": [photo("front.png"), photo("back.png")],
+                },
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 201, response.data)
+
+        card = self.client.get("/api/auction-items/").data["results"][0]
+        self.assertEqual(card["id"], response.data["id"])
+        self.assertRegex(card["image"], r"^http://testserver/media/auction_images/front")
+        self.assertEqual(card["summary"], "x" * 150)
+        self.assertNotIn("images", card)
+
+    def test_fields_and_expand(self):
+        card = self.client.get("/api/auction-items/?fields=id,title,owner&expand=owner").data["results"][0]
+        self.assertEqual(set(card), {"id", "title", "owner"})
+        self.assertIn("bids", card["owner"])
+
+    def test_detail_keeps_full_representation(self):
+        detail = self.client.get(f"/api/auction-items/{self.auction.pk}/").data
+        self.assertIn("bids", detail["owner"])
+        self.assertIn("description", detail)
+        self.assertEqual(detail["status"], "active")
+
+        sparse = self.client.get(f"/api/auction-items/{self.auction.pk}/?fields=id,status").data
+        self.assertEqual(sparse, {"id": self.auction.pk, "status": "active"})
+
+
+class MarketplaceBenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def seed(self, **options):
+        call_command(
+            "seed_marketplace", users=8, auctions=12, chats=5, notifications=5,
+            skip_index=True, stdout=StringIO(), **options
+        )
+
+    def test_seed_is_deterministic(self):
+        self.seed(seed=7)
+        first = list(AuctionItem.objects.order_by("pk").values_list("title", "current_bid", "bid_count"))
+        self.seed(seed=7, clear=True)
+        second = list(AuctionItem.objects.order_by("pk").values_list("title", "current_bid", "bid_count"))
+        self.assertEqual(first, second)
+        self.assertEqual(User.objects.filter(username__startswith="seed").count(), 8)
+        self.assertEqual(
+            sum(bid_count for _, _, bid_count in first),
+            Bid.objects.count(),
+        )
+
+    def test_loadtest_reports_every_scenario(self):
+        self.seed()
+        out = StringIO()
+        call_command("loadtest", requests=2, stdout=out)
+        report = out.getvalue()
+        for scenario in ("list", "search", "detail", "bid", "buy_now", "ws_balance", "ws_chat"):
+            self.assertIn(scenario, report)
+        self.assertIn("p99 ms", report)
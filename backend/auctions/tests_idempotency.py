@@ -0,0 +1,85 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Bid, Category, IdempotencyKey, Transaction
+from .services import Idempotency
+from .tests import create_auction, fund
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        fund(self.alice, "1000.00")
+        self.auction = create_auction(owner, Category.objects.create(name="Cameras"))
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def bid(self, amount, key="retry-1"):
+        return self.client.post(
+            f"/api/auction-items/{self.auction.pk}/bid/",
+            {"amount": amount},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retried_bid_is_answered_from_the_stored_response(self):
+        first = self.bid("110.00")
+        self.assertEqual(first.status_code, 201)
+
+        with CaptureQueriesContext(connection) as captured:
+            replay = self.bid("110.00")
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(Bid.objects.count(), 1)
+        touched = [
+            query["sql"] for query in captured
+            if "auctions_auctionitem" in query["sql"] or "auctions_useraccount" in query["sql"]
+        ]
+        self.assertEqual(touched, [])
+
+    @override_settings(BID_RATE_LIMITS={"open": {"count": 2, "window": 30}})
+    def test_key_reused_for_a_different_request_is_rejected(self):
+        self.bid("110.00")
+        self.assertEqual(self.bid("120.00").status_code, 422)
+        self.assertEqual(self.bid("120.00", key="retry-2").status_code, 201)
+
+    def test_concurrent_and_abandoned_requests(self):
+        record = IdempotencyKey.objects.create(
+            user=self.alice,
+            scope="bid",
+            key="in-flight",
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        self.assertEqual(self.bid("120.00", key="in-flight").status_code, 409)
+
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            created_at=timezone.now() - Idempotency.IN_PROGRESS_TIMEOUT - timedelta(seconds=1)
+        )
+        self.assertEqual(self.bid("120.00", key="in-flight").status_code, 201)
+
+    @mock.patch("stripe.Webhook.construct_event")
+    def test_replayed_stripe_event_is_credited_once(self, construct_event):
+        construct_event.return_value = {
+            "id": "evt_1",
+            "type": "payment_intent.succeeded",
+            "data": {"object": {"metadata": {"user_id": self.alice.id, "deposit_amount": "50.00"}}},
+        }
+        for _ in range(2):
+            response = self.client.post("/api/stripe-webhook/", b"{}", content_type="application/json")
+            self.assertEqual(response.status_code, 200)
+
+        self.alice.account.refresh_from_db()
+        self.assertEqual(self.alice.account.balance, Decimal("1050.00"))
+        self.assertEqual(Transaction.objects.filter(transaction_type="deposit").count(), 1)
@@ -0,0 +1,168 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.asgi import application
+
+from .models import Bid, Category, Favorite, Notification
+from .routing import websocket_urlpatterns
+from .services import EndingSoonNotifier, OutboxDispatcher
+from .services.outbox import AuctionUpdateThrottle
+from .tests import create_auction, fund
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    AUCTION_LIVE_UPDATES_PER_SECOND=5,
+)
+class AuctionConsumerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        fund(self.alice, "1000.00")
+        self.auction = create_auction(self.owner, Category.objects.create(name="Cameras"))
+        AuctionUpdateThrottle._last_sent.clear()
+
+    async def connect(self):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f"/ws/auctions/{self.auction.pk}/"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        state = await communicator.receive_json_from()
+        self.assertEqual(state["type"], "auction_state")
+        return communicator
+
+    async def publish(self, bid_count, current_bid):
+        await get_channel_layer().group_send(
+            f"auction_{self.auction.pk}",
+            {
+                "type": "auction_update",
+                "auction_id": self.auction.pk,
+                "current_bid": current_bid,
+                "top_bidder": "alice",
+                "bid_count": bid_count,
+                "end_time": self.auction.end_time.isoformat(),
+                "status": "active",
+            },
+        )
+
+    async def test_bursts_are_coalesced_into_deltas(self):
+        communicator = await self.connect()
+        for bid_count in (1, 2, 3, 4):
+            await self.publish(bid_count, f"1{bid_count}0.00")
+        await self.publish(2, "120.00")  # stale, arrives late
+
+        # The first update may go out at once; the rest of the burst waits
+        # for the next slot and is sent as one delta of the latest state
+        frames = []
+        while not await communicator.receive_nothing(timeout=0.5):
+            frames.append(await communicator.receive_json_from())
+        self.assertLessEqual(len(frames), 2)
+        self.assertEqual(frames[-1]["current_bid"], "140.00")
+        self.assertEqual(frames[-1]["bid_count"], 4)
+        self.assertNotIn("end_time", frames[-1])
+        await communicator.disconnect()
+
+    async def test_bid_publishes_the_new_state(self):
+        communicator = await self.connect()
+
+        def bid():
+            client = APIClient()
+            client.force_authenticate(self.alice)
+            response = client.post(
+                f"/api/auction-items/{self.auction.pk}/bid/", {"amount": "110.00"}, format="json"
+            )
+            self.assertEqual(response.status_code, 201)
+            OutboxDispatcher.drain()
+
+        await sync_to_async(bid)()
+        update = await communicator.receive_json_from(timeout=1)
+        self.assertEqual(update["current_bid"], "110.00")
+        self.assertEqual(update["bid_count"], 1)
+        await communicator.disconnect()
+
+    async def test_unknown_auction_is_rejected(self):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/auctions/999/")
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class EndingSoonTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username="seller", password="pass")
+        self.alice, self.bob, self.carol = (
+            User.objects.create_user(username=name, password="pass") for name in ("alice", "bob", "carol")
+        )
+        category = Category.objects.create(name="Cameras")
+        now = timezone.now()
+        self.soon = create_auction(owner, category, end_time=now + timedelta(minutes=10))
+        self.later = create_auction(owner, category, end_time=now + timedelta(hours=1))
+        closed = create_auction(owner, category, end_time=now + timedelta(minutes=5), status="closed")
+        Bid.objects.bulk_create(
+            [
+                Bid(auction_item=self.soon, bidder=self.alice, amount=Decimal("110.00")),
+                Bid(auction_item=self.soon, bidder=self.alice, amount=Decimal("120.00")),
+                Bid(auction_item=self.later, bidder=self.carol, amount=Decimal("110.00")),
+                Bid(auction_item=closed, bidder=self.carol, amount=Decimal("110.00")),
+            ]
+        )
+        Favorite.objects.bulk_create(
+            [
+                Favorite(user=self.alice, auction_item=self.soon),
+                Favorite(user=self.bob, auction_item=self.soon),
+            ]
+        )
+
+    def notified(self):
+        return sorted(
+            Notification.objects.filter(notification_type="ending_soon").values_list(
+                "auction_item_id", "user__username"
+            )
+        )
+
+    def test_each_window_is_swept_once(self):
+        window = timedelta(minutes=15)
+        self.assertEqual(EndingSoonNotifier.sweep(window), 2)
+        self.assertEqual(self.notified(), [(self.soon.pk, "alice"), (self.soon.pk, "bob")])
+        self.assertEqual(EndingSoonNotifier.sweep(window), 0)
+
+        # A wider window only reads the end times beyond the last one swept
+        with self.assertNumQueries(8):
+            self.assertEqual(EndingSoonNotifier.sweep(timedelta(hours=2)), 1)
+        self.assertEqual(
+            self.notified(),
+            [(self.soon.pk, "alice"), (self.soon.pk, "bob"), (self.later.pk, "carol")],
+        )
+
+    async def test_notifications_are_pushed_to_their_user(self):
+        # Through the deployed router, which authenticates the JWT
+        communicator = WebsocketCommunicator(
+            application, f"/ws/notifications/?token={AccessToken.for_user(self.bob)}"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        def sweep():
+            EndingSoonNotifier.sweep(timedelta(minutes=15))
+            OutboxDispatcher.drain()
+
+        await sync_to_async(sweep)()
+        pushed = await communicator.receive_json_from(timeout=1)
+        self.assertEqual(pushed["notification_type"], "ending_soon")
+        self.assertEqual(pushed["auction_item"], self.soon.pk)
+        self.assertTrue(await communicator.receive_nothing(timeout=0.2))
+        await communicator.disconnect()
@@ -0,0 +1,264 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import AuctionItem, Bid, Category, Notification, OutboxEvent
+from .scheduler import close_expired_auctions
+from .services import Outbox, OutboxDispatcher
+from .services.outbox import AuctionUpdateThrottle
+from .tests import create_auction, fund
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class OutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        fund(self.alice, "1000.00")
+        fund(self.bob, "1000.00")
+        self.auction = create_auction(self.owner, category)
+        self.client = APIClient()
+
+    def bid(self, user, amount):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            f"/api/auction-items/{self.auction.pk}/bid/", {"amount": amount}, format="json"
+        )
+
+    def test_bid_side_effects_are_delivered_after_commit(self):
+        self.bid(self.alice, "110.00")
+        self.assertEqual(Notification.objects.count(), 0)
+        # Owner notification, balance push, live auction update
+        self.assertEqual(OutboxEvent.objects.filter(dispatched_at__isnull=True).count(), 3)
+
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"user_balance_{self.alice.id}", channel)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bid(self.bob, "120.00")
+
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+        self.assertEqual(
+            sorted(Notification.objects.values_list("user__username", "notification_type")),
+            [("alice", "outbid"), ("seller", "bid"), ("seller", "bid")],
+        )
+        # Alice's two pending balance events collapse into one push of the
+        # balance read at dispatch time (after her refund)
+        message = async_to_sync(channel_layer.receive)(channel)
+        self.assertEqual(message, {"type": "balance_update", "balance": "1000.00"})
+
+    def test_failed_push_is_retried_and_does_not_undo_the_bid(self):
+        failing = mock.patch.object(
+            OutboxDispatcher, "_push", side_effect=lambda messages: [OSError("down")] * len(messages)
+        )
+        with failing, self.captureOnCommitCallbacks(execute=True):
+            response = self.bid(self.alice, "110.00")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Bid.objects.filter(bidder=self.alice).exists())
+
+        pending = OutboxEvent.objects.get(kind="balance")
+        self.assertIsNone(pending.dispatched_at)
+        self.assertEqual(pending.attempts, 1)
+        self.assertEqual(pending.last_error, "down")
+        # The notification in the same batch was still delivered
+        self.assertTrue(Notification.objects.filter(user=self.owner).exists())
+
+        # The balance push and the live auction update
+        self.assertEqual(OutboxDispatcher.drain(), 2)
+        pending.refresh_from_db()
+        self.assertIsNotNone(pending.dispatched_at)
+
+    def test_notification_for_a_deleted_user_does_not_block_the_outbox(self):
+        carol = User.objects.create_user(username="carol", password="pass")
+        carol_id = carol.pk
+        Outbox.enqueue([Outbox.notification(carol, "bid", "New bid", "Someone bid.", self.auction)])
+        self.bid(self.alice, "110.00")
+        carol.delete()
+
+        OutboxDispatcher.drain()
+        self.assertEqual(list(Notification.objects.values_list("user__username", flat=True)), ["seller"])
+        orphan = OutboxEvent.objects.get(kind="notification", payload__user_id=carol_id)
+        self.assertEqual(orphan.attempts, 1)
+        self.assertEqual(orphan.last_error, f"User {carol_id} no longer exists.")
+        self.assertEqual(
+            OutboxEvent.objects.filter(dispatched_at__isnull=True).exclude(pk=orphan.pk).count(), 0
+        )
+
+    def test_purge_deletes_only_events_dispatched_before_the_retention(self):
+        now = timezone.now()
+        old, recent, pending = OutboxEvent.objects.bulk_create(
+            [
+                OutboxEvent(kind="balance", dispatched_at=now - timedelta(days=3)),
+                OutboxEvent(kind="balance", dispatched_at=now - timedelta(hours=1)),
+                OutboxEvent(kind="balance"),
+            ]
+        )
+        with mock.patch.object(OutboxDispatcher, "PURGE_BATCH_SIZE", 1):
+            self.assertEqual(OutboxDispatcher.purge(timedelta(days=2)), 1)
+        self.assertEqual(
+            set(OutboxEvent.objects.values_list("pk", flat=True)), {recent.pk, pending.pk}
+        )
+
+    def extend_with_bidders(self, bidder_count):
+        """Place a late bid on an auction that already has `bidder_count` bidders."""
+        auction = create_auction(
+            self.owner, Category.objects.first(), end_time=timezone.now() + timedelta(seconds=60)
+        )
+        bidders = User.objects.bulk_create(
+            [User(username=f"late{auction.pk}_{i}") for i in range(bidder_count)]
+        )
+        Bid.objects.bulk_create(
+            [Bid(auction_item=auction, bidder=bidder, amount=Decimal(100 + i)) for i, bidder in enumerate(bidders)]
+        )
+        self.client.force_authenticate(self.alice)
+        with CaptureQueriesContext(connection) as bid_queries:
+            response = self.client.post(
+                f"/api/auction-items/{auction.pk}/bid/", {"amount": "500.00"}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        with CaptureQueriesContext(connection) as drain_queries:
+            OutboxDispatcher.drain()
+        extended = Notification.objects.filter(auction_item=auction, title__startswith="Auction extended")
+        self.assertEqual(extended.count(), bidder_count + 1)
+        return len(bid_queries), len(drain_queries)
+
+    def test_extension_fanout_costs_a_constant_number_of_queries(self):
+        few = self.extend_with_bidders(3)
+        many = self.extend_with_bidders(60)
+        self.assertEqual(few, many)
+
+    def test_extension_notifies_a_repeat_bidder_once(self):
+        auction = create_auction(
+            self.owner, Category.objects.first(), end_time=timezone.now() + timedelta(seconds=60)
+        )
+        Bid.objects.bulk_create(
+            [Bid(auction_item=auction, bidder=self.bob, amount=Decimal(amount)) for amount in (110, 120, 130)]
+        )
+        self.client.force_authenticate(self.alice)
+        response = self.client.post(
+            f"/api/auction-items/{auction.pk}/bid/", {"amount": "500.00"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        OutboxDispatcher.drain()
+        extended = Notification.objects.filter(auction_item=auction, title__startswith="Auction extended")
+        self.assertEqual(
+            sorted(extended.values_list("user__username", flat=True)), ["alice", "bob"]
+        )
+
+    @override_settings(AUCTION_LIVE_UPDATES_PER_SECOND=10)
+    def test_live_updates_are_throttled_per_auction_when_published(self):
+        AuctionUpdateThrottle._last_sent.clear()
+        sent = []
+
+        async def push(messages):
+            sent.extend(message["bid_count"] for _, message in messages)
+            return [None] * len(messages)
+
+        with mock.patch.object(OutboxDispatcher, "_push", side_effect=push):
+            for bid_count in range(1, 5):
+                Outbox.enqueue([Outbox.auction_update(self.auction, bid_count=bid_count)])
+                OutboxDispatcher.drain()
+            # The first goes out at once, the rest wait for the next slot
+            self.assertEqual(sent, [1])
+            self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+            time.sleep(0.3)
+        self.assertEqual(sent, [1, 4])
+
+    def test_closing_enqueues_notifications(self):
+        self.bid(self.alice, "110.00")
+        OutboxDispatcher.drain()
+        AuctionItem.objects.filter(pk=self.auction.pk).update(
+            end_time=timezone.now() - timedelta(seconds=1)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            close_expired_auctions()
+        self.assertEqual(
+            set(Notification.objects.filter(notification_type__in=["won", "ended"]).values_list(
+                "user__username", "notification_type"
+            )),
+            {("alice", "won"), ("seller", "ended")},
+        )
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class AsyncBiddingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        fund(self.alice, "1000.00")
+        self.auction = create_auction(self.owner, category, buy_now_price=Decimal("500.00"))
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.alice)}"}
+
+    async def test_bid_commits_and_awaits_its_pushes(self):
+        channel_layer = get_channel_layer()
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add(f"user_balance_{self.alice.id}", channel)
+
+        response = await self.async_client.post(
+            f"/api/auction-items/{self.auction.pk}/bid-async/",
+            {"amount": "110.00"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["amount"], "110.00")
+        # Delivered by the request itself, not by an on_commit drain
+        message = await channel_layer.receive(channel)
+        self.assertEqual(message, {"type": "balance_update", "balance": "890.00"})
+        pending = OutboxEvent.objects.filter(dispatched_at__isnull=True)
+        self.assertFalse(await sync_to_async(pending.exists)())
+
+    async def test_buy_now_and_errors_match_the_sync_endpoint(self):
+        url = f"/api/auction-items/{self.auction.pk}/buy-now-async/"
+        response = await self.async_client.post(url)
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.post(url, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "closed")
+
+        response = await self.async_client.post(
+            f"/api/auction-items/{self.auction.pk}/bid-async/",
+            {"amount": "120.00"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Bidding is closed for this item."})
+
+    async def test_replayed_bid_keeps_the_idempotency_header(self):
+        url = f"/api/auction-items/{self.auction.pk}/bid-async/"
+        headers = {**self.headers, "Idempotency-Key": "retry-1"}
+        first = await self.async_client.post(
+            url, {"amount": "110.00"}, content_type="application/json", headers=headers
+        )
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", first)
+
+        replay = await self.async_client.post(
+            url, {"amount": "110.00"}, content_type="application/json", headers=headers
+        )
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(replay["Content-Type"], "application/json")
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(await sync_to_async(Bid.objects.count)(), 1)
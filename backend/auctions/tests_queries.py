@@ -0,0 +1,205 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import AuctionImage, AuctionItem, Bid, Category, Favorite
+from .services import ListingCache, SearchIndex
+from .tests import create_auction
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def write_statements(captured):
+    return [q["sql"] for q in captured if q["sql"].lstrip().upper().startswith(WRITE_PREFIXES)]
+
+
+class SideEffectFreeReadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.bidder = User.objects.create_user(username="alice", password="pass")
+        self.live = create_auction(self.owner, category, title="Live")
+        # Past its end_time but not yet closed by the scheduler
+        self.expired = create_auction(self.owner, category, title="Expired")
+        AuctionItem.objects.filter(pk=self.expired.pk).update(
+            end_time=timezone.now() - timedelta(minutes=5),
+            current_bid=Decimal("120.00"),
+            top_bidder=self.bidder,
+        )
+        Bid.objects.create(auction_item=self.expired, bidder=self.bidder, amount=Decimal("120.00"))
+        self.client = APIClient()
+
+    def test_list_issues_no_writes(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/api/auction-items/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.data["results"]], [self.live.pk])
+        self.assertEqual(write_statements(captured), [])
+
+    def test_retrieve_reports_effective_status_without_closing(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(f"/api/auction-items/{self.expired.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "closed")
+        self.assertEqual(write_statements(captured), [])
+
+        self.expired.refresh_from_db()
+        self.assertEqual(self.expired.status, "active")
+        self.assertIsNone(self.expired.winner)
+
+
+class QueryBudgetTests(TestCase):
+    """Each endpoint must cost the same number of queries for 2 rows as for 6."""
+
+    # endpoint -> maximum number of queries
+    BUDGETS = {
+        "/api/auction-items/": 1,
+        "/api/auction-items/search/?q=camera": 3,
+        "/api/auction-items/my_bid_auctions/": 5,
+        "/api/auction-items/my_auctions/": 5,
+        "/api/my-purchases/": 1,
+        "/api/my-bids/": 5,
+        "/api/favorites/": 1,
+    }
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.bidder = User.objects.create_user(username="alice", password="pass")
+        self.client = APIClient()
+        self.add_items(2)
+
+    def add_items(self, count):
+        for _ in range(count):
+            item = create_auction(self.owner, self.category, title="Film camera")
+            SearchIndex.index_item(item)
+            AuctionImage.objects.create(auction_item=item, image="auction_images/camera.jpg")
+            bid = Bid.objects.create(auction_item=item, bidder=self.bidder, amount=Decimal("110.00"))
+            AuctionItem.objects.filter(pk=item.pk).update(
+                current_bid=bid.amount, top_bidder=self.bidder, bid_count=1, last_bid_at=bid.timestamp
+            )
+            Favorite.objects.create(user=self.bidder, auction_item=item)
+            closed = create_auction(
+                self.owner, self.category, title="Sold camera", status="closed", winner=self.bidder
+            )
+            Bid.objects.create(auction_item=closed, bidder=self.bidder, amount=Decimal("120.00"))
+
+    def count_queries(self, user, url):
+        cache.clear()
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(captured)
+
+    def test_endpoints_have_constant_query_budget(self):
+        users = {"/api/auction-items/my_auctions/": self.owner}
+        small = {url: self.count_queries(users.get(url, self.bidder), url) for url in self.BUDGETS}
+        self.add_items(4)
+        for url, budget in self.BUDGETS.items():
+            with self.subTest(url=url):
+                large = self.count_queries(users.get(url, self.bidder), url)
+                self.assertEqual(large, small[url])
+                self.assertLessEqual(large, budget)
+
+    def test_retrieve_budget_independent_of_bid_count(self):
+        item = AuctionItem.objects.filter(status="active").first()
+        url = f"/api/auction-items/{item.pk}/"
+        small = self.count_queries(self.bidder, url)
+        for i in range(5):
+            bidder = User.objects.create_user(username=f"bidder{i}", password="pass")
+            Bid.objects.create(auction_item=item, bidder=bidder, amount=Decimal(200 + i))
+        self.assertEqual(self.count_queries(self.bidder, url), small)
+        self.assertLessEqual(small, 4)
+
+
+class AuctionDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cameras")
+        owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        self.alice.account.balance = Decimal("1000.00")
+        self.alice.account.save()
+        self.auction = create_auction(owner, category)
+        self.url = f"/api/auction-items/{self.auction.pk}/"
+        self.client = APIClient()
+
+    def test_repeat_detail_reads_hit_the_cache(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(captured), 0)
+
+    def test_bid_invalidates_and_is_winning_is_per_viewer(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"{self.url}bid/", {"amount": "110.00"}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+        detail = self.client.get(self.url).data
+        self.assertEqual(detail["current_bid"], "110.00")
+        self.assertTrue(detail["is_winning"])
+
+        self.client.force_authenticate(self.bob)
+        self.assertFalse(self.client.get(self.url).data["is_winning"])
+
+
+class ListingCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.alice.account.balance = Decimal("1000.00")
+        self.alice.account.save()
+        self.auction = create_auction(self.owner, self.category)
+        self.client = APIClient()
+
+    def test_equivalent_filters_share_an_entry(self):
+        self.client.get("/api/auction-items/?min_price=50&condition=Used&sort_by=bogus")
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/api/auction-items/?condition=used&min_price=50.00")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(captured), 0)
+        self.assertEqual([item["id"] for item in response.data["results"]], [self.auction.pk])
+        self.assertEqual(ListingCache.stats()["hits"], 1)
+        self.assertEqual(ListingCache.stats()["misses"], 1)
+
+    def test_bid_bumps_generation(self):
+        self.client.get("/api/auction-items/")
+        self.client.force_authenticate(self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/auction-items/{self.auction.pk}/bid/", {"amount": "110.00"}, format="json"
+            )
+        self.client.force_authenticate(None)
+        card = self.client.get("/api/auction-items/").data["results"][0]
+        self.assertEqual(card["current_bid"], "110.00")
+        self.assertEqual(ListingCache.stats()["hits"], 0)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.client.force_authenticate(self.alice)
+        self.client.get("/api/auction-items/")
+        self.client.get("/api/auction-items/")
+        self.assertEqual(ListingCache.stats()["misses"], 0)
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.get("/api/listing-cache-stats/").status_code, 403)
+        staff = User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.force_authenticate(staff)
+        response = self.client.get("/api/listing-cache-stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {"hits", "misses", "hit_rate", "generation"})
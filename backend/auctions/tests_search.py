@@ -0,0 +1,98 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .models import Category, SearchPosting
+from .services import SearchIndex
+from .tests import create_auction
+from .utils.search import (
+    batch_within_distance,
+    bounded_levenshtein,
+    fuzzy_match,
+    levenshtein,
+    tokenize,
+    trigrams,
+)
+
+
+class SearchUtilsTests(TestCase):
+    def test_tokenize_lowercases_and_dedupes(self):
+        self.assertEqual(tokenize("Leica M6, leica body!"), ["leica", "m6", "body"])
+
+    def test_trigrams_are_padded(self):
+        self.assertEqual(trigrams("cat"), {" ca", "cat", "at "})
+
+    def test_bounded_levenshtein_agrees_with_full_matrix(self):
+        words = ["", "a", "camera", "camra", "cmaera", "kamera", "lens", "canon", "nikon", "cannon"]
+        for a in words:
+            for b in words:
+                for k in range(4):
+                    distance = levenshtein(a, b)
+                    with self.subTest(a=a, b=b, k=k):
+                        self.assertEqual(bounded_levenshtein(a, b, k), min(distance, k + 1))
+
+    def test_batch_within_distance(self):
+        self.assertEqual(
+            batch_within_distance("camera", ["camra", "lens", "camera", "kamerax"], 2),
+            [("camra", 1), ("camera", 0), ("kamerax", 2)],
+        )
+
+    def test_fuzzy_match(self):
+        self.assertTrue(fuzzy_match("Vintage Leica camera", "leika camra"))
+        self.assertFalse(fuzzy_match("Vintage Leica camera", "nikon"))
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Cameras")
+        self.owner = User.objects.create_user(username="seller", password="pass")
+        self.camera = self.create("Leica camera", "Rangefinder in good condition")
+        self.lens = self.create("Prime lens", "Fits any camera body")
+        self.bike = self.create("Road bike", "Carbon frame")
+        self.client = APIClient()
+
+    def create(self, title, description, **kwargs):
+        item = create_auction(self.owner, self.category, title=title, description=description, **kwargs)
+        SearchIndex.index_item(item)
+        return item
+
+    def search(self, query, **params):
+        params["q"] = query
+        response = self.client.get("/api/auction-items/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_typos_match_and_title_hits_rank_first(self):
+        self.assertEqual(self.search("camra"), [self.camera.id, self.lens.id])
+
+    def test_every_query_word_must_match(self):
+        self.assertEqual(self.search("camera frame"), [])
+        self.assertEqual(self.search("carbon bike"), [self.bike.id])
+
+    def test_partial_words_match(self):
+        self.assertEqual(self.search("range"), [self.camera.id])
+
+    def test_short_words_match_term_prefixes(self):
+        self.assertEqual(self.search("lei"), [self.camera.id])
+        self.assertEqual(self.search("ro"), [self.bike.id])
+        self.assertEqual(self.search("ame"), [])  # inside "camera", not a prefix
+        with self.assertNumQueries(1):
+            SearchIndex.match_terms("fr")
+
+    def test_closed_auctions_and_category_are_filtered(self):
+        self.create("Leica camera II", "Spare", status="closed")
+        self.assertEqual(self.search("leica"), [self.camera.id])
+        self.assertEqual(self.search("leica", category="bikes"), [])
+
+    def test_results_are_paginated(self):
+        response = self.client.get("/api/auction-items/search/", {"q": "camera", "page_size": 1})
+        self.assertEqual(response.data["count"], 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_reindex_on_update_replaces_postings(self):
+        self.bike.title = "Mountain bike"
+        self.bike.save()
+        SearchIndex.index_item(self.bike)
+        self.assertEqual(self.search("mountain"), [self.bike.id])
+        self.assertEqual(self.search("road"), [])
+        self.assertFalse(SearchPosting.objects.filter(auction_item=self.bike, term__term="road").exists())
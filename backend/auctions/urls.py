@@ -22,6 +22,13 @@ from .views import (
     FavoriteListCreateAPIView,
     FavoriteDeleteAPIView,
     DashboardStatsView,
+    ListingCacheStatsView,
+    BidRateLimitStatsView,
+    MetricsView,
+    
+    # --- Async function views (ASGI) ---
+    bid_async,
+    buy_now_async,
 )
 
 # 1. ROUTER SETUP
@@ -51,6 +58,13 @@ urlpatterns = [
         "favorites/<int:id>/", FavoriteDeleteAPIView.as_view(), name="favorite-delete"
     ),
     path("dashboard/", DashboardStatsView.as_view(), name="dashboard-stats"),
+    path("listing-cache-stats/", ListingCacheStatsView.as_view(), name="listing-cache-stats"),
+    path("bid-rate-limit-stats/", BidRateLimitStatsView.as_view(), name="bid-rate-limit-stats"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    
+    # Async bid / Buy Now (same behaviour as the viewset actions)
+    path("auction-items/<int:pk>/bid-async/", bid_async, name="auctionitem-bid-async"),
+    path("auction-items/<int:pk>/buy-now-async/", buy_now_async, name="auctionitem-buy-now-async"),
     
     # Stripe / Payment URLs
     path(
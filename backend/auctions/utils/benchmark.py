@@ -0,0 +1,136 @@
+# auctions/utils/benchmark.py
+
+import asyncio
+import math
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from django.db import connection
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (which need not be sorted)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyRecorder:
+    """Collects per-operation latencies and failures for one scenario."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: List[float] = []
+        self.errors = 0
+        self.wall = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float, ok: bool = True) -> None:
+        with self._lock:
+            self.samples.append(elapsed)
+            if not ok:
+                self.errors += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Latencies in milliseconds; throughput in operations per wall-clock second."""
+        count = len(self.samples)
+        return {
+            "scenario": self.name,
+            "count": count,
+            "errors": self.errors,
+            "p50_ms": percentile(self.samples, 50) * 1000,
+            "p95_ms": percentile(self.samples, 95) * 1000,
+            "p99_ms": percentile(self.samples, 99) * 1000,
+            "throughput": count / self.wall if self.wall else 0.0,
+        }
+
+
+def run_workload(
+    name: str, operations: Iterable[Callable[[], bool]], concurrency: int = 1
+) -> Dict[str, float]:
+    """
+    Time each operation (a callable returning a success flag) and return the
+    scenario summary. With concurrency > 1 the operations are drained by that
+    many threads, each with its own database connection.
+    """
+    recorder = LatencyRecorder(name)
+    pending = iter(operations)
+    lock = threading.Lock()
+
+    def drain():
+        while True:
+            with lock:
+                operation = next(pending, None)
+            if operation is None:
+                return
+            start = time.perf_counter()
+            try:
+                ok = bool(operation())
+            except Exception:
+                ok = False
+            recorder.record(time.perf_counter() - start, ok)
+
+    def worker():
+        try:
+            drain()
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        drain()
+    else:
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    recorder.wall = time.perf_counter() - start
+    return recorder.summary()
+
+
+async def run_async_workload(
+    name: str,
+    operations: Iterable[Callable[[], Awaitable[Optional[float]]]],
+    concurrency: int = 1,
+) -> Dict[str, float]:
+    """
+    Async counterpart of run_workload. Each operation times its own critical
+    section and returns the elapsed seconds, or None on failure, so that
+    setup such as opening a socket can stay out of the measurement.
+    """
+    recorder = LatencyRecorder(name)
+    pending = iter(operations)
+
+    async def worker():
+        for operation in pending:
+            start = time.perf_counter()
+            try:
+                elapsed = await operation()
+            except Exception:
+                elapsed = None
+            if elapsed is None:
+                recorder.record(time.perf_counter() - start, ok=False)
+            else:
+                recorder.record(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    recorder.wall = time.perf_counter() - start
+    return recorder.summary()
+
+
+def format_summaries(summaries: Iterable[Dict[str, float]]) -> List[str]:
+    """Render scenario summaries as fixed-width table lines."""
+    lines = [
+        f"{'scenario':<16}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}"
+    ]
+    for s in summaries:
+        lines.append(
+            f"{s['scenario']:<16}{s['count']:>8}{s['errors']:>8}"
+            f"{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{s['throughput']:>10.1f}"
+        )
+    return lines
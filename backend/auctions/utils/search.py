@@ -1,6 +1,35 @@
 # auctions/utils/search.py
 
-from typing import List
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+WORD_RE = re.compile(r"\w+")
+MAX_TOKEN_LENGTH = 50
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split `text` into lowercase word tokens, in order, without duplicates.
+    Tokens longer than MAX_TOKEN_LENGTH are dropped (they are not words).
+    """
+    seen = set()
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        if len(word) <= MAX_TOKEN_LENGTH and word not in seen:
+            seen.add(word)
+            tokens.append(word)
+    return tokens
+
+
+def trigrams(word: str) -> Set[str]:
+    """
+    Returns the character trigrams of `word`, padded with one space on each
+    side so that a word of length n has up to n trigrams and short words
+    still produce some.
+    """
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
 
 
 def levenshtein(a: str, b: str) -> int:
@@ -30,6 +59,102 @@ def levenshtein(a: str, b: str) -> int:
     return dp[-1]
 
 
+@lru_cache(maxsize=4096)
+def _pattern_bitmasks(pattern: str) -> Tuple[Dict[str, int], int]:
+    """
+    Precomputes, for each character of `pattern`, the bitmask of positions
+    where it occurs (the Peq table of Myers' algorithm), plus the full mask.
+    """
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    return peq, (1 << len(pattern)) - 1
+
+
+def _myers_bounded(pattern: str, peq: Dict[str, int], full: int, text: str, max_distance: int) -> int:
+    """
+    Bit-parallel edit distance (Myers/Hyyrö) between `pattern` and `text`.
+    A column can lower the score by at most one, so we stop as soon as the
+    remaining columns cannot bring it back within `max_distance`.
+    Returns the distance, or max_distance + 1 if it is exceeded.
+    """
+    m = len(pattern)
+    high_bit = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    remaining = len(text)
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high_bit:
+            score += 1
+        elif mh & high_bit:
+            score -= 1
+        remaining -= 1
+        if score - remaining > max_distance:
+            return max_distance + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score if score <= max_distance else max_distance + 1
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Returns the Levenshtein distance between `a` and `b` if it is at most
+    `max_distance`, otherwise `max_distance + 1`. Much cheaper than
+    `levenshtein` when only a threshold test is needed.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+    if not a or not b:
+        return max(len(a), len(b))
+    peq, full = _pattern_bitmasks(a)
+    return _myers_bounded(a, peq, full, b, max_distance)
+
+
+def within_distance(a: str, b: str, max_distance: int) -> bool:
+    """Returns True if `a` and `b` are at most `max_distance` edits apart."""
+    return bounded_levenshtein(a, b, max_distance) <= max_distance
+
+
+def batch_within_distance(query: str, candidates: Iterable[str], max_distance: int) -> List[Tuple[str, int]]:
+    """
+    Scores one query word against many candidate words, reusing the query's
+    bitmasks. Returns (candidate, distance) for candidates within the threshold.
+    """
+    if not query:
+        return [(c, len(c)) for c in candidates if len(c) <= max_distance]
+    peq, full = _pattern_bitmasks(query)
+    q_len = len(query)
+    matches = []
+    for candidate in candidates:
+        if abs(len(candidate) - q_len) > max_distance:
+            continue
+        if candidate == query:
+            matches.append((candidate, 0))
+            continue
+        if not candidate:
+            if q_len <= max_distance:
+                matches.append((candidate, q_len))
+            continue
+        distance = _myers_bounded(query, peq, full, candidate, max_distance)
+        if distance <= max_distance:
+            matches.append((candidate, distance))
+    return matches
+
+
+@lru_cache(maxsize=4096)
+def _candidate_words(candidate_lower: str) -> Tuple[str, ...]:
+    """Memoized whitespace tokenization of a lowercased candidate text."""
+    return tuple(dict.fromkeys(candidate_lower.split()))
+
+
 def fuzzy_match(candidate: str, query: str) -> bool:
     """
     Returns True if `candidate` string fuzzily matches `query`.
@@ -43,18 +168,12 @@ def fuzzy_match(candidate: str, query: str) -> bool:
     if query_lower in candidate_lower:
         return True
 
-    candidate_words: List[str] = candidate_lower.split()
+    candidate_words = _candidate_words(candidate_lower)
     query_words: List[str] = query_lower.split()
 
     for qw in query_words:
-        matched_this_query_word = False
-        for cw in candidate_words:
-            dist = levenshtein(cw, qw)
-            threshold = max(1, len(qw) // 3)
-            if dist <= threshold:
-                matched_this_query_word = True
-                break
-        if not matched_this_query_word:
+        threshold = max(1, len(qw) // 3)
+        if not batch_within_distance(qw, candidate_words, threshold):
             return False
 
     return True
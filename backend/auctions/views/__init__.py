@@ -1,6 +1,7 @@
 # Re-export views for backward-compatible imports from auctions.views
 
 from .auction_items import AuctionItemViewSet
+from .async_bidding import bid_async, buy_now_async
 from .bids import BidViewSet
 from .chat import ChatMessageViewSet
 from .notifications import NotificationViewSet
@@ -8,12 +9,20 @@ from .favorites import FavoriteListCreateAPIView, FavoriteDeleteAPIView
 from .purchases import MyPurchasesView
 from .users import UserViewSet, CurrentUserView, RegisterView
 from .payments import CreateDepositPaymentIntentView, StripeWebhookView
-from .stats import DashboardStatsView, CategoryListView
+from .stats import (
+    DashboardStatsView,
+    CategoryListView,
+    ListingCacheStatsView,
+    BidRateLimitStatsView,
+    MetricsView,
+)
 from .account import UserBalanceView
 from .user_bids import UserBidsView
 
 __all__ = [
     "AuctionItemViewSet",
+    "bid_async",
+    "buy_now_async",
     "BidViewSet",
     "UserBidsView",
     "ChatMessageViewSet",
@@ -28,5 +37,8 @@ __all__ = [
     "StripeWebhookView",
     "DashboardStatsView",
     "CategoryListView",
+    "ListingCacheStatsView",
+    "BidRateLimitStatsView",
+    "MetricsView",
     "UserBalanceView",
 ]
@@ -4,10 +4,12 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from ..services import Escrow
+
 
 class UserBalanceView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user_account = request.user.account
-        return Response({"balance": str(user_account.balance)}, status=200)
+        # Funds held for top bids are not spendable, so they are not shown
+        return Response({"balance": str(Escrow.available_balance(request.user))}, status=200)
@@ -0,0 +1,77 @@
+# auctions/views/async_bidding.py
+"""
+Async versions of the bid and Buy Now endpoints for ASGI deployments.
+Authentication and the database transaction run in a single thread hop;
+the outbox events the transaction wrote are then delivered on the event
+loop, so the request holds a thread only while it talks to the database.
+"""
+
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..services import OutboxDispatcher
+from .auction_items import bid_once, buy_now_once
+
+logger = logging.getLogger(__name__)
+
+
+def _handle(request, handler, *args):
+    """
+    Authenticate with the API's JWT scheme and run
+    `handler(request, *args, user)`.
+
+    Returns:
+        tuple: (data, status, headers)
+    """
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed as e:
+        return {"detail": e.detail}, 401, {}
+    if authenticated is None:
+        return {"detail": "Authentication credentials were not provided."}, 401, {}
+
+    response = handler(request, *args, authenticated[0])
+    # Keep headers such as Idempotent-Replayed; JsonResponse sets its own type
+    headers = {
+        name: value for name, value in response.items() if name.lower() != "content-type"
+    }
+    return response.data, response.status_code, headers
+
+
+async def _respond(request, handler, *args):
+    with OutboxDispatcher.deferred():
+        data, status, headers = await sync_to_async(_handle)(request, handler, *args)
+    if status < 300:
+        try:
+            await OutboxDispatcher.adrain()
+        except Exception:
+            # The events stay pending for the dispatcher
+            logger.exception("Outbox dispatch failed.")
+    return JsonResponse(data, status=status, headers=headers)
+
+
+@csrf_exempt
+@require_POST
+async def bid_async(request, pk):
+    """Async counterpart of AuctionItemViewSet.bid (see place_bid)."""
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"detail": "JSON parse error."}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"detail": "Expected a JSON object."}, status=400)
+    return await _respond(request, lambda request, user: bid_once(request, pk, user, data))
+
+
+@csrf_exempt
+@require_POST
+async def buy_now_async(request, pk):
+    """Async counterpart of AuctionItemViewSet.buy_now (see buy_now_item)."""
+    return await _respond(request, buy_now_once, pk)
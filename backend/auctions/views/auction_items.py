@@ -12,14 +12,40 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
-from ..models import AuctionItem, AuctionImage, Bid, Notification, UserAccount
-from ..serializers import AuctionItemSerializer, BidSerializer
+from ..models import AuctionItem, AuctionImage, Bid, Notification
+from ..serializers import AuctionItemSerializer, AuctionItemCardSerializer, BidSerializer
 from ..permissions import IsOwnerOrReadOnly
-from ..utils.search import fuzzy_match
-from ..services import BidValidator, BidProcessor, BidNotificationService
-
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from ..pagination import AuctionKeysetPagination, SearchResultsPagination
+from ..services import (
+    AuctionDetailCache,
+    BidConflict,
+    BidRateLimiter,
+    BidValidator,
+    BidProcessor,
+    BidSequencer,
+    DeadlineQueue,
+    Escrow,
+    Idempotency,
+    InsufficientFunds,
+    ListingCache,
+    Outbox,
+    SearchIndex,
+    invalidate_auction_caches,
+)
+
+
+def set_cover_image(auction_item, uploaded):
+    """
+    Listing cards show only the main image, so an auction without one
+    takes its first uploaded gallery image.
+
+    Args:
+        auction_item: The AuctionItem
+        uploaded: The AuctionImage rows just created for it
+    """
+    if uploaded and not auction_item.image:
+        auction_item.image = uploaded[0].image.name
+        AuctionItem.objects.filter(pk=auction_item.pk).update(image=auction_item.image.name)
 
 
 class AuctionItemViewSet(viewsets.ModelViewSet):
@@ -29,21 +55,19 @@ class AuctionItemViewSet(viewsets.ModelViewSet):
     serializer_class = AuctionItemSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    pagination_class = AuctionKeysetPagination
 
     def get_queryset(self):
-        current_time = timezone.now()
-
-        # 1) Auto-close ended auctions that are still "active"
-        ended_auctions = AuctionItem.objects.filter(status="active", end_time__lte=current_time)
-        for auction in ended_auctions:
-            highest_bid = auction.bids.order_by("-amount").first()
-            if highest_bid:
-                auction.winner = highest_bid.bidder
-            auction.status = "closed"
-            auction.save()
+        # Reads never close auctions; the scheduler owns closing. The status
+        # exposed to clients is computed in the query instead.
+        queryset = AuctionItem.objects.with_effective_status()
+        if self.request.method == "GET":
+            queryset = self.get_serializer_class().optimize_queryset(
+                queryset, self.get_serializer_context()
+            )
 
         if self.action == "list":
-            queryset = AuctionItem.objects.filter(status="active", end_time__gt=current_time)
+            queryset = queryset.filter(status="active", end_time__gt=timezone.now())
 
             # Filtering
             min_price = self.request.query_params.get("min_price")
@@ -66,20 +90,59 @@ class AuctionItemViewSet(viewsets.ModelViewSet):
             if category:
                 queryset = queryset.filter(category__name__icontains=category)
 
-            # Sorting
-            sort_by = self.request.query_params.get("sort_by", "newest")
-            if sort_by == "newest":
-                queryset = queryset.order_by("-created_at")
-            elif sort_by == "ending_soon":
-                queryset = queryset.order_by("end_time")
-            elif sort_by == "highest_bid":
-                queryset = queryset.order_by("-current_bid")
-            elif sort_by == "lowest_price":
-                queryset = queryset.order_by("starting_bid")
+            # Sorting (keyset-paginated; every order ends with id as tie-breaker)
+            sort_by = AuctionKeysetPagination.get_sort(self.request)
+            return queryset.order_by(*AuctionKeysetPagination.get_ordering(sort_by))
 
-            return queryset
+        return queryset
 
-        return AuctionItem.objects.all()
+    def get_serializer_class(self):
+        # Listing pages render compact cards; detail and writes use the full shape
+        if self.action in ("list", "search"):
+            return AuctionItemCardSerializer
+        return AuctionItemSerializer
+
+    def list(self, request, *args, **kwargs):
+        """
+        Serve anonymous listing pages from ListingCache. Authenticated
+        requests always hit the database.
+        """
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        key = ListingCache.key_for(request, AuctionKeysetPagination.get_sort(request))
+        data = ListingCache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            ListingCache.set(key, response.data)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the detail payload from AuctionDetailCache. Only the
+        viewer-independent part is cached; is_winning is layered on per
+        request. Sparse/expanded requests bypass the cache.
+        """
+        if "fields" in request.query_params or "expand" in request.query_params:
+            return super().retrieve(request, *args, **kwargs)
+
+        auction_id = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        version, entry = AuctionDetailCache.get(auction_id, request)
+        if entry is None:
+            instance = self.get_object()
+            payload = dict(self.get_serializer(instance).data)
+            payload.pop("is_winning", None)
+            entry = {"payload": payload, "top_bidder_id": instance.top_bidder_id}
+            AuctionDetailCache.set(instance.pk, version, request, entry, instance.end_time)
+
+        data = dict(entry["payload"])
+        data["is_winning"] = bool(
+            request.user.is_authenticated and entry["top_bidder_id"] == request.user.id
+        )
+        return Response(data)
 
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated], url_path="my_bid_auctions")
     def my_bid_auctions(self, request):
@@ -87,23 +150,41 @@ class AuctionItemViewSet(viewsets.ModelViewSet):
         bid_auction_ids = (
             Bid.objects.filter(bidder=user).values_list("auction_item", flat=True).distinct()
         )
-        auctions = AuctionItem.objects.filter(id__in=bid_auction_ids)
+        context = {"request": request}
+        auctions = AuctionItemSerializer.optimize_queryset(
+            AuctionItem.objects.filter(id__in=bid_auction_ids), context
+        )
 
-        serializer = AuctionItemSerializer(auctions, many=True, context={"request": request})
+        serializer = AuctionItemSerializer(auctions, many=True, context=context)
         return Response(serializer.data, status=200)
 
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def my_auctions(self, request):
         user = request.user
-        queryset = AuctionItem.objects.filter(owner=user).order_by("-created_at")
+        queryset = AuctionItemSerializer.optimize_queryset(
+            AuctionItem.objects.filter(owner=user), self.get_serializer_context()
+        ).order_by("-created_at")
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def perform_create(self, serializer):
         auction_item = serializer.save(owner=self.request.user)
         images = self.request.FILES.getlist("images")
-        for image in images:
-            AuctionImage.objects.create(auction_item=auction_item, image=image)
+        uploaded = [AuctionImage.objects.create(auction_item=auction_item, image=image) for image in images]
+        set_cover_image(auction_item, uploaded)
+        SearchIndex.index_item(auction_item)
+        ListingCache.invalidate()
+        DeadlineQueue.schedule(auction_item.pk, auction_item.end_time)
+
+    def perform_update(self, serializer):
+        auction_item = serializer.save()
+        SearchIndex.index_item(auction_item)
+        invalidate_auction_caches(auction_item.pk)
+        DeadlineQueue.schedule(auction_item.pk, auction_item.end_time)
+
+    def perform_destroy(self, instance):
+        invalidate_auction_caches(instance.pk)
+        super().perform_destroy(instance)
 
     def destroy(self, request, *args, **kwargs):
         auction_item = self.get_object()
@@ -122,8 +203,8 @@ class AuctionItemViewSet(viewsets.ModelViewSet):
 
         images = request.FILES.getlist("images")
         if images:
-            for image in images:
-                AuctionImage.objects.create(auction_item=auction_item, image=image)
+            uploaded = [AuctionImage.objects.create(auction_item=auction_item, image=image) for image in images]
+            set_cover_image(auction_item, uploaded)
 
         return super().update(request, *args, **kwargs)
 
@@ -138,6 +219,7 @@ class AuctionItemViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Item is already shipped or received."}, status=400)
         item.shipping_status = "shipped"
         item.save()
+        AuctionDetailCache.invalidate(item.pk)
         return Response({"detail": "Item marked as shipped."}, status=200)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
@@ -150,6 +232,7 @@ class AuctionItemViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Cannot mark received unless the item is shipped."}, status=400)
         item.shipping_status = "received"
         item.save()
+        AuctionDetailCache.invalidate(item.pk)
 
         seller = item.owner
         total_price = item.current_bid or item.buy_now_price
@@ -176,205 +259,212 @@ class AuctionItemViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticatedOrReadOnly], parser_classes=[JSONParser])
     def bid(self, request, pk=None):
         """
-        Place a bid on an auction item.
-        Uses service layer for validation, processing, and notifications.
+        Place a bid on an auction item (see place_bid). Retries carrying
+        the same Idempotency-Key get the first attempt's response.
         """
-        try:
-            with transaction.atomic():
-                # Lock the auction item for the duration of this transaction
-                auction_item = AuctionItem.objects.select_for_update().select_related("owner").get(pk=pk)
-                
-                # === VALIDATION PHASE ===
-                
-                # 1. Rate limiting check
-                is_valid, error = BidValidator.validate_bid_rate_limit(auction_item, request.user)
-                if not is_valid:
-                    return error
-                
-                # 2. Check bid eligibility (auction status, ownership, etc.)
-                is_valid, error = BidValidator.validate_bid_eligibility(auction_item, request.user)
-                if not is_valid:
-                    return error
-                
-                # 3. Validate bid amount
-                amount_str = request.data.get("amount")
-                is_valid, amount, error = BidValidator.validate_bid_amount(amount_str, auction_item)
-                if not is_valid:
-                    return error
-                
-                # === PROCESSING PHASE ===
-                
-                # 4. Handle anti-snipe extension (if bid is placed close to end time)
-                was_extended = BidProcessor.handle_anti_snipe_extension(auction_item)
-                
-                # 5. Get the current highest bid
-                old_highest_bid = BidProcessor.get_highest_bid(auction_item)
-                
-                # 6. Determine if this is a rebid or a new bid
-                is_rebid = old_highest_bid and old_highest_bid.bidder == request.user
-                
-                # 7. Validate user balance
-                is_valid, bidder_account, error = BidValidator.validate_user_balance(
-                    request.user,
-                    amount,
-                    is_rebid=is_rebid,
-                    current_bid_amount=old_highest_bid.amount if is_rebid else None
-                )
-                if not is_valid:
-                    return error
-                
-                # 8. Handle refund to previous highest bidder (if different user)
-                old_bidder, old_amount = BidProcessor.handle_outbid_refund(
-                    old_highest_bid,
-                    auction_item,
-                    request.user
-                )
-                
-                # 9. Process the bid (deduct funds, create bid record, update auction)
-                if is_rebid:
-                    new_bid = BidProcessor.process_rebid(
-                        auction_item,
-                        request.user,
-                        amount,
-                        bidder_account,
-                        old_highest_bid
-                    )
-                else:
-                    new_bid = BidProcessor.process_new_bid(
-                        auction_item,
-                        request.user,
-                        amount,
-                        bidder_account
-                    )
-                
-                # === NOTIFICATION PHASE ===
-                
-                # 10. Send WebSocket notification for balance update
-                BidProcessor.notify_balance_update(request.user.id, bidder_account.balance)
-                
-                # 11. Notify old bidder if they were outbid
-                if old_bidder:
-                    BidProcessor.notify_balance_update(old_bidder.id, old_bidder.account.balance)
-                    BidNotificationService.notify_outbid(old_bidder, auction_item, amount)
-                
-                # 12. Notify auction owner
-                if is_rebid:
-                    BidNotificationService.notify_owner_bid_increased(
-                        auction_item.owner,
-                        auction_item,
-                        request.user.username,
-                        amount
-                    )
-                else:
-                    BidNotificationService.notify_owner_new_bid(
-                        auction_item.owner,
-                        auction_item,
-                        request.user.username,
-                        amount
-                    )
-                
-                # 13. Notify about auction extension if applicable
-                if was_extended:
-                    BidNotificationService.notify_auction_extended(auction_item, auction_item.end_time)
-                
-                # Return the new bid
-                serializer = BidSerializer(new_bid)
-                return Response(serializer.data, status=201)
-                
-        except AuctionItem.DoesNotExist:
-            return Response({"detail": "Auction item not found."}, status=404)
-        except Exception as e:
-            # Log the error and return a generic error message
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Bid processing failed for user {request.user.id} on auction {pk}: {str(e)}")
-            return Response({"detail": "Bid processing failed. Please try again."}, status=500)
+        return bid_once(request, pk, request.user, request.data)
 
     @action(detail=False, methods=["get"], permission_classes=[])
     def search(self, request):
-        from django.utils import timezone as dj_tz
+        """
+        Ranked fuzzy search over active auctions, answered from the
+        inverted index (see SearchIndex) and paginated by page number.
+        """
         query = request.query_params.get("q", "").strip()
         category = request.query_params.get("category", "").strip()
 
-        qs = AuctionItem.objects.filter(status="active", end_time__gt=dj_tz.now())
+        qs = AuctionItem.objects.filter(status="active", end_time__gt=timezone.now())
+        if category:
+            qs = qs.filter(category__name__icontains=category)
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        paginator = SearchResultsPagination()
 
-        if query:
-            direct_qs = qs.filter(Q(title__icontains=query) | Q(description__icontains=query))
+        if not query:
+            qs = serializer_class.optimize_queryset(qs, context).order_by("-created_at", "-id")
+            page = paginator.paginate_queryset(qs, request, view=self)
         else:
-            serializer = self.get_serializer(qs, many=True)
-            return Response(serializer.data)
+            ranked_ids = SearchIndex.rank(query, qs)
+            page_ids = paginator.paginate_queryset(ranked_ids, request, view=self)
+            items = serializer_class.optimize_queryset(
+                AuctionItem.objects.filter(id__in=page_ids), context
+            ).in_bulk()
+            page = [items[item_id] for item_id in page_ids if item_id in items]
 
-        fuzzy_matches = []
-        if query:
-            for item in qs:
-                text_to_check = f"{item.title} {item.description}"
-                if fuzzy_match(text_to_check, query):
-                    fuzzy_matches.append(item.id)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-        combined_ids = set(direct_qs.values_list("id", flat=True)) | set(fuzzy_matches)
-        qs = qs.filter(id__in=combined_ids)
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticatedOrReadOnly], parser_classes=[JSONParser])
+    def buy_now(self, request, pk=None):
+        return buy_now_once(request, pk, request.user)
 
-        if category:
-            qs = qs.filter(category__name__icontains=category)
 
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+def bid_once(request, pk, user, data):
+    """place_bid, answered from the stored response for a repeated Idempotency-Key."""
+    payload = {"auction": str(pk), "amount": data.get("amount"), "max_amount": data.get("max_amount")}
+    return Idempotency.run(request, user, "bid", payload, lambda: place_bid(pk, user, data))
 
-    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticatedOrReadOnly], parser_classes=[JSONParser])
-    def buy_now(self, request, pk=None):
-        channel_layer = get_channel_layer()
 
-        def notify(group_name, payload):
-            transaction.on_commit(lambda: async_to_sync(channel_layer.group_send)(group_name, payload))
+def buy_now_once(request, pk, user):
+    """buy_now_item, answered from the stored response for a repeated Idempotency-Key."""
+    return Idempotency.run(request, user, "buy_now", {"auction": str(pk)}, lambda: buy_now_item(pk, user))
 
-        with transaction.atomic():
-            auction_item = AuctionItem.objects.select_for_update().select_related("owner").get(pk=pk)
-
-            if auction_item.status != "active":
-                return Response({"detail": "Cannot Buy Now on this item as the auction is not active."}, status=400)
-
-            if auction_item.owner == request.user:
-                return Response({"detail": "Owners cannot Buy Now their own items."}, status=403)
-
-            if auction_item.buy_now_buyer is not None:
-                return Response({"detail": "This item has already been purchased via Buy Now."}, status=400)
-
-            if not auction_item.buy_now_price:
-                return Response({"detail": "Buy Now price is not set for this item."}, status=400)
-
-            old_highest_bid = auction_item.bids.order_by("-amount").first()
-            if old_highest_bid and old_highest_bid.bidder != request.user:
-                old_bidder = old_highest_bid.bidder
-                old_amount = old_highest_bid.amount
-                old_account = UserAccount.objects.select_for_update().get(user=old_bidder)
-                old_account.balance += old_amount
-                old_account.save()
-                notify(f"user_balance_{old_bidder.id}", {"type": "balance_update", "balance": str(old_account.balance)})
-
-            user_bid = auction_item.bids.filter(bidder=request.user).order_by("-amount").first()
-            if user_bid and auction_item.current_bid == user_bid.amount:
-                additional_amount = auction_item.buy_now_price - user_bid.amount
-            else:
-                additional_amount = auction_item.buy_now_price
-
-            buyer_account = UserAccount.objects.select_for_update().get(user=request.user)
-            if buyer_account.balance < additional_amount:
-                return Response({"detail": "Insufficient funds to Buy Now."}, status=400)
-
-            buyer_account.balance -= additional_amount
-            buyer_account.save()
-            notify(f"user_balance_{request.user.id}", {"type": "balance_update", "balance": str(buyer_account.balance)})
-
-            auction_item.buy_now_buyer = request.user
-            auction_item.current_bid = auction_item.buy_now_price
-            auction_item.status = "closed"
-            auction_item.end_time = timezone.now()
-            auction_item.save()
-
-            if not auction_item.winner and auction_item.bids.exists():
-                highest_bid = auction_item.bids.order_by("-amount").first()
-                auction_item.winner = highest_bid.bidder
-                auction_item.save()
-
-            serializer = AuctionItemSerializer(auction_item)
-            return Response(serializer.data, status=200)
+
+def place_bid(pk, user, data):
+    """
+    Place a bid on an auction item. An optional "max_amount" stores a
+    maximum the server keeps bidding up to (proxy bidding).
+    Uses service layer for validation, processing, and notifications.
+    Validation runs against an unlocked snapshot and the commit is a
+    compare-and-set that is retried from a fresh snapshot on conflict.
+    Shared by AuctionItemViewSet.bid and the async bid view.
+
+    Returns:
+        Response
+    """
+    try:
+        for attempt in range(BidProcessor.MAX_COMMIT_ATTEMPTS):
+            # Unlocked snapshot; commit_bid only succeeds if it is still current
+            auction_item = AuctionItem.objects.select_related("owner", "top_bidder").get(pk=pk)
+
+            # === VALIDATION PHASE (no locks held) ===
+
+            # 1. Rate limiting check (cache only; conflict retries are free)
+            if attempt == 0:
+                is_valid, error = BidValidator.validate_bid_rate_limit(auction_item, user)
+                if not is_valid:
+                    return error
+                if BidSequencer.is_enabled():
+                    # Hand the bid to this auction's single writer instead
+                    # of racing other requests on the row
+                    new_bid, error = BidSequencer.submit(
+                        auction_item.pk,
+                        user,
+                        data.get("amount"),
+                        data.get("max_amount"),
+                    )
+                    if error:
+                        return error
+                    # The writer validated and committed it; it counts
+                    # towards this user's next bid
+                    BidRateLimiter.hit(auction_item, user)
+                    break
+
+            # 2. Eligibility, amount and balance checks, resolution
+            #    against stored maxima; outbox events
+            plan, error = BidProcessor.prepare_bid(
+                auction_item,
+                user,
+                data.get("amount"),
+                data.get("max_amount"),
+            )
+            if error:
+                return error
+            if attempt == 0:
+                # Only bids that passed validation count towards the limit
+                is_valid, error = BidValidator.validate_bid_rate_limit(auction_item, user, count=True)
+                if not is_valid:
+                    return error
+
+            # === COMMIT PHASE (compare-and-set on the auction row) ===
+
+            # 3. Move funds, record the bid and its events, swap the top-bid state
+            try:
+                new_bid, error = BidProcessor.commit_bid(auction_item, **plan)
+            except BidConflict:
+                # Someone else bid, bought or closed first: re-read and re-validate
+                continue
+            if error:
+                return error
+            break
+        else:
+            return Response(
+                {"detail": "This auction is receiving many bids. Please try again."},
+                status=409
+            )
+
+        if new_bid is None:
+            # The top bidder raised their maximum; the top bid is unchanged
+            return Response({"detail": "Maximum bid updated."}, status=200)
+
+        invalidate_auction_caches(auction_item.pk)
+
+        if new_bid.bidder_id != user.id:
+            return Response(
+                {
+                    "detail": "You have been outbid by another bidder's maximum bid.",
+                    "current_bid": str(new_bid.amount),
+                },
+                status=200
+            )
+
+        # Return the new bid
+        serializer = BidSerializer(new_bid)
+        return Response(serializer.data, status=201)
+
+    except AuctionItem.DoesNotExist:
+        return Response({"detail": "Auction item not found."}, status=404)
+    except Exception as e:
+        # Log the error and return a generic error message
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Bid processing failed for user {user.id} on auction {pk}: {str(e)}")
+        return Response({"detail": "Bid processing failed. Please try again."}, status=500)
+
+
+def buy_now_item(pk, user):
+    """
+    Buy an auction item at its Buy Now price, releasing the current top
+    bidder's hold. Shared by AuctionItemViewSet.buy_now and the async view.
+
+    Returns:
+        Response
+    """
+    with transaction.atomic():
+        auction_item = (
+            AuctionItem.objects.select_for_update(of=("self",))
+            .select_related("owner", "top_bidder")
+            .get(pk=pk)
+        )
+
+        if auction_item.status != "active":
+            return Response({"detail": "Cannot Buy Now on this item as the auction is not active."}, status=400)
+
+        if auction_item.owner == user:
+            return Response({"detail": "Owners cannot Buy Now their own items."}, status=403)
+
+        if auction_item.buy_now_buyer is not None:
+            return Response({"detail": "This item has already been purchased via Buy Now."}, status=400)
+
+        if not auction_item.buy_now_price:
+            return Response({"detail": "Buy Now price is not set for this item."}, status=400)
+
+        events = [Outbox.balance_update(user.id)]
+        old_bidder, old_amount = BidProcessor.get_highest_bid(auction_item)
+        if old_bidder is not None and old_bidder != user:
+            events.append(Outbox.balance_update(old_bidder.id))
+
+        # Hold the price like a winning bid (releasing the top bidder's
+        # hold), then pay it at once
+        try:
+            Escrow.move(auction_item, user, auction_item.buy_now_price, old_bidder, old_amount)
+        except InsufficientFunds:
+            return Response({"detail": "Insufficient funds to Buy Now."}, status=400)
+        Escrow.capture(auction_item, user, auction_item.buy_now_price)
+
+        now = timezone.now()
+        auction_item.buy_now_buyer = user
+        auction_item.current_bid = auction_item.buy_now_price
+        auction_item.top_bidder = user
+        auction_item.last_bid_at = now
+        auction_item.winner = user
+        auction_item.status = "closed"
+        auction_item.end_time = now
+        auction_item.save()
+        events.append(Outbox.auction_update(auction_item))
+        Outbox.enqueue(events)
+        invalidate_auction_caches(auction_item.pk)
+
+        serializer = AuctionItemSerializer(auction_item)
+        return Response(serializer.data, status=200)
@@ -2,7 +2,7 @@
 
 from rest_framework import generics, permissions
 from ..models import Favorite
-from ..serializers import FavoriteSerializer
+from ..serializers import AuctionItemCardSerializer, FavoriteSerializer
 
 
 class FavoriteListCreateAPIView(generics.ListCreateAPIView):
@@ -10,7 +10,11 @@ class FavoriteListCreateAPIView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Favorite.objects.filter(user=self.request.user)
+        return AuctionItemCardSerializer.optimize_queryset(
+            Favorite.objects.filter(user=self.request.user),
+            self.get_serializer_context(),
+            prefix="auction_item__",
+        )
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
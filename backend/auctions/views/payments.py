@@ -16,6 +16,7 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from ..models import Transaction
+from ..services import Idempotency
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,15 @@ class CreateDepositPaymentIntentView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, format=None):
+        return Idempotency.run(
+            request,
+            request.user,
+            "deposit",
+            {"amount": request.data.get("amount")},
+            lambda: self.create_intent(request),
+        )
+
+    def create_intent(self, request):
         amount_str = request.data.get("amount")
         if not amount_str:
             return Response({"detail": "Deposit amount is required."}, status=400)
@@ -37,11 +47,17 @@ class CreateDepositPaymentIntentView(APIView):
             return Response({"detail": "Deposit amount must be positive."}, status=400)
 
         amount_cents = int(amount * 100)
+        options = {}
+        key = request.headers.get(Idempotency.HEADER)
+        if key:
+            # Lets Stripe dedupe too if we fail before storing the response
+            options["idempotency_key"] = f"deposit-{request.user.id}-{key}"
         try:
             intent = stripe.PaymentIntent.create(
                 amount=amount_cents,
                 currency="usd",
                 metadata={"user_id": request.user.id, "deposit_amount": str(amount)},
+                **options,
             )
         except Exception as e:
             logger.error(f"Stripe PaymentIntent creation failed: {e}")
@@ -75,6 +91,10 @@ class StripeWebhookView(APIView):
                     deposit_amount = Decimal(deposit_amount_str)
                     user = User.objects.get(id=user_id)
                     with transaction.atomic():
+                        # Stripe redelivers events; credit each one once
+                        if not Idempotency.mark("stripe_event", event["id"], settings.STRIPE_EVENT_TTL):
+                            logger.info(f"Ignoring replayed Stripe event {event['id']}.")
+                            return Response(status=status.HTTP_200_OK)
                         user.account.balance += deposit_amount
                         user.account.save()
                         Transaction.objects.create(
@@ -1,11 +1,12 @@
 # auctions/views/purchases.py
 
+from django.db.models import Q
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ..models import AuctionItem
-from ..serializers import AuctionItemSerializer
+from ..serializers import AuctionItemCardSerializer
 
 
 class MyPurchasesView(APIView):
@@ -13,8 +14,9 @@ class MyPurchasesView(APIView):
 
     def get(self, request):
         user = request.user
-        buy_now_purchases = AuctionItem.objects.filter(buy_now_buyer=user)
-        bid_purchases = AuctionItem.objects.filter(winner=user)
-        purchases = buy_now_purchases.union(bid_purchases)
-        serializer = AuctionItemSerializer(purchases, many=True, context={"request": request})
+        context = {"request": request}
+        purchases = AuctionItemCardSerializer.optimize_queryset(
+            AuctionItem.objects.filter(Q(buy_now_buyer=user) | Q(winner=user)), context
+        )
+        serializer = AuctionItemCardSerializer(purchases, many=True, context=context)
         return Response(serializer.data, status=200)
@@ -1,16 +1,19 @@
 # auctions/views/stats.py
 
 from datetime import timedelta
+from django.http import HttpResponse
 from django.utils import timezone
 from django.db.models import Q, Sum, Avg
 from django.db.models.functions import TruncDay, TruncMonth
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework import generics
 from rest_framework.response import Response
 
 from ..models import AuctionItem, Bid, Category
+from ..permissions import CanScrapeMetrics
 from ..serializers import CategorySerializer
+from ..services import BidRateLimiter, ListingCache, Metrics
 
 
 class DashboardStatsView(APIView):
@@ -78,3 +81,37 @@ class CategoryListView(generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+
+
+class ListingCacheStatsView(APIView):
+    """Hit/miss counters of the anonymous listing cache (staff only)."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(ListingCache.stats())
+
+
+class BidRateLimitStatsView(APIView):
+    """Rejected bid attempt counts per auction phase (staff only)."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(BidRateLimiter.stats())
+
+
+class MetricsView(APIView):
+    """
+    This process's metrics (auction closing lag, batch durations, counters)
+    in the Prometheus text format, for scrapers.
+    """
+
+    permission_classes = [CanScrapeMetrics]
+    throttle_classes = []
+
+    def get(self, request):
+        # Imported for its metrics, which register on import
+        from .. import scheduler  # noqa: F401
+
+        return HttpResponse(Metrics.render(), content_type=Metrics.CONTENT_TYPE)
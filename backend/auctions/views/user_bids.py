@@ -16,7 +16,10 @@ class UserBidsView(APIView):
     def get(self, request):
         user = request.user
         user_bids = Bid.objects.filter(bidder=user).values_list("auction_item", flat=True).distinct()
-        auctions = AuctionItem.objects.filter(id__in=user_bids)
+        context = {"request": request}
+        auctions = AuctionItemSerializer.optimize_queryset(
+            AuctionItem.objects.filter(id__in=user_bids), context
+        )
         now = timezone.now()
 
         winning_now = []
@@ -25,22 +28,21 @@ class UserBidsView(APIView):
         lost = []
 
         for auction in auctions:
-            highest_bid = auction.bids.order_by("-amount").first()
             if auction.status == "active" and auction.end_time > now:
-                if highest_bid and highest_bid.bidder == user:
+                if auction.top_bidder_id == user.id:
                     winning_now.append(auction)
                 else:
                     losing_now.append(auction)
             else:
-                if auction.winner == user:
+                if auction.winner_id == user.id:
                     won.append(auction)
                 else:
                     lost.append(auction)
 
         data = {
-            "winning_now": AuctionItemSerializer(winning_now, many=True, context={"request": request}).data,
-            "won": AuctionItemSerializer(won, many=True, context={"request": request}).data,
-            "losing_now": AuctionItemSerializer(losing_now, many=True, context={"request": request}).data,
-            "lost": AuctionItemSerializer(lost, many=True, context={"request": request}).data,
+            "winning_now": AuctionItemSerializer(winning_now, many=True, context=context).data,
+            "won": AuctionItemSerializer(won, many=True, context=context).data,
+            "losing_now": AuctionItemSerializer(losing_now, many=True, context=context).data,
+            "lost": AuctionItemSerializer(lost, many=True, context=context).data,
         }
         return Response(data)
@@ -2,12 +2,14 @@ import os
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 import django
+from auctions.apps import mark_server_process
+mark_server_process()  # start the background threads in this process
 django.setup()
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 from django.urls import re_path
 from channels.auth import AuthMiddlewareStack
-from auctions.consumers import ChatConsumer, BalanceConsumer
+from auctions.consumers import AuctionConsumer, ChatConsumer, BalanceConsumer, NotificationConsumer
 from auctions.middleware import JWTAuthMiddleware
 
 
@@ -23,6 +25,13 @@ application = ProtocolTypeRouter(
                 ),
                 # Balance endpoint uses JWT authentication via our custom middleware
                 re_path(r"^ws/balance/$", JWTAuthMiddleware(BalanceConsumer.as_asgi())),
+                # New notifications for the user the JWT belongs to
+                re_path(r"^ws/notifications/$", JWTAuthMiddleware(NotificationConsumer.as_asgi())),
+                # Live auction updates are public, like the auction detail page
+                re_path(
+                    r"^ws/auctions/(?P<auction_id>\d+)/$",
+                    JWTAuthMiddleware(AuctionConsumer.as_asgi()),
+                ),
             ]
         ),
     }
@@ -3,6 +3,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from datetime import timedelta
 import sentry_sdk
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -142,6 +143,7 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     # Add other origins if necessary
 ]
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
@@ -149,6 +151,43 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Bid limits per (auction, user), checked through the cache before any
+# database work. Only bids that pass validation count. "closing" applies
+# inside the anti-snipe window.
+BID_RATE_LIMITS = {
+    "open": {"count": 1, "window": 30},     # 1 bid per 30 seconds
+    "closing": {"count": 1, "window": 60},  # 1 bid per minute
+}
+
+# Maximum frames per second an auction page's WebSocket receives; bursts of
+# bids in between are coalesced into the latest state.
+AUCTION_LIVE_UPDATES_PER_SECOND = 4
+
+# Optional single-writer mode for bids: each auction is hashed to one of
+# "workers" in-process writer threads, which validate queued bids against
+# in-memory state and commit them in one transaction per batch.
+BID_SEQUENCER = {
+    "enabled": os.getenv("BID_SEQUENCER_ENABLED", "false").lower() == "true",
+    "workers": int(os.getenv("BID_SEQUENCER_WORKERS", "4")),
+}
+
+# How long a response is replayed for a repeated Idempotency-Key, and how
+# long processed Stripe webhook events are remembered (Stripe retries
+# deliveries for up to three days).
+IDEMPOTENCY_KEY_TTL = timedelta(hours=1)
+STRIPE_EVENT_TTL = timedelta(days=7)
+
+# Dispatched outbox events are kept this long for debugging, then purged.
+OUTBOX_RETENTION = timedelta(days=2)
+
+# Bidders and watchers of an auction are notified once this long before
+# it ends (by a sweep that runs every minute).
+ENDING_SOON_WINDOW = timedelta(minutes=int(os.getenv("ENDING_SOON_MINUTES", "15")))
+
+# Token a metrics scraper sends as X-Metrics-Token to read /api/metrics/
+# without a staff login. Unset, only staff users can read it.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # Redis config: use Redis for Channels and cache if REDIS_URL is set; otherwise in-memory
 REDIS_URL = os.getenv("REDIS_URL")
 
@@ -11,6 +11,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from auctions.apps import mark_server_process
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+mark_server_process()  # start the background threads in this process
 
 application = get_wsgi_application()
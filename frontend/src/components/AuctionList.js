@@ -96,29 +96,22 @@ const AuctionList = () => {
 
   const { data: auctionItems, isLoading, isError, hasNextPage, fetchNextPage } = useInfiniteQuery({
     queryKey: ["auctionItems", query, appliedFilters, sortBy],
-    queryFn: ({ pageParam = 1 }) => {
+    queryFn: ({ pageParam }) => {
       // If user typed something, do fuzzy search:
       if (query) {
-        return searchAuctionItems(query, appliedFilters.category);
+        return searchAuctionItems(query, appliedFilters.category, pageParam);
       } else {
         // No query? Then just do the normal listing
-        const params = { ...appliedFilters, sort_by: sortBy, page: pageParam };
+        const params = { ...appliedFilters, sort_by: sortBy, cursor: pageParam };
         return getAllAuctionItems(params);
       }
     },
+    initialPageParam: undefined,
     refetchInterval: 5000,
     onError: () => t("auction.toasts.loadFailed"),
-    getNextPageParam: (lastPage) => {
-      if (!lastPage?.meta) return undefined;
-      
-      const { current_page, per_page, total } = lastPage.meta;
-      const totalPages = Math.ceil(total / per_page);
-      
-      if (current_page < totalPages) {
-        return current_page + 1;
-      }
-      return undefined;
-    },
+    // Search pages are numbered; listing pages continue from a cursor
+    getNextPageParam: (lastPage) =>
+      query ? lastPage?.meta?.next_page : lastPage?.meta?.next_cursor,
   });
 
   // ----- Bulgarian cities (for Location filter) -----
@@ -408,7 +401,7 @@ const AuctionList = () => {
                         <CardMedia
                           component="img"
                           height="200"
-                          image={item.images?.[0]?.image || '/placeholder.jpg'}
+                          image={item.image || '/placeholder.jpg'}
                           alt={item.title}
                           sx={{
                             objectFit: 'cover',
@@ -426,7 +419,7 @@ const AuctionList = () => {
                             <FavoriteButton auctionId={item.id} />
                           </Box>
                           <Typography variant="body2" color="text.secondary" gutterBottom>
-                            {item.description?.substring(0, 100)}...
+                            {item.summary?.substring(0, 100)}...
                           </Typography>
                           <Box sx={{ mt: 2, display: 'flex', flexWrap: 'wrap', gap: 1 }}>
                             <Chip
@@ -230,7 +230,7 @@ const MyPurchases = () => {
                     </Typography>
                   </Link>
                   <Typography variant="body2" color="text.secondary" noWrap>
-                    {item.description}
+                    {item.summary}
                   </Typography>
                   <Typography variant="body2">
                     <strong>{t('auction.boughtPrice')}:</strong> $
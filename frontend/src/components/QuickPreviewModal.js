@@ -80,7 +80,7 @@ const QuickPreviewModal = ({ open, onClose, item }) => {
               }}
             >
               <img 
-                src={item.images?.[0]?.image || '/placeholder.jpg'} 
+                src={item.image || '/placeholder.jpg'} 
                 alt={item.title}
               />
               <Box
@@ -114,7 +114,7 @@ const QuickPreviewModal = ({ open, onClose, item }) => {
               {item.title}
             </Typography>
             <Typography variant="body2" color="text.secondary" sx={{ mb: 2 }}>
-              {item.description?.substring(0, 150)}...
+              {item.summary}...
             </Typography>
           </Grid>
 
@@ -7,16 +7,20 @@ import axiosInstance from './axiosConfig';
 
 
 
+// Value of `param` in a paginated response's `next` link (undefined on the last page)
+const nextPageParam = (next, param) =>
+    next ? new URL(next).searchParams.get(param) || undefined : undefined;
+
+// Listing pages are keyset-paginated: follow the `cursor` of the `next` link
 export const getAllAuctionItems = async (filters = {}) => {
     try {
-        const params = new URLSearchParams(filters).toString();
+        const definedFilters = Object.entries(filters).filter(([, value]) => value !== undefined);
+        const params = new URLSearchParams(definedFilters).toString();
         const response = await axiosInstance.get(`auction-items/?${params}`);
         return {
-            items: response.data.results || response.data,
+            items: response.data.results,
             meta: {
-                current_page: response.data.current_page || 1,
-                per_page: response.data.per_page || 10,
-                total: response.data.total || response.data.length,
+                next_cursor: nextPageParam(response.data.next, 'cursor'),
             }
         };
     } catch (error) {
@@ -25,17 +29,16 @@ export const getAllAuctionItems = async (filters = {}) => {
     }
 };
 
-export const searchAuctionItems = async (query, category) => {
+export const searchAuctionItems = async (query, category, page = 1) => {
     try {
         const response = await axiosInstance.get(
-            `auction-items/search/?q=${encodeURIComponent(query)}&category=${encodeURIComponent(category)}`
+            `auction-items/search/?q=${encodeURIComponent(query)}&category=${encodeURIComponent(category)}&page=${page}`
         );
         return {
-            items: response.data.results || response.data,
+            items: response.data.results,
             meta: {
-                current_page: response.data.current_page || 1,
-                per_page: response.data.per_page || 10,
-                total: response.data.total || response.data.length,
+                total: response.data.count,
+                next_page: nextPageParam(response.data.next, 'page'),
             }
         };
     } catch (error) {